@@ -27,22 +27,73 @@ class AppConfig:
     CAMERA_WIDTH: int = 640
     CAMERA_HEIGHT: int = 480
     CAMERA_FPS: int = 30
+    CAMERA_PROBE_ENABLED: bool = True     # Modları yokla, hedefi karşılayan en ucuz modu seç
+    CAMERA_BUFFER_SIZE: int = 1           # Sürücü tampon derinliği (CAP_PROP_BUFFERSIZE)
+    CAMERA_PROFILE_CACHE: str = "data/camera_profiles.json"  # Kamera başına seçilen mod
+    CAPTURE_STALE_FRAME_AGE: float = 0.5  # saniye, daha eski frame "stale" sayılır
+    CAPTURE_BUFFER_SLOTS: int = 4         # Önceden ayrılmış yakalama yuvası sayısı
+    FRAME_SOURCE: str = "camera"          # camera, video, images, synthetic
+    FRAME_SOURCE_PATH: str = ""           # video dosyası veya görüntü klasörü
+    FRAME_SOURCE_REALTIME: bool = True    # Kayıtlı/sentetik kaynakları CAMERA_FPS hızında ver
+    SYNTHETIC_SEED: int = 0
+    SYNTHETIC_POSTURE_PERIOD: float = 10.0  # saniye, sentetik duruşlar arası geçiş
     
     # Postür Analiz Ayarları
     POSTURE_CHECK_INTERVAL: float = 0.5  # saniye
+    POSTURE_TICK_POLICY: str = "coalesce"  # skip, coalesce, drop_oldest (analiz sürerken gelen tikler)
+    POSTURE_TICK_MAX_PENDING: int = 2      # drop_oldest kuyruk uzunluğu
     POOR_POSTURE_THRESHOLD: float = 0.7   # 0-1 arası
     ALERT_COOLDOWN: int = 10              # saniye
+    SMOOTHING_FILTER: str = "moving_average"  # moving_average, ema, one_euro, kalman
+    # Sabit postürde yavaşla, hızlı değişimde sıçra. Varsayılan kapalı: yumuşatma penceresi
+    # örnek sayısıyla ölçülür, yavaş hızda çok daha uzun süreyi kapsar ve tepkiyi geciktirir
+    ADAPTIVE_SAMPLING_ENABLED: bool = False
+    SAMPLING_BASE_INTERVAL: float = 5.0     # saniye, sabit postürde (0.2 Hz)
+    SAMPLING_BURST_INTERVAL: float = 0.5    # saniye, postür hızla değişirken
+    SAMPLING_SCORE_RATE_THRESHOLD: float = 0.05   # skor/s, üstünde sıçra
+    SAMPLING_METRIC_RATE_THRESHOLD: float = 2.0   # metrik birimi/s (derece vb.), üstünde sıçra
+    SAMPLING_DECAY: float = 1.5             # Sakin her örnekte aralık çarpanı
     
     # MediaPipe Ayarları
     MEDIAPIPE_CONFIDENCE: float = 0.5
     MEDIAPIPE_DETECTION_CONFIDENCE: float = 0.5
     MEDIAPIPE_TRACKING_CONFIDENCE: float = 0.5
     
+    # Çıkarım Worker Ayarları
+    USE_INFERENCE_WORKER: bool = False      # Pose modelini ayrı süreçte çalıştır
+    INFERENCE_RING_SLOTS: int = 6           # Paylaşımlı bellek frame yuvası sayısı
+    INFERENCE_WORKER_RESTART_DELAY: float = 2.0  # saniye
+    
+    # Çoklu Kaynak İzleme Ayarları (python -m core.detector_manager)
+    MULTI_SOURCES: str = ""               # Virgülle ayrılmış: "camera:0,camera:1,video:yol,synthetic:3"
+    PERSONS_PER_SOURCE: int = 1           # Frame yan yana eşit bölgelere bölünür, bölge başına bir kişi
+    INFERENCE_POOL_WORKERS: int = 0       # Ortak çıkarım havuzu süreç sayısı (0: çekirdek sayısı)
+    INFERENCE_POOL_REQUEST_TIMEOUT: float = 5.0  # saniye, yanıtsız istek düşürülür (worker çöktüyse)
+    
+    # Hareket Kapısı Ayarları
+    MOTION_GATE_ENABLED: bool = True
+    MOTION_GATE_THRESHOLD: float = 4.0      # 0-255 ölçeğinde ortalama piksel farkı
+    MOTION_GATE_MAX_REUSE_AGE: float = 5.0  # saniye, bu süreden sonra çıkarım zorlanır
+    
+    # ROI Takip Ayarları
+    ROI_TRACKING_ENABLED: bool = True
+    ROI_PADDING: float = 0.5          # Landmark kutusuna oranla dolgu
+    ROI_MIN_VISIBILITY: float = 0.5
+    ROI_INFERENCE_SIZE: int = 256     # piksel, kırpılan bölgenin uzun kenarı
+    
     # Veri Saklama
     DATA_DIR: str = "data"
     MODELS_DIR: str = "models"
     REPORTS_DIR: str = "reports"
     LOGS_DIR: str = "logs"
+    DB_READER_CONNECTIONS: int = 2     # Salt okunur bağlantı havuzu (istatistik/rapor sorguları)
+    DB_SYNCHRONOUS: str = "NORMAL"     # WAL ile NORMAL: commit başına fsync yok, çökmede tutarlı
+    DB_CACHE_SIZE_KB: int = 16384      # Bağlantı başına sayfa önbelleği
+    DB_MMAP_SIZE_MB: int = 64
+    DB_BACKGROUND_WRITER: bool = True  # Kayıtları arka plan thread'inde gruplu commit ile yaz
+    DB_WRITER_QUEUE_SIZE: int = 10000  # Kuyruk doluysa yeni kayıt düşürülür (GUI beklemez)
+    DB_WRITER_BATCH_SIZE: int = 256    # Bu kadar kayıt birikince hemen commit
+    DB_WRITER_MAX_DELAY: float = 2.0   # saniye, en geç bu sürede bir commit
     
     # Ses Ayarları
     SOUND_ENABLED: bool = True
@@ -55,9 +106,25 @@ class AppConfig:
     # Model Ayarları
     MODEL_PATH: str = "models/posture_model.onnx"
     USE_GPU: bool = False
+    INFERENCE_BACKEND: str = "mediapipe"    # mediapipe veya onnxruntime
+    ONNX_INTRA_OP_THREADS: int = 2          # 0: ONNX Runtime varsayılanı
+    ONNX_INTER_OP_THREADS: int = 1
+    ONNX_GRAPH_OPTIMIZATION: str = "all"    # disable, basic, extended, all
+    
+    # Gecikme Bütçesi Ayarları
+    LATENCY_CONTROLLER_ENABLED: bool = True
+    LATENCY_BUDGET_MS: float = 80.0         # Çıkarım gecikmesi hedefi (yüzdelik)
+    LATENCY_PERCENTILE: float = 95.0
+    LATENCY_WINDOW: int = 30                # Kayan pencere (çıkarım sayısı)
+    LATENCY_UPGRADE_RATIO: float = 0.6      # Bütçenin bu oranının altında kaliteyi artır
+    LATENCY_UPGRADE_COOLDOWN: float = 30.0  # saniye
     
     # İstatistik Ayarları
     STATS_SAVE_INTERVAL: int = 60  # saniye
+    PROFILING_ENABLED: bool = True  # Aşama zamanlama histogramları (kapanışta logs/ altına yazılır)
+    LANDMARK_RECORDING_ENABLED: bool = False  # Ham landmark'ları oturum başına kaydet (~2 MB/saat)
+    LANDMARK_RECORDING_DIR: str = "data/landmarks"
+    LANDMARK_RECORDING_CHUNK: int = 256       # Diske tek seferde yazılan kayıt sayısı
     REPORT_DAYS: int = 30
     
     # Egzersiz Ayarları
@@ -0,0 +1,92 @@
+"""
+PostureFix - Uyarlamalı Örnekleme Modülü
+Postür skoru ve metrikler sabitken analiz hızını yavaş bir taban hıza
+düşürür, hızlı değiştiklerinde kısa aralığa sıçrar ve sonra kademeli
+olarak tabana geri döner
+"""
+
+import time
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.posture_metrics import METRIC_NAMES
+
+
+class AdaptiveSampler:
+    """Skor/metrik oynaklığına göre bir sonraki analiz aralığını seçen sınıf
+
+    Her analizden sonra update() çağrılır. Skorun ya da herhangi bir
+    metriğin değişim hızı (birim/s) eşiği aşarsa aralık burst_interval'e
+    iner; aşmazsa her örnekte decay ile çarpılarak base_interval'e kadar
+    uzar. Dönen aralık, örneğin bir sonraki örneğe kadar temsil ettiği
+    süredir; zaman ağırlıklı istatistikler bu süreyi ağırlık olarak kullanır.
+    """
+
+    def __init__(self, base_interval: float = 5.0, burst_interval: float = 0.5,
+                 score_rate_threshold: float = 0.05, metric_rate_threshold: float = 2.0,
+                 decay: float = 1.5):
+        self.logger = logging.getLogger(__name__)
+        self.base_interval = max(base_interval, burst_interval)
+        self.burst_interval = burst_interval
+        self.score_rate_threshold = score_rate_threshold
+        self.metric_rate_threshold = metric_rate_threshold
+        self.decay = max(1.0, decay)
+
+        self.interval = burst_interval  # Başlangıçta hızlı örnekle, sonra yavaşla
+        self._last_time: Optional[float] = None
+        self._last_score = 0.0
+        self._last_metrics = np.zeros(len(METRIC_NAMES), dtype=np.float64)
+        self._metrics = np.zeros(len(METRIC_NAMES), dtype=np.float64)
+
+        # Sayaçlar
+        self.samples = 0
+        self.bursts = 0
+        self.sampled_seconds = 0.0
+
+    def update(self, score: float, metrics: Dict[str, float], now: Optional[float] = None) -> float:
+        """Yeni örneği değerlendir; bir sonraki analiz aralığını (s) döndür"""
+        if now is None:
+            now = time.monotonic()
+
+        current = self._metrics
+        for i, key in enumerate(METRIC_NAMES):
+            current[i] = metrics.get(key, 0.0)
+
+        if self._last_time is not None:
+            dt = max(now - self._last_time, 1e-3)
+            score_rate = abs(score - self._last_score) / dt
+            metric_rate = float(np.max(np.abs(current - self._last_metrics))) / dt
+
+            if score_rate > self.score_rate_threshold or metric_rate > self.metric_rate_threshold:
+                if self.interval > self.burst_interval:
+                    self.bursts += 1
+                    self.logger.debug(
+                        f"Postür hızla değişiyor (skor {score_rate:.3f}/s, metrik {metric_rate:.2f}/s), "
+                        f"aralık {self.burst_interval:.2f}s"
+                    )
+                self.interval = self.burst_interval
+            else:
+                self.interval = min(self.base_interval, self.interval * self.decay)
+
+        self._last_time = now
+        self._last_score = score
+        self._last_metrics[:] = current
+        self.samples += 1
+        self.sampled_seconds += self.interval
+        return self.interval
+
+    def reset(self):
+        """Yeni izleme dönemi: hızlı örneklemeyle yeniden başla"""
+        self.interval = self.burst_interval
+        self._last_time = None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Örnekleme sayaçlarını döndür"""
+        return {
+            "interval": self.interval,
+            "samples": self.samples,
+            "bursts": self.bursts,
+            "mean_rate_hz": self.samples / self.sampled_seconds if self.sampled_seconds > 0 else 0.0
+        }
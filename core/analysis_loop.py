@@ -0,0 +1,137 @@
+"""
+PostureFix - Analiz Döngüsü Modülü
+QTimer tiklerini TickScheduler üzerinden tek bir arka plan analiz
+thread'ine bağlar; yavaş analiz arayüz olay döngüsünü dondurmaz
+"""
+
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from core.tick_scheduler import TickScheduler
+
+# Gerçekleşen hız hedefin bu oranının altına düşünce aşırı yük uyarısı
+OVERLOAD_RATE_RATIO = 0.8
+
+
+class AnalysisLoop(QObject):
+    """Periyodik analiz döngüsü
+
+    task arka plan thread'inde çalışır, sonucu completed sinyaliyle
+    (sonuç, analiz süresi ns) ana thread'e iletilir. Aynı anda en fazla
+    bir analiz sürer; analiz sürerken gelen tiklerin ne olacağına
+    TickScheduler politikası karar verir.
+    """
+
+    completed = pyqtSignal(object, int)
+    _finished = pyqtSignal(object, int, str)
+
+    def __init__(self, task: Callable[[], object], interval: float, policy: str = "coalesce",
+                 max_pending: int = 2, parent: Optional[QObject] = None):
+        super().__init__(parent)
+
+        self.logger = logging.getLogger(__name__)
+        self.task = task
+        self.scheduler = TickScheduler(interval, policy, max_pending)
+        self.errors = 0
+        self._active = False
+        self._overloaded = False
+        self._future: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="posture-analysis")
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._on_tick)
+
+        # Worker thread'inden yayılır, ana thread'de (kuyruklu bağlantı) işlenir
+        self._finished.connect(self._on_finished)
+
+    def start(self):
+        """Tikleri başlat"""
+        self._active = True
+        self.timer.start(int(self.scheduler.interval * 1000))
+
+    def stop(self, timeout: float = 5.0):
+        """Tikleri durdur ve süren analizin bitmesini bekle"""
+        self._active = False
+        self.timer.stop()
+        self.scheduler.clear_pending()
+
+        future = self._future
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception as e:
+                self.logger.warning(f"Süren analiz beklenirken hata: {str(e)}")
+
+    def set_interval(self, interval: float):
+        """Tik aralığını değiştir (uyarlamalı örnekleme); hedef hız da güncellenir"""
+        if interval == self.scheduler.interval:
+            return
+        self.scheduler.set_interval(interval)
+        if self.timer.isActive():
+            self.timer.start(int(interval * 1000))
+
+    def shutdown(self):
+        """Döngüyü durdur ve analiz thread'ini kapat"""
+        self.stop()
+        self._executor.shutdown(wait=True)
+
+    def _on_tick(self):
+        tick_time = self.scheduler.on_tick(time.monotonic())
+        if tick_time is not None:
+            self._launch()
+
+    def _launch(self):
+        self._future = self._executor.submit(self._run)
+
+    def _run(self):
+        start = time.perf_counter_ns()
+        try:
+            result, error = self.task(), ""
+        except Exception as e:
+            result, error = None, str(e)
+        self._finished.emit(result, time.perf_counter_ns() - start, error)
+
+    def _on_finished(self, result, duration_ns: int, error: str):
+        self._future = None
+        next_tick = self.scheduler.on_complete(time.monotonic())
+
+        if error:
+            self.errors += 1
+            self.logger.error(f"Postür analizi hatası: {error}")
+        elif self._active:
+            self.completed.emit(result, duration_ns)
+
+        self._check_overload()
+
+        if next_tick is not None and self._active:
+            self._launch()
+
+    def _check_overload(self):
+        """Gerçekleşen hız hedefin altına düştüğünde ve toparlandığında logla"""
+        stats = self.scheduler
+        if stats.completed < 2 or stats.completed % 10:
+            return
+
+        overloaded = stats.achieved_rate() < stats.target_rate * OVERLOAD_RATE_RATIO
+        if overloaded != self._overloaded:
+            self._overloaded = overloaded
+            if overloaded:
+                self.logger.warning(
+                    f"Analiz hedef hızın gerisinde: {stats.achieved_rate():.2f}/{stats.target_rate:.2f} /s "
+                    f"(politika={stats.policy}, atlanan={stats.skipped_ticks}, "
+                    f"birleşen={stats.coalesced_ticks}, düşen={stats.dropped_ticks}, "
+                    f"kaçan son tarih={stats.missed_deadlines})"
+                )
+            else:
+                self.logger.info(f"Analiz hızı toparlandı: {stats.achieved_rate():.2f} /s")
+
+    def get_stats(self) -> Dict[str, float]:
+        """Zamanlayıcı sayaçları ve analiz hataları"""
+        stats = self.scheduler.get_stats()
+        stats["errors"] = self.errors
+        stats["overloaded"] = self._overloaded
+        return stats
@@ -0,0 +1,320 @@
+"""
+PostureFix - Çevrimdışı Toplu Analiz Modülü
+Kayıtlı video dosyalarını ve görüntü klasörlerini süreç havuzunda analiz
+edip sonuçları posture_records şemasına yazar
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import itertools
+import multiprocessing as mp_proc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from config import AppConfig
+from core.inference_backends import (InferenceBackend, MediaPipeBackend,
+                                     backend_options_from_config, create_backend)
+from core.landmarks import PostureLandmarks
+from core.posture_metrics import compute_posture_metrics, compute_posture_scores
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+@dataclass
+class ChunkTask:
+    """Bir worker'ın işleyeceği video parçası ya da görüntü grubu"""
+    source: str
+    session_id: str
+    kind: str                       # "video" veya "images"
+    start: int                      # İlk frame indeksi (dahil)
+    stop: Optional[int]             # Son frame indeksi (hariç); None ise dosya sonuna kadar
+    stride: int = 1                 # Her kaçıncı frame analiz edilecek
+    fps: float = 30.0
+    base_time: float = 0.0          # Videonun ilk frame'inin epoch zamanı
+    files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ChunkResult:
+    """Bir parçanın frame başına metrik tablosu"""
+    task: ChunkTask
+    timestamps: np.ndarray          # (n,) epoch saniye
+    landmarks: np.ndarray           # (n, 7, 4) float32
+    frames_decoded: int
+    elapsed: float
+
+
+# Worker başına backend örnekleri (initializer ile kurulur)
+_backend_name: str = MediaPipeBackend.name
+_backend_options: Dict = {}
+_backend_instances: Dict[bool, InferenceBackend] = {}
+
+
+def _init_worker(backend_name: str, backend_options: Dict):
+    """Worker süreci başlangıcı: backend ayarlarını sakla"""
+    global _backend_name, _backend_options
+    _backend_name = backend_name
+    _backend_options = backend_options
+    cv2.setNumThreads(1)  # Paralellik süreç havuzundan gelir
+
+
+def _get_backend(static_image_mode: bool) -> InferenceBackend:
+    """Bu worker'a ait backend örneğini (gerekirse oluşturarak) döndür"""
+    backend = _backend_instances.get(static_image_mode)
+    if backend is None:
+        options = dict(_backend_options)
+        if _backend_name == MediaPipeBackend.name:
+            options["static_image_mode"] = static_image_mode
+        backend = create_backend(_backend_name, options)
+        backend.load()
+        _backend_instances[static_image_mode] = backend
+    elif not static_image_mode:
+        # Yeni parça: önceki parçanın takip durumunu taşımamak için sıfırla
+        backend.reset()
+    return backend
+
+
+def _analyze_chunk(task: ChunkTask) -> ChunkResult:
+    """Bir parçayı analiz et (worker sürecinde çalışır)"""
+    start_time = time.perf_counter()
+    backend = _get_backend(static_image_mode=task.kind == "images")
+
+    timestamps: List[float] = []
+    landmarks: List[np.ndarray] = []
+    rgb_buffer: Optional[np.ndarray] = None
+    frames_decoded = 0
+
+    def analyze(frame: np.ndarray, timestamp: float):
+        nonlocal rgb_buffer
+        if rgb_buffer is None or rgb_buffer.shape != frame.shape:
+            rgb_buffer = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_buffer)
+        pose_array = backend.infer(rgb_buffer)
+        if pose_array is not None:
+            landmarks.append(PostureLandmarks.from_pose_array(pose_array).data)
+            timestamps.append(timestamp)
+
+    if task.kind == "video":
+        capture = cv2.VideoCapture(task.source)
+        capture.set(cv2.CAP_PROP_POS_FRAMES, task.start)
+        indices = range(task.start, task.stop) if task.stop is not None else itertools.count(task.start)
+        try:
+            for index in indices:
+                if (index - task.start) % task.stride:
+                    # Atlanan frame'ler yine çözülür (codec bağımlılığı) ama BGR'ye
+                    # dönüştürülüp kopyalanmaz ve analiz edilmez
+                    if not capture.grab():
+                        break
+                    continue
+
+                ret, frame = capture.read()
+                if not ret:
+                    break
+                frames_decoded += 1
+                analyze(frame, task.base_time + index / task.fps)
+        finally:
+            capture.release()
+    else:
+        for path in task.files[task.start:task.stop:task.stride]:
+            frame = cv2.imread(path)
+            if frame is None:
+                continue
+            frames_decoded += 1
+            analyze(frame, os.path.getmtime(path))
+
+    return ChunkResult(
+        task=task,
+        timestamps=np.asarray(timestamps, dtype=np.float64),
+        landmarks=np.stack(landmarks) if landmarks else np.empty((0, 7, 4), dtype=np.float32),
+        frames_decoded=frames_decoded,
+        elapsed=time.perf_counter() - start_time
+    )
+
+
+class BatchAnalyzer:
+    """Kayıtlı görüntüleri paralel olarak yeniden skorlayan analizci"""
+
+    def __init__(self, data_manager=None, workers: Optional[int] = None,
+                 chunk_frames: int = 1800, sample_rate: Optional[float] = None,
+                 backend: Optional[str] = None, model_path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.config = AppConfig()
+        self.data_manager = data_manager
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_frames = chunk_frames    # Parça başına frame
+        self.sample_rate = sample_rate      # Hz; None ise tüm frame'ler
+
+        if backend:
+            self.config.INFERENCE_BACKEND = backend
+        if model_path:
+            self.config.MODEL_PATH = model_path
+        pose_options = dict(
+            model_complexity=1,
+            smooth_landmarks=True,
+            enable_segmentation=False,
+            min_detection_confidence=self.config.MEDIAPIPE_DETECTION_CONFIDENCE,
+            min_tracking_confidence=self.config.MEDIAPIPE_TRACKING_CONFIDENCE
+        )
+        self.backend_name, self.backend_options = backend_options_from_config(self.config, pose_options)
+
+    def plan_tasks(self, paths: List[str]) -> List[ChunkTask]:
+        """Girdileri arama noktası hizalı parçalara böl"""
+        tasks = []
+        for path in paths:
+            if os.path.isdir(path):
+                tasks.extend(self._plan_image_directory(path))
+            elif os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+                tasks.extend(self._plan_video(path))
+            else:
+                self.logger.warning(f"Desteklenmeyen girdi atlandı: {path}")
+        return tasks
+
+    def _session_id(self, path: str) -> str:
+        name = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+        return f"batch_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    def _plan_video(self, path: str) -> List[ChunkTask]:
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            self.logger.error(f"Video açılamadı: {path}")
+            return []
+
+        fps = capture.get(cv2.CAP_PROP_FPS) or self.config.CAMERA_FPS
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        capture.release()
+
+        stride = max(1, int(round(fps / self.sample_rate))) if self.sample_rate else 1
+        session_id = self._session_id(path)
+
+        if frame_count <= 0:
+            # Kapsayıcı frame sayısını bildirmiyor (ör. bazı webm/akış kayıtları):
+            # parçalara bölünemez, tek görevde dosya sonuna kadar sırayla okunur.
+            # Süre de bilinmediğinden zaman damgaları değişiklik zamanından başlar
+            self.logger.warning(f"Video frame sayısı bilinmiyor, sıralı okunacak: {path}")
+            return [ChunkTask(path, session_id, "video", 0, None, stride, fps, os.path.getmtime(path))]
+
+        # Kayıt bitişi dosya değişiklik zamanı kabul edilir
+        base_time = os.path.getmtime(path) - frame_count / fps
+
+        # OpenCV anahtar frame konumlarını vermez; CAP_PROP_POS_FRAMES önceki anahtar
+        # frame'e atlayıp ileri çözer. Parçalar bu yüzden büyük tutulur (atlama maliyeti
+        # parça başına bir GOP) ve sınırlar stride'a hizalanır; örnekleme kaymaz
+        chunk = max(stride, (self.chunk_frames // stride) * stride)
+        return [
+            ChunkTask(path, session_id, "video", start, min(start + chunk, frame_count),
+                      stride, fps, base_time)
+            for start in range(0, frame_count, chunk)
+        ]
+
+    def _plan_image_directory(self, path: str) -> List[ChunkTask]:
+        files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+        )
+        session_id = self._session_id(path)
+        return [
+            ChunkTask(path, session_id, "images", start, min(start + self.chunk_frames, len(files)),
+                      files=files)
+            for start in range(0, len(files), self.chunk_frames)
+        ]
+
+    def run(self, paths: List[str]) -> Dict[str, float]:
+        """Tüm girdileri analiz et, sonuçları veritabanına yaz ve özet döndür"""
+        tasks = self.plan_tasks(paths)
+        if not tasks:
+            self.logger.warning("Analiz edilecek girdi bulunamadı")
+            return {}
+
+        self.logger.info(f"{len(tasks)} parça {self.workers} worker ile analiz ediliyor ({self.backend_name})")
+
+        start = time.perf_counter()
+        frames_decoded = 0
+        frames_with_pose = 0
+        worker_seconds = 0.0
+
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=mp_proc.get_context("spawn"),
+                                 initializer=_init_worker,
+                                 initargs=(self.backend_name, self.backend_options)) as executor:
+            futures = [executor.submit(_analyze_chunk, task) for task in tasks]
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"Parça analizi hatası: {str(e)}")
+                    continue
+
+                frames_decoded += result.frames_decoded
+                frames_with_pose += len(result.timestamps)
+                worker_seconds += result.elapsed
+                self._store(result)
+
+        elapsed = time.perf_counter() - start
+        fps = frames_decoded / elapsed if elapsed > 0 else 0.0
+        summary = {
+            "backend": self.backend_name,
+            "chunks": len(tasks),
+            "frames_decoded": frames_decoded,
+            "frames_with_pose": frames_with_pose,
+            "elapsed": elapsed,
+            "fps": fps,
+            "fps_per_core": fps / self.workers,
+            "fps_per_worker_second": frames_decoded / worker_seconds if worker_seconds > 0 else 0.0
+        }
+
+        self.logger.info(
+            f"Toplu analiz tamamlandı: {frames_decoded} frame, {elapsed:.1f}s, "
+            f"{fps:.1f} frame/s ({summary['fps_per_core']:.1f} frame/s/çekirdek)"
+        )
+        return summary
+
+    def _store(self, result: ChunkResult):
+        """Parça sonucunu posture_records şemasına yaz"""
+        if self.data_manager is None or len(result.timestamps) == 0:
+            return
+
+        metrics = compute_posture_metrics(result.landmarks)
+        scores = compute_posture_scores(metrics)
+        self.data_manager.import_session_records(result.task.session_id, result.timestamps, metrics, scores)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Komut satırı giriş noktası"""
+    from core.data_manager import DataManager
+    from utils.logger import setup_logger
+
+    parser = argparse.ArgumentParser(description="PostureFix çevrimdışı toplu postür analizi")
+    parser.add_argument("paths", nargs="+", help="Video dosyaları ve/veya görüntü klasörleri")
+    parser.add_argument("--workers", type=int, default=None, help="Worker süreç sayısı")
+    parser.add_argument("--chunk-frames", type=int, default=1800, help="Parça başına frame sayısı")
+    parser.add_argument("--sample-rate", type=float, default=None,
+                        help="Analiz frekansı (Hz); verilmezse tüm frame'ler")
+    parser.add_argument("--backend", choices=["mediapipe", "onnxruntime"], default=None,
+                        help="Çıkarım backend'i (varsayılan: config.INFERENCE_BACKEND)")
+    parser.add_argument("--model", default=None, help="ONNX landmark modeli yolu")
+    args = parser.parse_args(argv)
+
+    setup_logger()
+    AppConfig.create_directories()
+
+    data_manager = DataManager()
+    try:
+        analyzer = BatchAnalyzer(data_manager, args.workers, args.chunk_frames, args.sample_rate,
+                                 args.backend, args.model)
+        summary = analyzer.run(args.paths)
+    finally:
+        data_manager.close()
+    return 0 if summary else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+PostureFix - Kamera Yetenek Yoklama Modülü
+Kameranın desteklediği FOURCC/çözünürlük/FPS modlarını dener, her modda
+gerçekte verilen FPS'i ve yakalama-okuma gecikmesini ölçer, hedefi
+karşılayan en ucuz modu seçer ve kamera başına önbelleğe yazar
+"""
+
+import os
+import json
+import time
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+# Denenen sıkıştırılmış ve ham formatlar
+CANDIDATE_FOURCCS = ("MJPG", "YUYV")
+CANDIDATE_RESOLUTIONS = ((320, 240), (640, 480), (800, 600), (1280, 720), (1920, 1080))
+CANDIDATE_FPS = (15, 30, 60)
+
+# Hedef FPS'in bu oranı verilirse mod hedefi karşılıyor sayılır
+FPS_TOLERANCE = 0.9
+
+# Bu süreden kısa dönen read() sürücü tamponundaki bekleyen bir frame'dir
+BUFFERED_READ_SECONDS = 0.002
+
+
+@dataclass
+class CaptureMode:
+    """Kameradan istenen yakalama modu"""
+    fourcc: str
+    width: int
+    height: int
+    fps: float
+
+    @property
+    def pixel_rate(self) -> float:
+        return self.width * self.height * self.fps
+
+
+@dataclass
+class ProbeResult:
+    """Bir modun ölçüm sonucu (kameranın gerçekte verdiği değerlerle)"""
+    requested: CaptureMode
+    actual: CaptureMode
+    delivered_fps: float
+    read_ms: float              # Ardışık read() çağrısının medyan süresi
+    buffered_frames: int        # Boşta beklerken sürücüde biriken frame sayısı
+    latency_ms: float           # Tahmini yakalama-okuma gecikmesi
+    buffer_size: int            # Uygulanan CAP_PROP_BUFFERSIZE (0: desteklenmiyor)
+
+    def meets(self, width: int, height: int, fps: float) -> bool:
+        return (self.actual.width >= width and self.actual.height >= height and
+                self.delivered_fps >= fps * FPS_TOLERANCE)
+
+
+def fourcc_code(fourcc: str) -> int:
+    return cv2.VideoWriter_fourcc(*fourcc)
+
+
+def fourcc_name(code: float) -> str:
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+
+def apply_capture_mode(capture, mode: CaptureMode, buffer_size: int = 1) -> Tuple[CaptureMode, int]:
+    """Modu uygula (FOURCC önce: bazı sürücüler boyutu formata göre sınırlar)
+
+    Kameranın gerçekte kabul ettiği modu ve uygulanan tampon derinliğini
+    döndürür.
+    """
+    capture.set(cv2.CAP_PROP_FOURCC, fourcc_code(mode.fourcc))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    capture.set(cv2.CAP_PROP_FPS, mode.fps)
+    applied_buffer = buffer_size if capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size) else 0
+
+    actual = CaptureMode(
+        fourcc=fourcc_name(capture.get(cv2.CAP_PROP_FOURCC)) or mode.fourcc,
+        width=int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)) or mode.width,
+        height=int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)) or mode.height,
+        fps=float(capture.get(cv2.CAP_PROP_FPS)) or mode.fps
+    )
+    return actual, applied_buffer
+
+
+def candidate_modes(width: int, height: int, fps: float,
+                    fourccs: Sequence[str] = CANDIDATE_FOURCCS) -> List[CaptureMode]:
+    """Hedefi karşılayabilecek modlar, ucuzdan pahalıya"""
+    resolutions = {(w, h) for w, h in CANDIDATE_RESOLUTIONS if w >= width and h >= height}
+    resolutions.add((width, height))
+    rates = {r for r in CANDIDATE_FPS if r >= fps} | {fps}
+
+    modes = [CaptureMode(fourcc, w, h, r) for fourcc in fourccs
+             for w, h in resolutions for r in rates]
+    return sorted(modes, key=lambda m: (m.pixel_rate, fourccs.index(m.fourcc)))
+
+
+def measure_mode(capture, mode: CaptureMode, buffer_size: int = 1, frames: int = 20,
+                 warmup_frames: int = 5, idle: float = 0.3) -> Optional[ProbeResult]:
+    """Modu uygula; verilen FPS'i, read() süresini ve tamponlanan frame'leri ölç"""
+    actual, applied_buffer = apply_capture_mode(capture, mode, buffer_size)
+
+    # Mod değişiminden sonra ilk frame'ler gecikmeli ya da bozuk olabilir
+    for _ in range(warmup_frames):
+        if not capture.grab():
+            return None
+
+    read_times = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        tick = time.perf_counter()
+        if not capture.grab():
+            return None
+        read_times.append(time.perf_counter() - tick)
+    elapsed = time.perf_counter() - start
+    delivered_fps = frames / elapsed if elapsed > 0 else 0.0
+
+    # Boşta beklerken sürücü tamponunda biriken frame'ler anında döner; her biri
+    # analizin göreceği frame'e bir frame süresi gecikme ekler
+    time.sleep(idle)
+    buffered = 0
+    for _ in range(16):
+        tick = time.perf_counter()
+        if not capture.grab():
+            break
+        if time.perf_counter() - tick > BUFFERED_READ_SECONDS:
+            break
+        buffered += 1
+
+    read_ms = float(np.median(read_times)) * 1000
+    frame_ms = 1000.0 / delivered_fps if delivered_fps > 0 else 0.0
+    return ProbeResult(
+        requested=mode,
+        actual=actual,
+        delivered_fps=delivered_fps,
+        read_ms=read_ms,
+        buffered_frames=buffered,
+        latency_ms=buffered * frame_ms + read_ms,
+        buffer_size=applied_buffer
+    )
+
+
+def select_mode(results: Sequence[ProbeResult], width: int, height: int,
+                fps: float) -> Optional[ProbeResult]:
+    """Hedefi karşılayan en ucuz (piksel hızı, sonra gecikme) mod; yoksa en hızlısı"""
+    meeting = [r for r in results if r.meets(width, height, fps)]
+    if meeting:
+        return min(meeting, key=lambda r: (r.actual.pixel_rate, r.latency_ms))
+    return max(results, key=lambda r: (r.delivered_fps, -r.latency_ms), default=None)
+
+
+class CameraProfileCache:
+    """Kamera indeksi başına seçilen modun JSON önbelleği"""
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+
+    def _load_all(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Kamera profil önbelleği okunamadı: {str(e)}")
+            return {}
+
+    def load(self, key: str) -> Optional[Tuple[CaptureMode, int]]:
+        entry = self._load_all().get(key)
+        if not entry:
+            return None
+        return CaptureMode(**entry["mode"]), int(entry.get("buffer_size", 1))
+
+    def save(self, key: str, result: ProbeResult):
+        profiles = self._load_all()
+        profiles[key] = {
+            "mode": asdict(result.actual),
+            "buffer_size": result.buffer_size or 1,
+            "delivered_fps": round(result.delivered_fps, 2),
+            "latency_ms": round(result.latency_ms, 2),
+            "probed_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+
+
+class CameraProbe:
+    """Kamerayı yoklayıp en düşük gecikmeli uygun modu seçen ve uygulayan sınıf
+
+    Önbellekte profil varsa yoklama atlanır; kamera önbellekteki modu artık
+    kabul etmiyorsa yeniden yoklanır.
+    """
+
+    def __init__(self, cache_path: str, buffer_size: int = 1, frames_per_mode: int = 20):
+        self.logger = logging.getLogger(__name__)
+        self.cache = CameraProfileCache(cache_path)
+        self.buffer_size = buffer_size
+        self.frames_per_mode = frames_per_mode
+        self.last_results: List[ProbeResult] = []
+
+    def probe(self, capture, width: int, height: int, fps: float) -> List[ProbeResult]:
+        """Aday modları sırayla ölç"""
+        results = []
+        for mode in candidate_modes(width, height, fps):
+            result = measure_mode(capture, mode, self.buffer_size, self.frames_per_mode)
+            if result is None:
+                self.logger.debug(f"Mod okunamadı: {mode}")
+                continue
+            results.append(result)
+            self.logger.debug(
+                f"{mode.fourcc} {result.actual.width}x{result.actual.height}@{mode.fps:g}: "
+                f"{result.delivered_fps:.1f} fps, gecikme {result.latency_ms:.1f} ms "
+                f"(tamponda {result.buffered_frames})"
+            )
+        self.last_results = results
+        return results
+
+    def configure(self, capture, key: str, width: int, height: int, fps: float) -> Optional[CaptureMode]:
+        """Önbellekteki ya da yoklanan modu kameraya uygula; uygulanan modu döndür"""
+        cached = self.cache.load(key)
+        if cached is not None:
+            mode, buffer_size = cached
+            actual, _ = apply_capture_mode(capture, mode, buffer_size)
+            if (actual.fourcc, actual.width, actual.height) == (mode.fourcc, mode.width, mode.height):
+                self.logger.info(f"Kamera profili önbellekten: {mode.fourcc} {mode.width}x{mode.height}@{mode.fps:g}")
+                return actual
+            self.logger.info("Kamera önbellekteki modu kabul etmedi, yeniden yoklanıyor")
+
+        start = time.perf_counter()
+        best = select_mode(self.probe(capture, width, height, fps), width, height, fps)
+        if best is None:
+            self.logger.warning("Kamera yoklanamadı, varsayılan ayarlar kullanılıyor")
+            return None
+
+        actual, _ = apply_capture_mode(capture, best.actual, self.buffer_size)
+        self.cache.save(key, best)
+        self.logger.info(
+            f"Kamera modu seçildi ({len(self.last_results)} mod, {time.perf_counter() - start:.1f} s): "
+            f"{best.actual.fourcc} {best.actual.width}x{best.actual.height}, "
+            f"{best.delivered_fps:.1f} fps, gecikme {best.latency_ms:.1f} ms, "
+            f"tampon={best.buffer_size or 'varsayılan'}"
+        )
+        if not best.meets(width, height, fps):
+            self.logger.warning(f"Hiçbir mod hedefi ({width}x{height}@{fps:g}) karşılamadı")
+        return actual
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kamera modlarını yokla ve ölç")
+    parser.add_argument("--index", type=int, default=0)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--fps", type=float, default=30)
+    args = parser.parse_args()
+
+    camera = cv2.VideoCapture(args.index)
+    if not camera.isOpened():
+        raise SystemExit(f"Kamera {args.index} açılamadı")
+    try:
+        probe_results = CameraProbe(cache_path="").probe(camera, args.width, args.height, args.fps)
+    finally:
+        camera.release()
+
+    chosen = select_mode(probe_results, args.width, args.height, args.fps)
+    for r in probe_results:
+        marker = "*" if r is chosen else " "
+        print(f"{marker} {r.requested.fourcc} {r.requested.width}x{r.requested.height}@{r.requested.fps:g} -> "
+              f"{r.actual.fourcc} {r.actual.width}x{r.actual.height}: {r.delivered_fps:5.1f} fps, "
+              f"read={r.read_ms:5.1f} ms, tamponda={r.buffered_frames}, gecikme={r.latency_ms:5.1f} ms")
@@ -5,16 +5,77 @@ Postür verilerini saklar, analiz eder ve raporlar oluşturur
 
 import os
 import json
-import sqlite3
+import time
+import tempfile
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
 
 from config import AppConfig
+from core.db_connection import ConnectionManager, get_connection_manager
+from core.db_writer import DatabaseWriter
+
+# posture_records'a yazılan sütunlar (PostureRecord alan sırası, timestamp ISO metin;
+# ts epoch milisaniye, day yerel gün anahtarı)
+POSTURE_RECORD_COLUMNS = (
+    "timestamp", "head_forward_angle", "neck_angle", "shoulder_slope", "shoulder_width",
+    "back_straightness", "back_angle", "overall_score", "session_id", "duration", "ts", "day"
+)
+INSERT_POSTURE_RECORD_SQL = (
+    f"INSERT INTO posture_records ({', '.join(POSTURE_RECORD_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(POSTURE_RECORD_COLUMNS))})"
+)
+INSERT_SESSION_SQL = '''
+    INSERT OR REPLACE INTO sessions 
+    (session_id, start_time, end_time, total_duration, 
+     average_score, poor_posture_count, good_posture_count, alerts_triggered,
+     good_posture_seconds, poor_posture_seconds, start_ts, end_ts, day)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Günlük süre ağırlıklı trendler: idx_posture_records_ts üzerinde aralık taraması,
+# tabloya dönülmez (örnek aralıkları değişken olduğundan ağırlık süredir)
+TRENDS_SQL = '''
+    SELECT 
+        day as date,
+        SUM(overall_score * COALESCE(NULLIF(duration, 0), 1.0)) / SUM(COALESCE(NULLIF(duration, 0), 1.0)) as avg_score,
+        SUM(head_forward_angle * COALESCE(NULLIF(duration, 0), 1.0)) / SUM(COALESCE(NULLIF(duration, 0), 1.0)) as avg_head_forward,
+        SUM(neck_angle * COALESCE(NULLIF(duration, 0), 1.0)) / SUM(COALESCE(NULLIF(duration, 0), 1.0)) as avg_neck,
+        SUM(shoulder_slope * COALESCE(NULLIF(duration, 0), 1.0)) / SUM(COALESCE(NULLIF(duration, 0), 1.0)) as avg_shoulder,
+        SUM(back_straightness * COALESCE(NULLIF(duration, 0), 1.0)) / SUM(COALESCE(NULLIF(duration, 0), 1.0)) as avg_back
+    FROM posture_records
+    WHERE ts BETWEEN ? AND ?
+    GROUP BY day
+    ORDER BY day
+'''
+
+# PRAGMA user_version ile izlenen şema sürümü
+SCHEMA_VERSION = 2
+
+# ISO metin (yerel saat) -> epoch milisaniye; 'utc' değiştiricisi yerel saati UTC'ye çevirir
+ISO_TO_EPOCH_MS_SQL = "CAST(ROUND((julianday({column}, 'utc') - 2440587.5) * 86400000) AS INTEGER)"
+
+
+def to_epoch_ms(moment: datetime) -> int:
+    """Yerel saat datetime -> epoch milisaniye"""
+    return int(round(moment.timestamp() * 1000))
+
+
+def day_key(moment: datetime) -> str:
+    """Yerel gün anahtarı (daily_stats.date ile aynı biçim)"""
+    return moment.date().isoformat()
+
+
+def day_range_ms(first_day, last_day) -> Tuple[int, int]:
+    """[first_day 00:00, last_day + 1 gün 00:00) yerel aralığı epoch ms olarak"""
+    start = datetime.combine(first_day, datetime.min.time())
+    end = datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+    return to_epoch_ms(start), to_epoch_ms(end)
+
 
 @dataclass
 class PostureSession:
@@ -27,6 +88,8 @@ class PostureSession:
     poor_posture_count: int
     good_posture_count: int
     alerts_triggered: int
+    good_posture_seconds: float = 0.0  # Zaman ağırlıklı (örnek başına temsil ettiği süre)
+    poor_posture_seconds: float = 0.0
 
 @dataclass
 class PostureRecord:
@@ -40,24 +103,45 @@ class PostureRecord:
     back_angle: float
     overall_score: float
     session_id: str
+    duration: float = 0.0  # saniye, örneğin bir sonraki örneğe kadar temsil ettiği süre
 
 class DataManager:
     """Veri yönetimi sınıfı"""
     
-    def __init__(self):
+    def __init__(self, subject_id: Optional[str] = None, db_path: Optional[str] = None,
+                 background_writer: Optional[bool] = None):
         self.logger = logging.getLogger(__name__)
         self.config = AppConfig()
         
         # Veritabanı yolu
-        self.db_path = os.path.join(self.config.DATA_DIR, "posture_data.db")
+        self.db_path = db_path or os.path.join(self.config.DATA_DIR, "posture_data.db")
+        
+        # Çoklu kaynak izlemede kişi/kaynak kimliği (oturum kimliğine eklenir)
+        self.subject_id = subject_id
         
         # Mevcut oturum
         self.current_session: Optional[PostureSession] = None
         self.session_records: List[PostureRecord] = []
+        # Flush imleci: session_records'ta veritabanına yazılmış ön ekin uzunluğu
+        self.flushed_count = 0
         
         # Veritabanını başlat
+        self._closed = False
         self.init_database()
         
+        # Arka plan yazıcısı: kayıtlar ve oturum sonu çağıran thread'de G/Ç yapmaz
+        if background_writer is None:
+            background_writer = self.config.DB_BACKGROUND_WRITER
+        self.writer: Optional[DatabaseWriter] = None
+        if background_writer:
+            self.writer = DatabaseWriter(
+                self.db,
+                self._insert_records,
+                max_queue=self.config.DB_WRITER_QUEUE_SIZE,
+                batch_size=self.config.DB_WRITER_BATCH_SIZE,
+                max_delay=self.config.DB_WRITER_MAX_DELAY
+            )
+        
         self.logger.info("DataManager başlatıldı")
     
     def init_database(self):
@@ -66,7 +150,16 @@ class DataManager:
             # Veritabanı dizinini oluştur
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            with sqlite3.connect(self.db_path) as conn:
+            # Kalıcı yazıcı + okuyucu havuzu (aynı dosyayı kullanan örnekler paylaşır)
+            self.db: ConnectionManager = get_connection_manager(
+                self.db_path,
+                readers=self.config.DB_READER_CONNECTIONS,
+                synchronous=self.config.DB_SYNCHRONOUS,
+                cache_size_kb=self.config.DB_CACHE_SIZE_KB,
+                mmap_size_mb=self.config.DB_MMAP_SIZE_MB
+            )
+            
+            with self.db.write() as conn:
                 cursor = conn.cursor()
                 
                 # Oturumlar tablosu
@@ -113,6 +206,9 @@ class DataManager:
                     )
                 ''')
                 
+                # Sürümlü şema göçleri (eski veritabanları yerinde güncellenir)
+                self._migrate_schema(cursor)
+                
                 # Ayarlar tablosu
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS settings (
@@ -122,18 +218,83 @@ class DataManager:
                     )
                 ''')
                 
-                conn.commit()
-                
             self.logger.info("Veritabanı başarıyla başlatıldı")
             
         except Exception as e:
             self.logger.error(f"Veritabanı başlatma hatası: {str(e)}")
             raise
     
+    def _migrate_schema(self, cursor):
+        """PRAGMA user_version'dan SCHEMA_VERSION'a kadar göçleri sırayla uygula
+        
+        init_database'in açtığı işlem içinde çalışır; bir adım başarısız
+        olursa sürüm numarası da geri alınır.
+        """
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        
+        if version < 1:
+            # Zaman ağırlıklı istatistik sütunları
+            self._ensure_columns(cursor, "posture_records", {"duration": "REAL"})
+            self._ensure_columns(cursor, "sessions", {
+                "good_posture_seconds": "REAL",
+                "poor_posture_seconds": "REAL"
+            })
+        
+        if version < 2:
+            # Tamsayı zaman sütunları: ISO metin üzerinde DATE() tam tarama gerektirir
+            self._ensure_columns(cursor, "posture_records", {"ts": "INTEGER", "day": "TEXT"})
+            self._ensure_columns(cursor, "sessions", {
+                "start_ts": "INTEGER", "end_ts": "INTEGER", "day": "TEXT"
+            })
+            
+            # Mevcut satırları doldur (zaman damgaları yerel saatle yazılmıştı)
+            cursor.execute(f'''
+                UPDATE posture_records
+                SET ts = {ISO_TO_EPOCH_MS_SQL.format(column="timestamp")}, day = substr(timestamp, 1, 10)
+                WHERE ts IS NULL
+            ''')
+            cursor.execute(f'''
+                UPDATE sessions
+                SET start_ts = {ISO_TO_EPOCH_MS_SQL.format(column="start_time")},
+                    end_ts = {ISO_TO_EPOCH_MS_SQL.format(column="end_time")},
+                    day = substr(start_time, 1, 10)
+                WHERE start_ts IS NULL
+            ''')
+            
+            # Oturum flush/özet sorguları
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_posture_records_session_ts
+                ON posture_records (session_id, ts)
+            ''')
+            # Trend sorgusunun tüm sütunlarını taşır: tabloya dönmeden aralık taraması
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_posture_records_ts
+                ON posture_records (ts, day, duration, overall_score, head_forward_angle,
+                                    neck_angle, shoulder_slope, back_straightness)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sessions_start_ts
+                ON sessions (start_ts)
+            ''')
+        
+        if version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.logger.info(f"Veritabanı şeması güncellendi: sürüm {version} -> {SCHEMA_VERSION}")
+    
+    def _ensure_columns(self, cursor, table: str, columns: Dict[str, str]):
+        """Tabloda olmayan sütunları ekle"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+    
     def start_session(self) -> str:
         """Yeni bir postür oturumu başlat"""
         try:
             session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            if self.subject_id:
+                session_id = f"{session_id}_{self.subject_id}"
             
             self.current_session = PostureSession(
                 session_id=session_id,
@@ -147,6 +308,7 @@ class DataManager:
             )
             
             self.session_records = []
+            self.flushed_count = 0
             
             self.logger.info(f"Yeni oturum başlatıldı: {session_id}")
             return session_id
@@ -166,16 +328,31 @@ class DataManager:
                 self.current_session.end_time - self.current_session.start_time
             ).total_seconds() / 60.0  # dakika
             
-            # Ortalama skor hesapla
+            # Ortalama skor hesapla (örnek aralıkları değişken: süreyle ağırlıklı)
             if self.session_records:
-                scores = [record.overall_score for record in self.session_records]
-                self.current_session.average_score = sum(scores) / len(scores)
+                weights = [record.duration for record in self.session_records]
+                total_weight = sum(weights)
+                if total_weight > 0:
+                    self.current_session.average_score = sum(
+                        record.overall_score * weight for record, weight in zip(self.session_records, weights)
+                    ) / total_weight
+                else:
+                    scores = [record.overall_score for record in self.session_records]
+                    self.current_session.average_score = sum(scores) / len(scores)
             
-            # Oturumu veritabanına kaydet
-            self.save_session_to_db()
-            
-            # Günlük istatistikleri güncelle
-            self.update_daily_stats()
+            if self.writer is not None:
+                # Devredilen kayıtlar kuyrukta; kuyruk dolu olduğu için devredilemeyenler
+                # görevle (sınırsız) yazılır, oturum satırı ve günlük istatistik onlardan sonra
+                session = replace(self.current_session)
+                remaining = self.session_records[self.flushed_count:]
+                self.writer.put_task(lambda: self._save_session_summary(session, remaining))
+                self.flushed_count = len(self.session_records)
+            else:
+                # Oturumu veritabanına kaydet
+                self.save_session_to_db()
+                
+                # Günlük istatistikleri güncelle
+                self.update_daily_stats()
             
             self.logger.info(f"Oturum sonlandırıldı: {self.current_session.session_id}")
             
@@ -184,12 +361,21 @@ class DataManager:
         finally:
             self.current_session = None
             self.session_records = []
+            self.flushed_count = 0
     
-    def save_posture_data(self, posture_data: Dict[str, float], score: float):
-        """Postür verisini kaydet"""
+    def save_posture_data(self, posture_data: Dict[str, float], score: float,
+                          duration: Optional[float] = None):
+        """Postür verisini kaydet
+        
+        duration, örneğin bir sonraki örneğe kadar temsil ettiği süredir
+        (uyarlamalı örneklemede değişken); verilmezse sabit analiz aralığı.
+        """
         if not self.current_session:
             self.start_session()
         
+        if duration is None:
+            duration = self.config.POSTURE_CHECK_INTERVAL
+        
         try:
             # Postür kaydı oluştur
             record = PostureRecord(
@@ -201,129 +387,162 @@ class DataManager:
                 back_straightness=posture_data.get('back_straightness', 0.0),
                 back_angle=posture_data.get('back_angle', 0.0),
                 overall_score=score,
-                session_id=self.current_session.session_id
+                session_id=self.current_session.session_id,
+                duration=duration
             )
             
             # Oturum kayıtlarına ekle
             self.session_records.append(record)
             
+            # Arka plan yazıcısına devret (flush imleci devredilen kayıtları sayar)
+            if self.writer is not None:
+                self._hand_off_pending()
+            
             # İstatistikleri güncelle
             if score >= self.config.POOR_POSTURE_THRESHOLD:
                 self.current_session.good_posture_count += 1
+                self.current_session.good_posture_seconds += duration
             else:
                 self.current_session.poor_posture_count += 1
+                self.current_session.poor_posture_seconds += duration
             
         except Exception as e:
             self.logger.error(f"Postür verisi kaydetme hatası: {str(e)}")
     
     def save_session_to_db(self):
-        """Mevcut oturumu veritabanına kaydet"""
+        """Mevcut oturumu veritabanına kaydet
+        
+        Periyodik flush'larda yazılmış kayıtlar tekrar eklenmez; yalnızca
+        imleçten sonraki kalan kayıtlar yazılır.
+        """
         if not self.current_session:
             return
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            pending = self.session_records[self.flushed_count:]
+            with self.db.write() as conn:
                 cursor = conn.cursor()
                 
                 # Oturum verilerini kaydet
-                cursor.execute('''
-                    INSERT OR REPLACE INTO sessions 
-                    (session_id, start_time, end_time, total_duration, 
-                     average_score, poor_posture_count, good_posture_count, alerts_triggered)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    self.current_session.session_id,
-                    self.current_session.start_time.isoformat(),
-                    self.current_session.end_time.isoformat() if self.current_session.end_time else None,
-                    self.current_session.total_duration,
-                    self.current_session.average_score,
-                    self.current_session.poor_posture_count,
-                    self.current_session.good_posture_count,
-                    self.current_session.alerts_triggered
-                ))
+                cursor.execute(INSERT_SESSION_SQL, self._session_row(self.current_session))
                 
-                # Postür kayıtlarını kaydet
-                for record in self.session_records:
-                    cursor.execute('''
-                        INSERT INTO posture_records 
-                        (timestamp, head_forward_angle, neck_angle, shoulder_slope,
-                         shoulder_width, back_straightness, back_angle, overall_score, session_id)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        record.timestamp.isoformat(),
-                        record.head_forward_angle,
-                        record.neck_angle,
-                        record.shoulder_slope,
-                        record.shoulder_width,
-                        record.back_straightness,
-                        record.back_angle,
-                        record.overall_score,
-                        record.session_id
-                    ))
-                
-                conn.commit()
+                # Kalan postür kayıtlarını kaydet (aynı işlemde tek executemany)
+                self._insert_records(cursor, pending)
+            
+            # İmleç yalnızca commit başarılıysa ilerler
+            self.flushed_count += len(pending)
                 
         except Exception as e:
             self.logger.error(f"Veritabanı kaydetme hatası: {str(e)}")
     
+    def _session_row(self, session: PostureSession) -> Tuple:
+        """sessions tablosu satırı (INSERT_SESSION_SQL sırasıyla)"""
+        return (
+            session.session_id,
+            session.start_time.isoformat(),
+            session.end_time.isoformat() if session.end_time else None,
+            session.total_duration,
+            session.average_score,
+            session.poor_posture_count,
+            session.good_posture_count,
+            session.alerts_triggered,
+            session.good_posture_seconds,
+            session.poor_posture_seconds,
+            to_epoch_ms(session.start_time),
+            to_epoch_ms(session.end_time) if session.end_time else None,
+            day_key(session.start_time)
+        )
+    
+    def _hand_off_pending(self) -> int:
+        """İmleçten sonraki kayıtları sırayla yazıcıya devret; devredilen sayıyı döndür
+        
+        Kuyruk dolunca durulur: imleç yalnızca kabul edilen kayıtların
+        üzerinden geçer, kalanlar bir sonraki çağrıda yeniden denenir.
+        """
+        handed_off = 0
+        while (self.flushed_count < len(self.session_records) and
+               self.writer.put_record(self.session_records[self.flushed_count])):
+            self.flushed_count += 1
+            handed_off += 1
+        return handed_off
+    
+    def _save_session_summary(self, session: PostureSession, records: List[PostureRecord]):
+        """Kalan kayıtları, oturum satırını ve günlük istatistikleri yaz
+        
+        Yazıcı thread'inde çalışır ve açık işleme katılır.
+        """
+        with self.db.write() as conn:
+            cursor = conn.cursor()
+            self._insert_records(cursor, records)
+            cursor.execute(INSERT_SESSION_SQL, self._session_row(session))
+            self._update_daily_stats(cursor)
+    
     def update_daily_stats(self):
         """Günlük istatistikleri güncelle"""
         try:
-            today = datetime.now().date().isoformat()
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Bugünün verilerini hesapla
-                cursor.execute('''
-                    SELECT 
-                        COUNT(*) as sessions_count,
-                        SUM(total_duration) as total_time,
-                        AVG(average_score) as average_score,
-                        SUM(good_posture_count) as good_posture_total,
-                        SUM(poor_posture_count) as poor_posture_total,
-                        SUM(alerts_triggered) as total_alerts
-                    FROM sessions 
-                    WHERE DATE(start_time) = ?
-                ''', (today,))
-                
-                result = cursor.fetchone()
-                
-                if result and result[0] > 0:  # Eğer bugün oturum varsa
-                    sessions_count, total_time, avg_score, good_count, poor_count, total_alerts = result
-                    
-                    total_postures = good_count + poor_count
-                    good_percentage = (good_count / total_postures * 100) if total_postures > 0 else 0
-                    poor_percentage = (poor_count / total_postures * 100) if total_postures > 0 else 0
-                    
-                    # Günlük istatistikleri kaydet
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO daily_stats
-                        (date, total_time, average_score, good_posture_percentage,
-                         poor_posture_percentage, total_alerts, sessions_count)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        today,
-                        total_time or 0,
-                        avg_score or 0,
-                        good_percentage,
-                        poor_percentage,
-                        total_alerts or 0,
-                        sessions_count
-                    ))
-                    
-                    conn.commit()
-                    
+            with self.db.write() as conn:
+                self._update_daily_stats(conn.cursor())
         except Exception as e:
             self.logger.error(f"Günlük istatistik güncelleme hatası: {str(e)}")
     
+    def _update_daily_stats(self, cursor):
+        """Bugünün satırını açık işlemde yeniden hesapla (hata çağırana iletilir)"""
+        today_date = datetime.now().date()
+        today = today_date.isoformat()
+        day_start, day_end = day_range_ms(today_date, today_date)
+        
+        # Bugünün verilerini hesapla
+        cursor.execute('''
+            SELECT 
+                COUNT(*) as sessions_count,
+                SUM(total_duration) as total_time,
+                AVG(average_score) as average_score,
+                SUM(good_posture_count) as good_posture_total,
+                SUM(poor_posture_count) as poor_posture_total,
+                SUM(alerts_triggered) as total_alerts,
+                SUM(good_posture_seconds) as good_posture_seconds,
+                SUM(poor_posture_seconds) as poor_posture_seconds
+            FROM sessions 
+            WHERE start_ts >= ? AND start_ts < ?
+        ''', (day_start, day_end))
+        
+        result = cursor.fetchone()
+        
+        if result and result[0] > 0:  # Eğer bugün oturum varsa
+            (sessions_count, total_time, avg_score, good_count, poor_count, total_alerts,
+             good_seconds, poor_seconds) = result
+            
+            # Yüzdeler zaman ağırlıklı; süre bilgisi olmayan eski oturumlarda örnek sayısı
+            if (good_seconds or 0) + (poor_seconds or 0) > 0:
+                good_count, poor_count = good_seconds or 0, poor_seconds or 0
+            good_count, poor_count = good_count or 0, poor_count or 0
+            total_postures = good_count + poor_count
+            good_percentage = (good_count / total_postures * 100) if total_postures > 0 else 0
+            poor_percentage = (poor_count / total_postures * 100) if total_postures > 0 else 0
+            
+            # Günlük istatistikleri kaydet
+            cursor.execute('''
+                INSERT OR REPLACE INTO daily_stats
+                (date, total_time, average_score, good_posture_percentage,
+                 poor_posture_percentage, total_alerts, sessions_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                today,
+                total_time or 0,
+                avg_score or 0,
+                good_percentage,
+                poor_percentage,
+                total_alerts or 0,
+                sessions_count
+            ))
+    
     def get_daily_stats(self, days: int = 30) -> pd.DataFrame:
         """Son N günün istatistiklerini getir"""
         try:
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=days-1)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 query = '''
                     SELECT * FROM daily_stats 
                     WHERE date BETWEEN ? AND ?
@@ -344,12 +563,12 @@ class DataManager:
     def get_session_history(self, limit: int = 50) -> List[PostureSession]:
         """Oturum geçmişini getir"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
                     SELECT * FROM sessions 
-                    ORDER BY start_time DESC 
+                    ORDER BY start_ts DESC 
                     LIMIT ?
                 ''', (limit,))
                 
@@ -363,7 +582,9 @@ class DataManager:
                         average_score=row[4] or 0,
                         poor_posture_count=row[5] or 0,
                         good_posture_count=row[6] or 0,
-                        alerts_triggered=row[7] or 0
+                        alerts_triggered=row[7] or 0,
+                        good_posture_seconds=row[8] or 0,
+                        poor_posture_seconds=row[9] or 0
                     )
                     sessions.append(session)
                 
@@ -379,24 +600,10 @@ class DataManager:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
-                query = '''
-                    SELECT 
-                        DATE(timestamp) as date,
-                        AVG(overall_score) as avg_score,
-                        AVG(head_forward_angle) as avg_head_forward,
-                        AVG(neck_angle) as avg_neck,
-                        AVG(shoulder_slope) as avg_shoulder,
-                        AVG(back_straightness) as avg_back
-                    FROM posture_records 
-                    WHERE timestamp BETWEEN ? AND ?
-                    GROUP BY DATE(timestamp)
-                    ORDER BY date
-                '''
-                
-                df = pd.read_sql_query(query, conn, params=(
-                    start_date.isoformat(),
-                    end_date.isoformat()
+            with self.db.read() as conn:
+                df = pd.read_sql_query(TRENDS_SQL, conn, params=(
+                    to_epoch_ms(start_date),
+                    to_epoch_ms(end_date)
                 ))
                 
                 trends = {
@@ -420,22 +627,24 @@ class DataManager:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
-                # Tüm verileri al
+            with self.db.read() as conn:
+                # Tüm verileri al (dışa aktarım biçimi sabit: iç ts/day sütunları eklenmez)
                 query = '''
                     SELECT 
-                        pr.*,
+                        pr.id, pr.timestamp, pr.head_forward_angle, pr.neck_angle,
+                        pr.shoulder_slope, pr.shoulder_width, pr.back_straightness,
+                        pr.back_angle, pr.overall_score, pr.session_id, pr.duration,
                         s.start_time as session_start,
                         s.total_duration as session_duration
                     FROM posture_records pr
                     LEFT JOIN sessions s ON pr.session_id = s.session_id
-                    WHERE pr.timestamp BETWEEN ? AND ?
-                    ORDER BY pr.timestamp
+                    WHERE pr.ts BETWEEN ? AND ?
+                    ORDER BY pr.ts
                 '''
                 
                 df = pd.read_sql_query(query, conn, params=(
-                    start_date.isoformat(),
-                    end_date.isoformat()
+                    to_epoch_ms(start_date),
+                    to_epoch_ms(end_date)
                 ))
                 
                 # Dosya yolu
@@ -463,52 +672,365 @@ class DataManager:
     
     def save_session_data(self):
         """Mevcut oturum verilerini kaydet (periyodik)"""
-        if self.current_session and self.session_records:
+        if self.writer is not None:
+            # Kuyruk dolu olduğu için bekleyen kayıtlar varsa yeniden devret
+            if self.current_session and self._hand_off_pending():
+                self.logger.debug("Bekleyen kayıtlar yazıcıya devredildi")
+            return
+        
+        if self.current_session and len(self.session_records) > self.flushed_count:
             try:
-                # Sadece yeni kayıtları veritabanına ekle
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.cursor()
-                    
-                    # Son kaydedilen zamanı kontrol et
-                    cursor.execute('''
-                        SELECT MAX(timestamp) FROM posture_records 
-                        WHERE session_id = ?
-                    ''', (self.current_session.session_id,))
-                    
-                    last_saved = cursor.fetchone()[0]
-                    last_saved_time = datetime.fromisoformat(last_saved) if last_saved else datetime.min
-                    
-                    # Yeni kayıtları filtrele
-                    new_records = [r for r in self.session_records if r.timestamp > last_saved_time]
-                    
-                    # Yeni kayıtları ekle
-                    for record in new_records:
-                        cursor.execute('''
-                            INSERT INTO posture_records 
-                            (timestamp, head_forward_angle, neck_angle, shoulder_slope,
-                             shoulder_width, back_straightness, back_angle, overall_score, session_id)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            record.timestamp.isoformat(),
-                            record.head_forward_angle,
-                            record.neck_angle,
-                            record.shoulder_slope,
-                            record.shoulder_width,
-                            record.back_straightness,
-                            record.back_angle,
-                            record.overall_score,
-                            record.session_id
-                        ))
-                    
-                    conn.commit()
-                    
-                    if new_records:
-                        self.logger.debug(f"{len(new_records)} yeni kayıt kaydedildi")
-                        
+                # Sadece imleçten sonraki yeni kayıtları ekle (veritabanı taranmaz)
+                new_records = self.session_records[self.flushed_count:]
+                with self.db.write() as conn:
+                    self._insert_records(conn.cursor(), new_records)
+                
+                # İmleç yalnızca commit başarılıysa ilerler; hata olursa kayıtlar sonraki flush'ta denenir
+                self.flushed_count += len(new_records)
+                self.logger.debug(f"{len(new_records)} yeni kayıt kaydedildi")
+                
             except Exception as e:
                 self.logger.error(f"Oturum verisi kaydetme hatası: {str(e)}")
     
+    def _insert_records(self, cursor, records: List[PostureRecord]) -> int:
+        """Kayıtları sütun dizilerine çevirip tek executemany ile ekle
+        
+        Çağıranın açtığı işlem içinde çalışır; flush başına tek işlem.
+        """
+        if not records:
+            return 0
+        
+        columns = (
+            [record.timestamp.isoformat() for record in records],
+            [record.head_forward_angle for record in records],
+            [record.neck_angle for record in records],
+            [record.shoulder_slope for record in records],
+            [record.shoulder_width for record in records],
+            [record.back_straightness for record in records],
+            [record.back_angle for record in records],
+            [record.overall_score for record in records],
+            [record.session_id for record in records],
+            [record.duration for record in records],
+            [to_epoch_ms(record.timestamp) for record in records],
+            [day_key(record.timestamp) for record in records]
+        )
+        cursor.executemany(INSERT_POSTURE_RECORD_SQL, zip(*columns))
+        return len(records)
+    
+    def import_session_records(self, session_id: str, timestamps: np.ndarray,
+                               metrics: Dict[str, np.ndarray], scores: np.ndarray) -> int:
+        """Toplu (çevrimdışı) analiz sonuçlarını posture_records tablosuna ekle
+        
+        Aynı oturuma parça parça eklenebilir; oturum satırı her seferinde
+        eklenen kayıtlardan yeniden hesaplanır.
+        """
+        if len(timestamps) == 0:
+            return 0
+        
+        try:
+            # Her kayıt bir sonraki kayda kadar olan süreyi temsil eder
+            gaps = np.diff(timestamps)
+            last_gap = float(np.median(gaps)) if len(gaps) else 0.0
+            durations = np.append(gaps, last_gap)
+            
+            moments = [datetime.fromtimestamp(t) for t in timestamps.tolist()]
+            rows = zip(
+                (moment.isoformat() for moment in moments),
+                metrics['head_forward_angle'].tolist(),
+                metrics['neck_angle'].tolist(),
+                metrics['shoulder_slope'].tolist(),
+                metrics['shoulder_width'].tolist(),
+                metrics['back_straightness'].tolist(),
+                metrics['back_angle'].tolist(),
+                scores.tolist(),
+                [session_id] * len(timestamps),
+                durations.tolist(),
+                np.round(timestamps * 1000).astype(np.int64).tolist(),
+                (day_key(moment) for moment in moments)
+            )
+            
+            with self.db.write() as conn:
+                cursor = conn.cursor()
+                
+                cursor.executemany(INSERT_POSTURE_RECORD_SQL, rows)
+                
+                # Oturum özetini kayıtlardan hesapla
+                cursor.execute('''
+                    SELECT MIN(timestamp), MAX(timestamp), MIN(ts), MAX(ts),
+                           COALESCE(SUM(overall_score * duration) / NULLIF(SUM(duration), 0), AVG(overall_score)),
+                           SUM(overall_score < ?), SUM(overall_score >= ?),
+                           SUM(CASE WHEN overall_score >= ? THEN duration ELSE 0 END),
+                           SUM(CASE WHEN overall_score < ? THEN duration ELSE 0 END)
+                    FROM posture_records WHERE session_id = ?
+                ''', (self.config.POOR_POSTURE_THRESHOLD,) * 4 + (session_id,))
+                (start_time, end_time, start_ts, end_ts, average_score, poor_count, good_count,
+                 good_seconds, poor_seconds) = cursor.fetchone()
+                
+                total_duration = (end_ts - start_ts) / 60000.0
+                
+                cursor.execute(INSERT_SESSION_SQL, (
+                    session_id, start_time, end_time, total_duration, average_score,
+                    poor_count, good_count, 0, good_seconds, poor_seconds,
+                    start_ts, end_ts, start_time[:10]
+                ))
+            
+            return len(timestamps)
+            
+        except Exception as e:
+            self.logger.error(f"Toplu kayıt ekleme hatası: {str(e)}")
+            return 0
+    
+    def get_db_stats(self) -> Dict[str, float]:
+        """Commit gecikmesi, okuyucu havuzu ve yazıcı kuyruğu sayaçları"""
+        stats = self.db.get_stats()
+        if self.writer is not None:
+            stats.update({f"writer_{key}": value for key, value in self.writer.get_stats().items()})
+        return stats
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Yazıcı kuyruğundaki her şey commit edilene kadar bekle"""
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+    
+    def close(self):
+        """Yazıcı kuyruğunu boşalt ve paylaşılan bağlantı referansını bırak
+        
+        Aynı dosyayı kullanan diğer DataManager'lar açık kaldıkça bağlantılar
+        kapanmaz; son örnek kapanınca kapatılır.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self.writer is not None:
+            self.writer.close()
+        self.db.release()
+    
     def increment_alert_count(self):
         """Uyarı sayısını artır"""
         if self.current_session:
             self.current_session.alerts_triggered += 1
+
+
+def test_exactly_once(records_per_flush: int = 25, flushes: int = 4, background_writer: bool = False,
+                      writer_queue_size: Optional[int] = None) -> int:
+    """Periyodik ve son flush'larla her kaydın tam bir kez yazıldığını doğrula
+
+    Geçici veritabanında bir oturum boyunca ara ara save_session_data()
+    çağrılır (bazıları arada yeni kayıt olmadan), sonra end_session() ile
+    kalanlar yazılır. background_writer ile aynı senaryo yazıcı kuyruğu
+    üzerinden çalışır ve okumadan önce flush() beklenir; writer_queue_size
+    küçük verilirse reddedilen kayıtların sonradan yazıldığı da sınanır. Satır sayısı ve
+    zaman damgaları eklenen kayıtlarla birebir eşleşmezse AssertionError
+    verir; yazılan satır sayısını döndürür.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        manager = DataManager(db_path=os.path.join(directory, "exactly_once.db"),
+                              background_writer=background_writer)
+        if manager.writer is not None and writer_queue_size:
+            manager.writer.max_queue = writer_queue_size
+        try:
+            session_id = manager.start_session()
+            expected = []
+            metrics = {"head_forward_angle": 10.0, "neck_angle": 15.0}
+
+            for flush in range(flushes):
+                for i in range(records_per_flush):
+                    manager.save_posture_data(metrics, score=(i % 10) / 10, duration=0.5)
+                    expected.append(manager.session_records[-1].timestamp.isoformat())
+                manager.save_session_data()
+                manager.save_session_data()  # Yeni kayıt yokken flush hiçbir şey yazmamalı
+                if not writer_queue_size:
+                    assert manager.flushed_count == len(expected), "flush imleci kayıt sayısıyla eşleşmiyor"
+                assert manager.flushed_count <= len(expected), "flush imleci kayıt sayısını aştı"
+
+            # Son flush'tan sonra gelen kayıtlar end_session'da yazılmalı
+            for i in range(records_per_flush // 2 + 1):
+                manager.save_posture_data(metrics, score=0.9, duration=0.5)
+                expected.append(manager.session_records[-1].timestamp.isoformat())
+            manager.end_session()
+            assert manager.flush(timeout=10.0), "yazıcı kuyruğu boşaltılamadı"
+
+            with manager.db.read() as conn:
+                stored = [row[0] for row in conn.execute(
+                    "SELECT timestamp FROM posture_records WHERE session_id = ? ORDER BY id",
+                    (session_id,)
+                )]
+                sessions = conn.execute(
+                    "SELECT COUNT(*) FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()[0]
+        finally:
+            manager.close()
+
+    assert len(stored) == len(expected), f"{len(expected)} kayıt beklendi, {len(stored)} yazıldı"
+    assert stored == expected, "yazılan kayıtlar eklenenlerle aynı sırada ve tekil değil"
+    assert sessions == 1, f"oturum {sessions} kez yazıldı"
+    return len(stored)
+
+
+def benchmark_inserts(sizes=(1_000, 100_000, 1_000_000), legacy: bool = True) -> List[Dict[str, float]]:
+    """Toplu (executemany, tek işlem) ve satır satır ekleme hızını ölç (satır/s)
+
+    Her boyut geçici bir veritabanına yazılır; satır satır yol eski
+    kodun yaptığı gibi her kayıt için ayrı execute ve tuple kullanır.
+    """
+    rng = np.random.default_rng(0)
+    base_time = datetime.now()
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            values = rng.random((size, 7)) * 30
+            records = [
+                PostureRecord(base_time + timedelta(milliseconds=500 * i), *row[:6].tolist(),
+                              overall_score=float(row[6] / 30), session_id="benchmark", duration=0.5)
+                for i, row in enumerate(values)
+            ]
+            row = {"rows": size}
+
+            paths = [("bulk", os.path.join(directory, f"bulk_{size}.db"))]
+            if legacy:
+                paths.append(("legacy", os.path.join(directory, f"legacy_{size}.db")))
+
+            for name, path in paths:
+                manager = DataManager(db_path=path, background_writer=False)
+                start = time.perf_counter()
+                with manager.db.write() as conn:
+                    cursor = conn.cursor()
+                    if name == "bulk":
+                        manager._insert_records(cursor, records)
+                    else:
+                        for record in records:
+                            cursor.execute(INSERT_POSTURE_RECORD_SQL, (
+                                record.timestamp.isoformat(), record.head_forward_angle,
+                                record.neck_angle, record.shoulder_slope, record.shoulder_width,
+                                record.back_straightness, record.back_angle, record.overall_score,
+                                record.session_id, record.duration,
+                                to_epoch_ms(record.timestamp), day_key(record.timestamp)
+                            ))
+                elapsed = time.perf_counter() - start
+                row[f"{name}_rows_per_second"] = size / elapsed if elapsed > 0 else 0.0
+                manager.close()
+
+            results.append(row)
+
+    return results
+
+
+def build_synthetic_year(db_path: str, days: int = 365, records_per_day: int = 2880,
+                         seed: int = 0) -> "DataManager":
+    """Günde bir oturumluk (09:00'dan itibaren 10 s aralıklı) sentetik veritabanı kur"""
+    rng = np.random.default_rng(seed)
+    manager = DataManager(db_path=db_path, background_writer=False)
+    first_day = datetime.now().date() - timedelta(days=days - 1)
+
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        start = datetime.combine(day, datetime.min.time()).replace(hour=9).timestamp()
+        timestamps = start + np.arange(records_per_day) * 10.0
+        metrics = {
+            "head_forward_angle": rng.normal(12, 5, records_per_day),
+            "neck_angle": rng.normal(15, 6, records_per_day),
+            "shoulder_slope": rng.normal(3, 2, records_per_day),
+            "shoulder_width": rng.normal(0.3, 0.02, records_per_day),
+            "back_straightness": rng.normal(8, 4, records_per_day),
+            "back_angle": rng.normal(5, 3, records_per_day)
+        }
+        scores = np.clip(rng.normal(0.75, 0.15, records_per_day), 0.0, 1.0)
+        manager.import_session_records(f"session_{day.strftime('%Y%m%d')}_090000", timestamps, metrics, scores)
+
+    return manager
+
+
+def benchmark_queries(days: int = 365, records_per_day: int = 2880, repeats: int = 5) -> List[Dict[str, object]]:
+    """Bir yıllık sentetik veritabanında eski (DATE()/ISO metin) ve yeni (ts aralığı) sorguları zamanla
+
+    Her sorgu için medyan süre (ms) ve SQLite'ın seçtiği erişim yolu döner.
+    Eski ISO sütunları göçten sonra da durduğundan iki sorgu aynı veride
+    karşılaştırılır.
+    """
+    today = datetime.now().date()
+    today_range = day_range_ms(today, today)
+    week_start = datetime.now() - timedelta(days=7)
+    month_start = datetime.now() - timedelta(days=30)
+    now = datetime.now()
+
+    daily_stats_sql = '''
+        SELECT COUNT(*), SUM(total_duration), AVG(average_score), SUM(good_posture_count),
+               SUM(poor_posture_count), SUM(alerts_triggered), SUM(good_posture_seconds),
+               SUM(poor_posture_seconds)
+        FROM sessions WHERE {where}
+    '''
+    legacy_trends_sql = '''
+        SELECT 
+            DATE(timestamp) as date,
+            SUM(overall_score * w) / SUM(w), SUM(head_forward_angle * w) / SUM(w),
+            SUM(neck_angle * w) / SUM(w), SUM(shoulder_slope * w) / SUM(w),
+            SUM(back_straightness * w) / SUM(w)
+        FROM (SELECT *, COALESCE(NULLIF(duration, 0), 1.0) as w FROM posture_records)
+        WHERE timestamp BETWEEN ? AND ?
+        GROUP BY DATE(timestamp)
+        ORDER BY date
+    '''
+    cases = [
+        ("günlük istatistik",
+         daily_stats_sql.format(where="DATE(start_time) = ?"), (today.isoformat(),),
+         daily_stats_sql.format(where="start_ts >= ? AND start_ts < ?"), today_range),
+        ("oturum geçmişi",
+         "SELECT * FROM sessions ORDER BY start_time DESC LIMIT 50", (),
+         "SELECT * FROM sessions ORDER BY start_ts DESC LIMIT 50", ()),
+        ("7 günlük trend",
+         legacy_trends_sql, (week_start.isoformat(), now.isoformat()),
+         TRENDS_SQL, (to_epoch_ms(week_start), to_epoch_ms(now))),
+        ("30 günlük trend",
+         legacy_trends_sql, (month_start.isoformat(), now.isoformat()),
+         TRENDS_SQL, (to_epoch_ms(month_start), to_epoch_ms(now))),
+        ("oturum kayıt aralığı",
+         "SELECT MIN(timestamp), MAX(timestamp) FROM posture_records WHERE session_id = ?",
+         (f"session_{today.strftime('%Y%m%d')}_090000",),
+         "SELECT MIN(ts), MAX(ts) FROM posture_records WHERE session_id = ?",
+         (f"session_{today.strftime('%Y%m%d')}_090000",))
+    ]
+
+    def timed(conn, sql, params) -> Tuple[float, str]:
+        plan = "; ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        return float(np.median(samples)), plan
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        manager = build_synthetic_year(os.path.join(directory, "year.db"), days, records_per_day)
+        try:
+            with manager.db.read() as conn:
+                for name, legacy_sql, legacy_params, sql, params in cases:
+                    legacy_ms, legacy_plan = timed(conn, legacy_sql, legacy_params)
+                    new_ms, new_plan = timed(conn, sql, params)
+                    results.append({
+                        "query": name, "legacy_ms": legacy_ms, "ms": new_ms,
+                        "legacy_plan": legacy_plan, "plan": new_plan
+                    })
+        finally:
+            manager.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    print(f"Tam bir kez yazma: {test_exactly_once()} kayıt doğrulandı")
+    print(f"Tam bir kez yazma (arka plan yazıcısı): {test_exactly_once(background_writer=True)} kayıt doğrulandı")
+    print(f"Tam bir kez yazma (dolu yazıcı kuyruğu): "
+          f"{test_exactly_once(background_writer=True, writer_queue_size=3)} kayıt doğrulandı")
+    for result in benchmark_inserts():
+        line = f"{result['rows']:>9,d} satır: toplu {result['bulk_rows_per_second']:>12,.0f} satır/s"
+        if "legacy_rows_per_second" in result:
+            line += (f", satır satır {result['legacy_rows_per_second']:>12,.0f} satır/s "
+                     f"(x{result['bulk_rows_per_second'] / result['legacy_rows_per_second']:.2f})")
+        print(line)
+    print(f"Bir yıllık sentetik veritabanında sorgular:")
+    for result in benchmark_queries():
+        print(f"  {result['query']:<22} eski {result['legacy_ms']:>9.2f} ms -> yeni {result['ms']:>8.2f} ms"
+              f"  [{result['plan']}]")
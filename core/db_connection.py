@@ -0,0 +1,201 @@
+"""
+PostureFix - Veritabanı Bağlantı Modülü
+Tek bir kalıcı yazıcı bağlantısı ve küçük bir salt okunur okuyucu havuzu;
+WAL kipinde okumalar yazmayı, yazma okumaları bloklamaz. PRAGMA ayarları
+bağlantı başına bir kez yapılır, commit gecikmesi histogramda toplanır
+"""
+
+import os
+import queue
+import pathlib
+import sqlite3
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from utils.profiling import StageHistogram
+
+# Uygulamadaki tüm DataManager örnekleri aynı dosya için aynı yöneticiyi paylaşır
+_managers: Dict[str, "ConnectionManager"] = {}
+_managers_lock = threading.Lock()
+
+
+class ConnectionManager:
+    """SQLite bağlantı yöneticisi
+
+    write() yazıcı bağlantısını kilitle alır ve blok sonunda commit eder
+    (hata olursa rollback). read() havuzdan bir okuyucu ödünç verir; WAL
+    sayesinde okuyucular son commit edilmiş anlık görüntüyü görür ve
+    yazıcıyı beklemez. get_connection_manager() ile paylaşılan yönetici
+    referans sayılır; son release() bağlantıları kapatır.
+    """
+
+    def __init__(self, db_path: str, readers: int = 2, synchronous: str = "NORMAL",
+                 cache_size_kb: int = 16384, mmap_size_mb: int = 64, busy_timeout_ms: int = 5000):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size_mb * 1024 * 1024
+        self.busy_timeout_ms = busy_timeout_ms
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._write_lock = threading.RLock()
+        self._write_depth = 0  # Kilidi tutan thread'in iç içe write() derinliği
+        self._refs = 0
+        self._writer = self._connect(read_only=False)
+        self.journal_mode = self._writer.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if self.journal_mode.lower() != "wal":
+            self.logger.warning(f"WAL kipi açılamadı (journal_mode={self.journal_mode})")
+
+        self._reader_count = max(1, readers)
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._reader_lock = threading.Lock()
+        self._opened_readers = 0
+        self._closed = False
+
+        # Sayaçlar
+        self.commit_histogram = StageHistogram()
+        self.reads = 0
+        self.reader_waits = 0
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            # URI yoldaki boşluk, ?, #, % ve Windows ayraçları için kodlanır
+            uri = pathlib.Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   timeout=self.busy_timeout_ms / 1000)
+            conn.execute("PRAGMA query_only=ON")
+        else:
+            # İşlemler açıkça yönetilir (BEGIN/COMMIT)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size=-{self.cache_size_kb}")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        return conn
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Yazıcı bağlantısında tek bir işlem
+        
+        Sadece aynı thread'den iç içe çağrılar dış işleme katılır (kilit
+        yeniden girişli olduğundan derinlik > 0 ise çağıran kilidin
+        sahibidir). Commit başarısız olursa işlem geri alınır.
+        """
+        with self._write_lock:
+            conn = self._writer
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._write_depth -= 1
+                return
+
+            if conn.in_transaction:
+                # Normalde olmaz; yarım kalmış bir işleme sessizce katılmak yerine geri al
+                self.logger.warning("Yazıcı bağlantısında açık işlem bulundu, geri alınıyor")
+                conn.rollback()
+
+            conn.execute("BEGIN IMMEDIATE")
+            self._write_depth = 1
+            try:
+                yield conn
+                start = time.perf_counter_ns()
+                conn.commit()
+                self.commit_histogram.add(time.perf_counter_ns() - start)
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            finally:
+                self._write_depth = 0
+
+    @contextmanager
+    def read(self, timeout: float = 5.0) -> Iterator[sqlite3.Connection]:
+        """Havuzdan salt okunur bir bağlantı ödünç al"""
+        conn = self._acquire_reader(timeout)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+            self.reads += 1
+
+    def _acquire_reader(self, timeout: float) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Havuz tembel doldurulur: okuyucular ilk ihtiyaçta açılır
+        with self._reader_lock:
+            if self._opened_readers < self._reader_count:
+                self._opened_readers += 1
+                return self._connect(read_only=True)
+
+        self.reader_waits += 1
+        return self._readers.get(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Commit gecikmesi (ms) ve okuyucu havuzu sayaçları"""
+        stats = {f"commit_{key}": value for key, value in self.commit_histogram.summary().items()}
+        stats.update({
+            "journal_mode": self.journal_mode,
+            "reads": self.reads,
+            "reader_waits": self.reader_waits,
+            "readers_open": self._opened_readers
+        })
+        return stats
+
+    def release(self):
+        """Referansı bırak; son referansta bağlantıları kapat"""
+        with _managers_lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            if _managers.get(os.path.abspath(self.db_path)) is self:
+                del _managers[os.path.abspath(self.db_path)]
+        self.close()
+
+    def close(self):
+        """Tüm bağlantıları kapat (WAL denetim noktası yazıcı kapanışında yapılır)"""
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            self._writer.close()
+
+        summary = self.commit_histogram.summary()
+        self.logger.info(
+            f"Veritabanı kapatıldı: {summary['count']} commit, p50={summary['p50_ms']:.2f}ms "
+            f"p95={summary['p95_ms']:.2f}ms p99={summary['p99_ms']:.2f}ms, {self.reads} okuma"
+        )
+
+
+def get_connection_manager(db_path: str, **options) -> ConnectionManager:
+    """Dosya başına paylaşılan bağlantı yöneticisi (yoksa oluştur)
+
+    Her çağrı bir referans alır; işi biten çağıran release() çağırmalıdır.
+    """
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None or manager._closed:
+            manager = _managers[key] = ConnectionManager(db_path, **options)
+        manager._refs += 1
+        return manager
@@ -0,0 +1,253 @@
+"""
+PostureFix - Arka Plan Veritabanı Yazıcı Modülü
+Postür kayıtları ve oturum olayları sınırlı bir kuyruğa eklenir; tek bir
+yazıcı thread'i kuyruğu boşaltıp boyut ya da süre dolunca toplu commit
+eder. GUI thread'i SQLite G/Ç'sini beklemez
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from core.db_connection import ConnectionManager
+from utils.profiling import StageHistogram
+
+# Kuyruk öğe türleri
+_RECORD = 0
+_TASK = 1
+_BARRIER = 2
+
+
+class DatabaseWriter:
+    """Kuyruktaki kayıtları ve görevleri tek thread'de, gruplu işlemlerle yazan sınıf
+
+    Üreticiler put_record()/put_task() ile deque'ye ekler; deque.append ve
+    popleft GIL altında atomik olduğundan üretici tarafında kilit yoktur,
+    thread yalnızca batch dolunca ya da görev/bariyer gelince uyandırılır.
+    Öğeler FIFO sırayla yazılır: ardışık kayıtlar tek executemany ile,
+    görevler aynı işlemin içinde çalışır. Commit, kuyrukta batch_size öğe
+    biriktiğinde ya da en geç max_delay saniyede bir yapılır.
+
+    Kuyruk doluysa yeni kayıt reddedilir (GUI thread'i beklemez); kayıt
+    çağıranda kalır ve sonra tekrar verilmelidir. Görevler ve bariyerler
+    sınıra tabi değildir. Başarısız bir batch atılmaz: kuyruğun başına
+    geri konur ve artan bekleme ile yeniden denenir; içindeki bariyerler
+    ancak commit başarılı olunca tamamlanır. Her görev bir SAVEPOINT içinde
+    çalışır: hata verirse yalnızca kendi yazdıkları geri alınır, önceki
+    kayıtlar commit edilir ve görev (ardındaki öğelerle) yeniden denenir.
+    """
+
+    def __init__(self, db: ConnectionManager, insert_records: Callable[[Any, List], int],
+                 max_queue: int = 10000, batch_size: int = 256, max_delay: float = 2.0,
+                 retry_delay: float = 0.1, max_retry_delay: float = 5.0):
+        self.logger = logging.getLogger(__name__)
+        self.db = db
+        self.insert_records = insert_records
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self._queue = deque()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()  # Yeniden deneme beklemesini keser
+        self._stopping = False
+        self._consecutive_failures = 0
+
+        # Sayaçlar
+        self.commit_histogram = StageHistogram()  # BEGIN'den commit'e işlem süresi
+        self.records_written = 0
+        self.tasks_run = 0
+        self.commits = 0
+        self.rejected = 0      # Kuyruk dolu olduğu için çağırana geri verilen kayıtlar
+        self.lost = 0          # Kapanışta yazılamadan bırakılan öğeler
+        self.retries = 0
+        self.failed_batches = 0
+        self.failed_tasks = 0
+        self.max_depth = 0
+
+        self._thread = threading.Thread(target=self._run, name="posture-db-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def put_record(self, record) -> bool:
+        """Kaydı kuyruğa ekle; kuyruk doluysa reddet (False, kayıt çağıranda kalır)"""
+        depth = len(self._queue)
+        if depth >= self.max_queue or self._stopping:
+            self.rejected += 1
+            if self.rejected == 1 or self.rejected % 1000 == 0:
+                self.logger.warning(f"Yazıcı kuyruğu dolu, {self.rejected} kayıt reddedildi (sonra yeniden verilecek)")
+            return False
+
+        self._queue.append((_RECORD, record))
+        if depth + 1 > self.max_depth:
+            self.max_depth = depth + 1
+        if depth + 1 >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def put_task(self, task: Callable[[], None]):
+        """Yazıcı thread'inde, açık işlemin içinde çalışacak görevi ekle
+
+        Görev self.db.write() çağırırsa dış işleme katılır; önceki tüm
+        kayıtlar aynı ya da daha önceki bir işlemde yazılmış olur.
+        """
+        self._queue.append((_TASK, task))
+        self._wakeup.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Şu ana kadar eklenen her şey commit edilene kadar bekle"""
+        if not self._thread.is_alive():
+            return not self._queue
+        done = threading.Event()
+        self._queue.append((_BARRIER, done))
+        self._wakeup.set()
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """Kuyruğu boşalt, thread'i durdur; tümü yazıldıysa True"""
+        flushed = self.flush(timeout)
+        self._stopping = True
+        self._stop_event.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        if not flushed:
+            self.logger.error(f"Yazıcı kapanışta boşaltılamadı, kuyrukta {len(self._queue)} öğe kaldı")
+
+        summary = self.commit_histogram.summary()
+        self.logger.info(
+            f"Veritabanı yazıcısı kapatıldı: {self.records_written} kayıt, {self.commits} commit, "
+            f"p95={summary['p95_ms']:.2f}ms, en derin kuyruk {self.max_depth}, "
+            f"reddedilen {self.rejected}, yeniden deneme {self.retries}, kaybedilen {self.lost}"
+        )
+        return flushed
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.max_delay)
+            self._wakeup.clear()
+
+            while self._queue:
+                self._write_batch()
+
+            if self._stopping and not self._queue:
+                break
+
+    def _take_batch(self) -> List:
+        """Kuyruktan bir işlemlik öğe al (en fazla batch_size kayıt)"""
+        items = []
+        records = 0
+        while self._queue and records < self.batch_size:
+            item = self._queue.popleft()
+            items.append(item)
+            if item[0] == _RECORD:
+                records += 1
+            elif item[0] == _BARRIER:
+                break
+        return items
+
+    def _write_batch(self):
+        items = self._take_batch()
+        barriers = [payload for kind, payload in items if kind == _BARRIER]
+        if len(barriers) == len(items):
+            # Yazılacak bir şey yok: boş işlem açılmaz
+            for done in barriers:
+                done.set()
+            return
+        records = []
+        written = 0
+        pending = []       # Başarısız görev ve ardından gelen, yeniden denenecek öğeler
+        task_error = None
+
+        start = time.perf_counter_ns()
+        try:
+            with self.db.write() as conn:
+                cursor = conn.cursor()
+                for index, (kind, payload) in enumerate(items):
+                    if kind == _RECORD:
+                        records.append(payload)
+                        continue
+                    # Görevden önce biriken kayıtlar yazılır: sıra korunur
+                    if records:
+                        written += self.insert_records(cursor, records)
+                        records = []
+                    if kind == _TASK:
+                        try:
+                            self._run_task(cursor, payload)
+                        except Exception as e:
+                            # Görevin yazdıkları geri alındı; öncekiler commit edilir,
+                            # görev sırası bozulmadan yeniden denenir
+                            task_error = e
+                            pending = items[index:]
+                            break
+                if records:
+                    written += self.insert_records(cursor, records)
+            self.commit_histogram.add(time.perf_counter_ns() - start)
+            self.commits += 1
+            self.records_written += written
+        except Exception as e:
+            # İşlem geri alındı: batch sırası korunarak kuyruğun başına döner
+            self.failed_batches += 1
+            self._retry(items, f"Toplu yazma hatası: {str(e)}")
+            return
+
+        if task_error is not None:
+            self._retry(pending, f"Yazıcı görevi hatası: {str(task_error)}")
+            return
+
+        self._consecutive_failures = 0
+        for done in barriers:
+            done.set()
+
+    def _retry(self, items: List, message: str):
+        """Yazılamayan öğeleri kuyruğun başına geri koy ve artan süre bekle"""
+        if self._stopping:
+            self.lost += len(items)
+            self.logger.error(f"Kapanışta {message}; {len(items)} öğe yazılamadı")
+            for kind, payload in items:
+                if kind == _BARRIER:
+                    payload.set()
+            return
+
+        self._queue.extendleft(reversed(items))
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** self._consecutive_failures)
+        self._consecutive_failures += 1
+        self.retries += 1
+        self.logger.error(f"{message}; {delay:.1f} s sonra yeniden denenecek")
+        self._stop_event.wait(delay)
+
+    def _run_task(self, cursor, task: Callable[[], None]):
+        """Görevi kayıt noktası içinde çalıştır; hata olursa yalnızca görevin yazdıklarını geri al"""
+        cursor.execute("SAVEPOINT writer_task")
+        try:
+            task()
+        except Exception:
+            self.failed_tasks += 1
+            cursor.execute("ROLLBACK TO writer_task")
+            cursor.execute("RELEASE writer_task")
+            raise
+        cursor.execute("RELEASE writer_task")
+        self.tasks_run += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """Kuyruk derinliği, commit gecikmesi (ms) ve sayaçlar"""
+        stats = {f"commit_{key}": value for key, value in self.commit_histogram.summary().items()}
+        stats.update({
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_depth,
+            "records_written": self.records_written,
+            "tasks_run": self.tasks_run,
+            "commits": self.commits,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "lost": self.lost,
+            "failed_batches": self.failed_batches,
+            "failed_tasks": self.failed_tasks
+        })
+        return stats
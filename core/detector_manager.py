@@ -0,0 +1,671 @@
+"""
+PostureFix - Çoklu Kaynak Dedektör Yöneticisi Modülü
+Birden çok kamerayı/kaynağı ve kaynak başına birden çok kişiyi tek süreçte
+izler; kişi başına çıkarım istekleri adil round-robin sırayla ortak bir
+çıkarım worker havuzuna dağıtılır
+"""
+
+import os
+import sys
+import time
+import queue
+import logging
+import argparse
+import multiprocessing as mp_proc
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config import AppConfig
+from core.filters import create_filter
+from core.frame_buffers import BufferPool
+from core.frame_capture import CapturedFrame, FrameCaptureThread, LatestFrameSlot
+from core.frame_sources import CameraSource, FrameSource, create_frame_source
+from core.inference_backends import MediaPipeBackend, backend_options_from_config, create_backend
+from core.inference_worker import SharedFrameRing
+from core.landmarks import PostureLandmarks
+from core.posture_metrics import METRIC_NAMES, compute_frame_metrics, score_posture_data
+from core.roi_tracker import Roi, RoiTracker, crop_for_inference, map_landmarks_to_full
+
+# Kişi bölgesi: frame'e göre normalize (x0, y0, x1, y1)
+Zone = Tuple[float, float, float, float]
+
+
+@dataclass
+class PoolOutput:
+    """Havuzdan dönen tek bir kişi çıkarımı"""
+    subject_index: int
+    sequence: int
+    slot_index: int
+    timestamp: float
+    landmarks: Optional[np.ndarray]  # (33, 4) tam frame koordinatları
+    inference_time: float            # saniye
+    worker_index: int
+
+
+@dataclass
+class SubjectResult:
+    """Bir kişinin tek bir analiz sonucu"""
+    subject_id: str
+    sequence: int
+    timestamp: float
+    landmark_array: Optional[np.ndarray]
+    metrics: Optional[Dict[str, float]]
+    score: Optional[float]
+
+
+def _pool_worker_main(worker_index: int, request_queue, result_queue, backend_name: str,
+                      backend_options: Dict, roi_inference_size: int = 256):
+    """Havuz worker'ı: herhangi bir kaynağın halkasından gelen isteği işler
+
+    İstekler farklı kaynak ve kişilerden sırayla gelebildiği için backend
+    zamansal takip tutmaz (static_image_mode); takip yönetici tarafındaki
+    kişi başına RoiTracker ile sağlanır. Halkalara ilk istekte bağlanılır.
+    """
+    cv2.setNumThreads(1)  # Paralellik süreç havuzundan gelir
+
+    rings: Dict[str, SharedFrameRing] = {}
+    buffers = BufferPool()
+    options = dict(backend_options)
+    if backend_name == MediaPipeBackend.name:
+        options["static_image_mode"] = True
+    backend = create_backend(backend_name, options)
+    backend.load()
+
+    try:
+        while True:
+            request = request_queue.get()
+            if request is None:
+                break
+
+            subject_index, ring_name, ring_shape, sequence, slot_index, timestamp, roi = request
+            start = time.perf_counter()
+
+            ring = rings.get(ring_name)
+            if ring is None:
+                ring = rings[ring_name] = SharedFrameRing(*ring_shape, name=ring_name)
+
+            frame = ring.view(slot_index)
+            input_frame = crop_for_inference(frame, roi, roi_inference_size, buffers)
+            rgb_input = cv2.cvtColor(input_frame, cv2.COLOR_BGR2RGB,
+                                     dst=buffers.get("rgb", input_frame.shape))
+            landmarks = backend.infer(rgb_input)
+            if landmarks is not None and roi is not None:
+                map_landmarks_to_full(landmarks, roi, frame.shape)
+
+            result_queue.put((subject_index, sequence, slot_index, timestamp, landmarks,
+                              time.perf_counter() - start, worker_index))
+    finally:
+        backend.close()
+        for ring in rings.values():
+            ring.close()
+
+
+class InferencePool:
+    """Ortak kuyruktan beslenen çıkarım süreçleri havuzu
+
+    Tek bir istek kuyruğu tüm worker'larca tüketilir; boş kalan worker bir
+    sonraki isteği alır. submit() ve poll() hiçbir zaman bloklamaz. Çöken
+    worker'lar ensure_alive() ile yeniden başlatılır.
+    """
+
+    def __init__(self, workers: int, backend_name: str, backend_options: Dict,
+                 roi_inference_size: int = 256, restart_delay: float = 2.0):
+        self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers)
+        self.backend_name = backend_name
+        self.backend_options = backend_options
+        self.roi_inference_size = roi_inference_size
+        self.restart_delay = restart_delay
+
+        self._ctx = mp_proc.get_context("spawn")
+        # Her worker'a bir çalışan ve bir bekleyen istek: kuyrukta eski frame birikmez
+        self.capacity = self.workers * 2
+        self.request_queue = self._ctx.Queue(maxsize=self.capacity)
+        self.result_queue = self._ctx.Queue()
+        self.processes: List[Optional[mp_proc.Process]] = [None] * self.workers
+        self._stopping = False
+        self._last_restart = 0.0
+
+        # Sayaçlar
+        self.restart_count = 0
+        self.worker_completed = [0] * self.workers
+        self.worker_busy_time = [0.0] * self.workers
+
+    def start(self):
+        """Tüm worker süreçlerini başlat"""
+        self._stopping = False
+        for index in range(self.workers):
+            self._start_worker(index)
+        self.logger.info(f"Çıkarım havuzu başlatıldı ({self.workers} worker, {self.backend_name})")
+
+    def _start_worker(self, index: int):
+        process = self._ctx.Process(
+            target=_pool_worker_main,
+            args=(index, self.request_queue, self.result_queue, self.backend_name,
+                  self.backend_options, self.roi_inference_size),
+            name=f"PostureInferencePool-{index}",
+            daemon=True
+        )
+        process.start()
+        self.processes[index] = process
+
+    def ensure_alive(self) -> int:
+        """Çökmüş worker'ları (bekleme süresine uyarak) yeniden başlat; canlı sayısını döndür"""
+        dead = [i for i, p in enumerate(self.processes) if p is None or not p.is_alive()]
+        if dead and not self._stopping:
+            now = time.monotonic()
+            if now - self._last_restart >= self.restart_delay:
+                self._last_restart = now
+                for index in dead:
+                    exit_code = self.processes[index].exitcode if self.processes[index] else None
+                    self.logger.warning(f"Havuz worker'ı {index} durmuş (exitcode={exit_code}), yeniden başlatılıyor")
+                    self.restart_count += 1
+                    self._start_worker(index)
+                dead = []
+        return self.workers - len(dead)
+
+    def submit(self, request: Tuple) -> bool:
+        """İsteği kuyruğa koy; kuyruk doluysa bekletmeden False döndür"""
+        try:
+            self.request_queue.put_nowait(request)
+            return True
+        except queue.Full:
+            return False
+
+    def poll(self) -> List[PoolOutput]:
+        """Tamamlanan sonuçları bekletmeden topla"""
+        outputs = []
+        while True:
+            try:
+                output = PoolOutput(*self.result_queue.get_nowait())
+            except queue.Empty:
+                break
+            self.worker_completed[output.worker_index] += 1
+            self.worker_busy_time[output.worker_index] += output.inference_time
+            outputs.append(output)
+        return outputs
+
+    def get_stats(self) -> Dict[str, object]:
+        """Havuz sayaçlarını döndür"""
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for p in self.processes if p is not None and p.is_alive()),
+            "restarts": self.restart_count,
+            "completed_per_worker": list(self.worker_completed),
+            "busy_seconds_per_worker": [round(t, 3) for t in self.worker_busy_time]
+        }
+
+    def stop(self, timeout: float = 3.0):
+        """Worker'ları düzgünce kapat"""
+        self._stopping = True
+        for _ in self.processes:
+            try:
+                self.request_queue.put(None, timeout=timeout)
+            except Exception:
+                pass
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                self.logger.warning(f"{process.name} zamanında kapanmadı, sonlandırılıyor")
+                process.terminate()
+                process.join(timeout)
+        for q in (self.request_queue, self.result_queue):
+            q.close()
+            q.cancel_join_thread()
+        self.processes = [None] * self.workers
+        self.logger.info("Çıkarım havuzu kapatıldı")
+
+
+class MonitoredSource:
+    """Tek bir frame kaynağı: yakalama thread'i ve paylaşımlı bellek halkası
+
+    Aynı frame birden çok kişi için aynı anda çıkarımda olabilir; yuva
+    kilidi son kişinin sonucu gelene kadar tutulur (referans sayımı).
+    """
+
+    def __init__(self, source_id: str, source: FrameSource, ring_slots: int, stale_after: float):
+        self.source_id = source_id
+        self.source = source
+        self.frame_slot = LatestFrameSlot(stale_after=stale_after)
+        self.ring: Optional[SharedFrameRing] = None
+        self.capture_thread: Optional[FrameCaptureThread] = None
+        self.ring_slots = ring_slots
+
+    def start(self, width: int, height: int, fps: int):
+        self.source.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.source.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.source.set(cv2.CAP_PROP_FPS, fps)
+        frame_width = int(self.source.get(cv2.CAP_PROP_FRAME_WIDTH)) or width
+        frame_height = int(self.source.get(cv2.CAP_PROP_FRAME_HEIGHT)) or height
+
+        self.ring = SharedFrameRing(self.ring_slots, frame_height, frame_width)
+        self.capture_thread = FrameCaptureThread(self.source, self.frame_slot, frame_ring=self.ring)
+        self.capture_thread.name = f"FrameCaptureThread-{self.source_id}"
+        self.capture_thread.start()
+
+    @property
+    def frame_shape(self) -> Tuple[int, int, int]:
+        return self.ring.shape[1:]
+
+    def retain(self, captured: CapturedFrame) -> bool:
+        """Frame'in yuvasını bir kişi için kilitle (halka kilitleri yuva başına sayar)"""
+        return self.ring.pin(captured.slot_index, captured.sequence)
+
+    def release(self, slot_index: int):
+        """Kişinin yuva kilidini bırak; son kişiyse yuva serbest kalır"""
+        self.ring.unpin(slot_index)
+
+    def stop(self):
+        if self.capture_thread:
+            self.capture_thread.stop()
+            self.capture_thread = None
+        if self.source.isOpened():
+            self.source.release()
+        self.frame_slot.clear()
+        if self.ring is not None:
+            self.ring.unpin_all()
+            self.ring.close(unlink=True)
+            self.ring = None
+
+
+class MonitoredSubject:
+    """Bir kaynaktaki tek bir kişi: kendi bölgesi, takibi, filtresi ve oturumu"""
+
+    def __init__(self, subject_id: str, source_index: int, zone: Zone, config: AppConfig,
+                 data_manager=None):
+        self.subject_id = subject_id
+        self.source_index = source_index
+        self.zone = zone
+        self.data_manager = data_manager
+        self.roi_tracker = RoiTracker(
+            padding=config.ROI_PADDING,
+            min_visibility=config.ROI_MIN_VISIBILITY,
+            inference_size=config.ROI_INFERENCE_SIZE
+        ) if config.ROI_TRACKING_ENABLED else None
+        self.metric_filter = create_filter(config.SMOOTHING_FILTER, len(METRIC_NAMES))
+        self._metric_vector = np.zeros(len(METRIC_NAMES), dtype=np.float64)
+
+        self.in_flight: Optional[Tuple[int, int, float]] = None  # sequence, slot, gönderim zamanı
+        self.last_sequence: Optional[int] = None
+        self.last_submit = 0.0
+        self.last_result: Optional[SubjectResult] = None
+
+        # Sayaçlar
+        self.submitted = 0
+        self.completed = 0
+        self.expired = 0
+
+    def inference_roi(self, frame_shape: Tuple[int, ...]) -> Optional[Roi]:
+        """Kişinin çıkarım bölgesi: takip kutusu bölgeyle kesiştirilir"""
+        height, width = frame_shape[:2]
+        zx0, zy0, zx1, zy1 = self.zone
+        zone = (int(zx0 * width), int(zy0 * height), int(zx1 * width), int(zy1 * height))
+        full_frame = zone == (0, 0, width, height)
+
+        roi = self.roi_tracker.next_roi(frame_shape) if self.roi_tracker else None
+        if roi is None:
+            return None if full_frame else zone
+
+        x0, y0 = max(roi[0], zone[0]), max(roi[1], zone[1])
+        x1, y1 = min(roi[2], zone[2]), min(roi[3], zone[3])
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            # Takip bölge dışına kaydı: bölgenin tamamına dön
+            self.roi_tracker.reset()
+            return None if full_frame else zone
+        return (x0, y0, x1, y1)
+
+    def smooth(self, metrics: Dict[str, float], timestamp: float) -> Dict[str, float]:
+        """Metrikleri kişinin kendi filtresinden geçir"""
+        vector = self._metric_vector
+        for i, key in enumerate(METRIC_NAMES):
+            vector[i] = metrics.get(key, 0.0)
+        smoothed = self.metric_filter.update(vector, timestamp)
+        smoothed_data = dict(metrics)
+        for i, key in enumerate(METRIC_NAMES):
+            smoothed_data[key] = float(smoothed[i])
+        return smoothed_data
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "expired": self.expired,
+            "session": (self.data_manager.current_session.session_id
+                        if self.data_manager and self.data_manager.current_session else None)
+        }
+
+
+def split_zones(persons: int) -> List[Zone]:
+    """Frame'i yan yana eşit genişlikte kişi bölgelerine böl"""
+    persons = max(1, persons)
+    return [(i / persons, 0.0, (i + 1) / persons, 1.0) for i in range(persons)]
+
+
+def parse_source_specs(config: AppConfig, specs: str) -> List[Tuple[str, FrameSource]]:
+    """"camera:0,video:yol,synthetic:3" biçimindeki kaynak listesini oluştur"""
+    sources = []
+    for index, spec in enumerate(part.strip() for part in specs.split(",") if part.strip()):
+        kind, _, argument = spec.partition(":")
+        if kind == CameraSource.name:
+            camera_index = int(argument or 0)
+            sources.append((f"cam{camera_index}", CameraSource(camera_index)))
+        elif kind == "synthetic":
+            seed = int(argument or index)
+            sources.append((f"synthetic{seed}", create_frame_source(config, kind, seed=seed)))
+        else:
+            sources.append((f"{kind}{index}", create_frame_source(config, kind, path=argument)))
+    return sources
+
+
+class DetectorManager:
+    """N kaynağı ve kaynak başına birden çok kişiyi tek süreçte izleyen yönetici
+
+    Her kaynak kendi yakalama thread'i ve paylaşımlı bellek halkasıyla
+    okunur. poll() her çağrıda kişileri dönen bir imleçle sırayla dolaşır
+    ve havuzda boş yer oldukça yeni frame'i olan kişiye bir istek gönderir;
+    böylece hızlı bir kaynak diğerlerini aç bırakamaz. Kişi başına en
+    fazla bir istek çıkarımdadır. Her kişinin yumuşatma filtresi ve
+    DataManager oturumu ayrıdır.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_interval: Optional[float] = None,
+                 persist: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.config = AppConfig()
+        self.workers = workers or self.config.INFERENCE_POOL_WORKERS or os.cpu_count() or 1
+        self.min_interval = self.config.POSTURE_CHECK_INTERVAL if min_interval is None else min_interval
+        self.persist = persist
+        self.request_timeout = self.config.INFERENCE_POOL_REQUEST_TIMEOUT
+
+        pose_options = dict(
+            model_complexity=1,
+            smooth_landmarks=False,
+            enable_segmentation=False,
+            min_detection_confidence=self.config.MEDIAPIPE_DETECTION_CONFIDENCE,
+            min_tracking_confidence=self.config.MEDIAPIPE_TRACKING_CONFIDENCE
+        )
+        self.backend_name, self.backend_options = backend_options_from_config(self.config, pose_options)
+
+        self.sources: List[MonitoredSource] = []
+        self.subjects: List[MonitoredSubject] = []
+        self.pool: Optional[InferencePool] = None
+        self._cursor = 0
+        self._started_at = 0.0
+
+        # Sayaçlar
+        self.dispatch_rounds = 0
+        self.queue_full = 0
+
+    def add_source(self, source_id: str, source: FrameSource, persons: int = 1,
+                   zones: Optional[List[Zone]] = None):
+        """Kaynak ve kişi bölgelerini ekle (start() öncesinde)"""
+        source_index = len(self.sources)
+        self.sources.append(MonitoredSource(source_id, source, self.config.INFERENCE_RING_SLOTS,
+                                            self.config.CAPTURE_STALE_FRAME_AGE))
+
+        zones = zones or split_zones(persons)
+        for person, zone in enumerate(zones):
+            subject_id = source_id if len(zones) == 1 else f"{source_id}_p{person}"
+            data_manager = None
+            if self.persist:
+                from core.data_manager import DataManager
+                data_manager = DataManager(subject_id=subject_id)
+            self.subjects.append(MonitoredSubject(subject_id, source_index, zone, self.config, data_manager))
+
+    def start(self) -> bool:
+        """Havuzu ve tüm kaynakların yakalamasını başlat"""
+        if not self.subjects:
+            self.logger.error("İzlenecek kaynak yok")
+            return False
+
+        self.pool = InferencePool(self.workers, self.backend_name, self.backend_options,
+                                  roi_inference_size=self.config.ROI_INFERENCE_SIZE,
+                                  restart_delay=self.config.INFERENCE_WORKER_RESTART_DELAY)
+        self.pool.start()
+
+        opened = 0
+        for monitored in self.sources:
+            if not monitored.source.isOpened():
+                self.logger.error(f"Kaynak açılamadı: {monitored.source_id}")
+                continue
+            monitored.start(self.config.CAMERA_WIDTH, self.config.CAMERA_HEIGHT, self.config.CAMERA_FPS)
+            opened += 1
+
+        self._started_at = time.monotonic()
+        self.logger.info(f"{opened}/{len(self.sources)} kaynak, {len(self.subjects)} kişi izleniyor "
+                         f"({self.workers} çıkarım worker'ı)")
+        return opened > 0
+
+    def poll(self) -> List[SubjectResult]:
+        """Tamamlanan sonuçları işle ve boş havuz kapasitesini adil şekilde doldur"""
+        self.pool.ensure_alive()
+        now = time.monotonic()
+
+        results = [self._apply_output(output) for output in self.pool.poll()]
+        self._expire_requests(now)
+        self._dispatch(now)
+        return results
+
+    def _apply_output(self, output: PoolOutput) -> SubjectResult:
+        subject = self.subjects[output.subject_index]
+        source = self.sources[subject.source_index]
+        if subject.in_flight is not None and subject.in_flight[0] == output.sequence:
+            subject.in_flight = None
+            source.release(output.slot_index)
+        subject.completed += 1
+
+        if subject.roi_tracker and source.ring is not None:
+            subject.roi_tracker.update(output.landmarks, source.frame_shape)
+
+        metrics = score = None
+        if output.landmarks is not None:
+            landmarks = PostureLandmarks.from_pose_array(output.landmarks)
+            metrics = subject.smooth(compute_frame_metrics(landmarks.data), output.timestamp)
+            metrics["frame_available"] = True
+            score = score_posture_data(metrics)
+            if subject.data_manager is not None:
+                subject.data_manager.save_posture_data(metrics, score, self.min_interval or None)
+
+        result = SubjectResult(subject.subject_id, output.sequence, output.timestamp,
+                               output.landmarks, metrics, score)
+        subject.last_result = result
+        return result
+
+    def _expire_requests(self, now: float):
+        """Yanıtı gelmeyen (çöken worker'daki) istekleri düşür ve yuvalarını bırak"""
+        for subject in self.subjects:
+            if subject.in_flight is not None and now - subject.in_flight[2] > self.request_timeout:
+                _, slot_index, _ = subject.in_flight
+                subject.in_flight = None
+                subject.expired += 1
+                self.sources[subject.source_index].release(slot_index)
+
+    def _dispatch(self, now: float):
+        """Round-robin: imleçten başlayarak hazır kişilere sırayla istek gönder"""
+        self.dispatch_rounds += 1
+        in_flight = sum(1 for subject in self.subjects if subject.in_flight is not None)
+        free = self.pool.capacity - in_flight
+        frames: Dict[int, Optional[CapturedFrame]] = {}
+
+        count = len(self.subjects)
+        for step in range(count):
+            if free <= 0:
+                break
+            index = (self._cursor + step) % count
+            subject = self.subjects[index]
+            if subject.in_flight is not None or now - subject.last_submit < self.min_interval:
+                continue
+
+            source = self.sources[subject.source_index]
+            if source.ring is None:
+                continue
+            if subject.source_index not in frames:
+                frames[subject.source_index] = source.frame_slot.get()
+            captured = frames[subject.source_index]
+            if captured is None or captured.sequence == subject.last_sequence:
+                continue
+            if not source.retain(captured):
+                continue
+
+            roi = subject.inference_roi(source.frame_shape)
+            request = (index, source.ring.name, source.ring.shape, captured.sequence,
+                       captured.slot_index, captured.timestamp, roi)
+            if not self.pool.submit(request):
+                source.release(captured.slot_index)
+                self.queue_full += 1
+                break
+
+            subject.in_flight = (captured.sequence, captured.slot_index, now)
+            subject.last_sequence = captured.sequence
+            subject.last_submit = now
+            subject.submitted += 1
+            free -= 1
+
+        # Bir sonraki tur, bu tur ilk bakılan kişinin ardından başlar
+        if count:
+            self._cursor = (self._cursor + 1) % count
+
+    def save_session_data(self):
+        """Tüm kişilerin oturum verilerini kaydet (periyodik)"""
+        for subject in self.subjects:
+            if subject.data_manager is not None:
+                subject.data_manager.save_session_data()
+
+    def run(self, seconds: float, idle_sleep: float = 0.002) -> Dict[str, object]:
+        """Belirtilen süre boyunca poll döngüsünü çalıştır ve özet döndür"""
+        deadline = time.monotonic() + seconds
+        next_save = time.monotonic() + self.config.STATS_SAVE_INTERVAL
+        while time.monotonic() < deadline:
+            if not self.poll():
+                time.sleep(idle_sleep)
+            if self.persist and time.monotonic() >= next_save:
+                self.save_session_data()
+                next_save += self.config.STATS_SAVE_INTERVAL
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, object]:
+        """Toplam ve kişi başına sayaçlar"""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        completed = [subject.completed for subject in self.subjects]
+        total = sum(completed)
+        return {
+            "sources": len(self.sources),
+            "subjects": len(self.subjects),
+            "workers": self.workers,
+            "elapsed": elapsed,
+            "analyses": total,
+            "analyses_per_second": total / elapsed if elapsed > 0 else 0.0,
+            "fairness": min(completed) / max(completed) if completed and max(completed) > 0 else 0.0,
+            "queue_full": self.queue_full,
+            "pool": self.pool.get_stats() if self.pool else {},
+            "per_subject": {subject.subject_id: subject.get_stats() for subject in self.subjects}
+        }
+
+    def stop(self):
+        """Yakalamayı ve havuzu durdur, kişi oturumlarını kapat"""
+        for monitored in self.sources:
+            monitored.stop()
+        if self.pool is not None:
+            self.pool.stop()
+            self.pool = None
+        for subject in self.subjects:
+            subject.in_flight = None
+            if subject.data_manager is not None:
+                subject.data_manager.end_session()
+                subject.data_manager.close()
+        self.logger.info("Dedektör yöneticisi durduruldu")
+
+
+def benchmark_scaling(sources: int = 4, persons: int = 1, seconds: float = 20.0,
+                      worker_counts: Optional[List[int]] = None) -> List[Dict[str, float]]:
+    """Sentetik kaynaklarla worker sayısına göre toplam analiz hızını ölç
+
+    Kaynaklar gerçek zamanlı beklemeden frame üretir ve kişi başına aralık
+    sıfırdır; böylece ölçülen hız sadece çıkarım havuzunun kapasitesidir.
+    """
+    cores = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, max(1, cores // 2), cores})
+    config = AppConfig()
+
+    rows = []
+    for workers in worker_counts:
+        manager = DetectorManager(workers=workers, min_interval=0.0, persist=False)
+        for index in range(sources):
+            source = create_frame_source(config, "synthetic", seed=index, realtime=False)
+            manager.add_source(f"synthetic{index}", source, persons)
+        if not manager.start():
+            raise RuntimeError("Sentetik kaynaklar açılamadı")
+        try:
+            # Isınma: model yüklemesi ölçüme karışmasın
+            manager.run(min(5.0, seconds / 2))
+            for subject in manager.subjects:
+                subject.completed = 0
+            manager._started_at = time.monotonic()
+            stats = manager.run(seconds)
+        finally:
+            manager.stop()
+        rows.append({
+            "workers": workers,
+            "analyses_per_second": stats["analyses_per_second"],
+            "fairness": stats["fairness"]
+        })
+
+    base = rows[0]["analyses_per_second"] / rows[0]["workers"] if rows and rows[0]["analyses_per_second"] else 0.0
+    for row in rows:
+        row["scaling_efficiency"] = row["analyses_per_second"] / (base * row["workers"]) if base else 0.0
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Komut satırı giriş noktası: kaynakları başsız izle ya da ölçekleme ölç"""
+    from utils.logger import setup_logger
+
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="PostureFix çoklu kaynak / çoklu kişi izleme")
+    parser.add_argument("--sources", default=config.MULTI_SOURCES or "camera:0",
+                        help='Kaynak listesi, ör. "camera:0,camera:1,video:kayit.mp4,synthetic:3"')
+    parser.add_argument("--persons", type=int, default=config.PERSONS_PER_SOURCE,
+                        help="Kaynak başına kişi (yan yana eşit bölgeler)")
+    parser.add_argument("--workers", type=int, default=None, help="Çıkarım havuzu süreç sayısı")
+    parser.add_argument("--seconds", type=float, default=60.0, help="İzleme süresi")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Sentetik kaynaklarla worker sayısına göre ölçeklemeyi ölç")
+    args = parser.parse_args(argv)
+
+    setup_logger()
+    AppConfig.create_directories()
+
+    if args.benchmark:
+        source_count = max(1, len(args.sources.split(",")))
+        for row in benchmark_scaling(source_count, args.persons, min(args.seconds, 20.0)):
+            print(f"workers={row['workers']:2d} {row['analyses_per_second']:7.1f} analiz/s "
+                  f"verim={row['scaling_efficiency']:.2f} adalet={row['fairness']:.2f}")
+        return 0
+
+    manager = DetectorManager(workers=args.workers)
+    for source_id, source in parse_source_specs(config, args.sources):
+        manager.add_source(source_id, source, args.persons)
+    if not manager.start():
+        manager.stop()
+        return 1
+    try:
+        stats = manager.run(args.seconds)
+    except KeyboardInterrupt:
+        stats = manager.get_stats()
+    finally:
+        manager.stop()
+
+    print(f"{stats['analyses']} analiz, {stats['analyses_per_second']:.1f} analiz/s, "
+          f"adalet={stats['fairness']:.2f}")
+    for subject_id, subject_stats in stats["per_subject"].items():
+        print(f"  {subject_id:20s} tamamlanan={subject_stats['completed']} düşen={subject_stats['expired']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+PostureFix - Zamansal Filtre Modülü
+Postür metrik vektörünü yumuşatan sabit zamanlı filtreler: hareketli
+ortalama, üstel ortalama, One-Euro ve sabit hızlı Kalman
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class MetricFilter(ABC):
+    """Metrik vektörü filtrelerinin ortak arayüzü
+
+    update() her çağrıda O(1) (metrik sayısına göre doğrusal) çalışır ve
+    filtre içindeki bir tamponu döndürür; değer saklanacaksa kopyalanmalıdır.
+    """
+
+    name = "base"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._out = np.zeros(dim, dtype=np.float64)
+
+    @abstractmethod
+    def update(self, values: np.ndarray, timestamp: float) -> np.ndarray:
+        """Yeni ölçümü işle; filtrelenmiş vektörü döndür"""
+
+    @abstractmethod
+    def reset(self):
+        """Filtre durumunu sıfırla"""
+
+
+class MovingAverageFilter(MetricFilter):
+    """Halka tampon ve koşan toplam ile sabit zamanlı hareketli ortalama"""
+
+    name = "moving_average"
+
+    # Kayan nokta birikimini temizlemek için toplamı periyodik olarak yeniden hesapla
+    RESUM_INTERVAL = 1024
+
+    def __init__(self, dim: int, window: int = 5):
+        super().__init__(dim)
+        self.window = max(1, int(window))
+        self._buffer = np.zeros((self.window, dim), dtype=np.float64)
+        self._sum = np.zeros(dim, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self._buffer.fill(0.0)
+        self._sum.fill(0.0)
+        self._count = 0
+        self._index = 0
+        self._updates = 0
+
+    def update(self, values: np.ndarray, timestamp: float) -> np.ndarray:
+        slot = self._buffer[self._index]
+        if self._count == self.window:
+            self._sum -= slot
+        else:
+            self._count += 1
+
+        slot[:] = values
+        self._sum += slot
+        self._index = (self._index + 1) % self.window
+
+        self._updates += 1
+        if self._updates % self.RESUM_INTERVAL == 0:
+            self._buffer[:self._count].sum(axis=0, out=self._sum)
+
+        return np.divide(self._sum, self._count, out=self._out)
+
+
+class ExponentialMovingAverageFilter(MetricFilter):
+    """Üstel hareketli ortalama (alpha = 2 / (N + 1))"""
+
+    name = "ema"
+
+    def __init__(self, dim: int, window: int = 5):
+        super().__init__(dim)
+        self.alpha = 2.0 / (max(1, int(window)) + 1)
+        self.reset()
+
+    def reset(self):
+        self._initialized = False
+
+    def update(self, values: np.ndarray, timestamp: float) -> np.ndarray:
+        if not self._initialized:
+            self._out[:] = values
+            self._initialized = True
+        else:
+            self._out += self.alpha * (values - self._out)
+        return self._out
+
+
+class OneEuroFilter(MetricFilter):
+    """One-Euro filtresi (Casiez vd.): yavaş harekette güçlü, hızlı harekette az yumuşatma
+
+    Kesim frekansı türevin büyüklüğüyle artar; değişken örnekleme
+    aralıklarında da doğru çalışır.
+    """
+
+    name = "one_euro"
+
+    def __init__(self, dim: int, window: int = 5, min_cutoff: Optional[float] = None,
+                 beta: float = 0.05, d_cutoff: float = 1.0):
+        super().__init__(dim)
+        # Daha geniş pencere = daha düşük minimum kesim frekansı
+        self.min_cutoff = min_cutoff if min_cutoff is not None else 1.5 / max(1, int(window))
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._derivative = np.zeros(dim, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self._initialized = False
+        self._derivative.fill(0.0)
+        self._last_time = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, values: np.ndarray, timestamp: float) -> np.ndarray:
+        if not self._initialized:
+            self._out[:] = values
+            self._last_time = timestamp
+            self._initialized = True
+            return self._out
+
+        dt = max(timestamp - self._last_time, 1e-6)
+        self._last_time = timestamp
+
+        # Türevi yumuşat
+        derivative = (values - self._out) / dt
+        self._derivative += self._alpha(self.d_cutoff, dt) * (derivative - self._derivative)
+
+        # Uyarlamalı kesim frekansı
+        cutoff = self.min_cutoff + self.beta * np.abs(self._derivative)
+        self._out += self._alpha(cutoff, dt) * (values - self._out)
+        return self._out
+
+
+class ConstantVelocityKalmanFilter(MetricFilter):
+    """Her metrik için bağımsız, sabit hız modelli Kalman filtresi
+
+    Durum [değer, hız]; 2x2 kovaryans bileşenleri metrik boyutunda
+    vektörler olarak tutulur, böylece tüm metrikler tek seferde güncellenir.
+    """
+
+    name = "kalman"
+
+    def __init__(self, dim: int, window: int = 5, process_noise: float = 1.0,
+                 measurement_noise: Optional[float] = None):
+        super().__init__(dim)
+        self.process_noise = process_noise
+        # Daha geniş pencere = ölçümlere daha az güven
+        self.measurement_noise = (measurement_noise if measurement_noise is not None
+                                  else float(max(1, int(window))))
+        self._velocity = np.zeros(dim, dtype=np.float64)
+        self._p00 = np.zeros(dim, dtype=np.float64)
+        self._p01 = np.zeros(dim, dtype=np.float64)
+        self._p11 = np.zeros(dim, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self._initialized = False
+        self._velocity.fill(0.0)
+        self._p00.fill(self.measurement_noise)
+        self._p01.fill(0.0)
+        self._p11.fill(self.measurement_noise)
+        self._last_time = 0.0
+
+    def update(self, values: np.ndarray, timestamp: float) -> np.ndarray:
+        if not self._initialized:
+            self._out[:] = values
+            self._last_time = timestamp
+            self._initialized = True
+            return self._out
+
+        dt = max(timestamp - self._last_time, 1e-6)
+        self._last_time = timestamp
+        q = self.process_noise
+
+        # Tahmin: x = F x, P = F P F^T + Q (beyaz gürültülü ivme)
+        self._out += self._velocity * dt
+        p00 = self._p00 + dt * (2 * self._p01 + dt * self._p11) + q * dt ** 4 / 4
+        p01 = self._p01 + dt * self._p11 + q * dt ** 3 / 2
+        p11 = self._p11 + q * dt ** 2
+
+        # Güncelleme
+        innovation = values - self._out
+        s = p00 + self.measurement_noise
+        k0 = p00 / s
+        k1 = p01 / s
+        self._out += k0 * innovation
+        self._velocity += k1 * innovation
+
+        self._p00 = (1 - k0) * p00
+        self._p01 = (1 - k0) * p01
+        self._p11 = p11 - k1 * p01
+        return self._out
+
+
+FILTER_TYPES = {
+    MovingAverageFilter.name: MovingAverageFilter,
+    ExponentialMovingAverageFilter.name: ExponentialMovingAverageFilter,
+    OneEuroFilter.name: OneEuroFilter,
+    ConstantVelocityKalmanFilter.name: ConstantVelocityKalmanFilter
+}
+
+
+def create_filter(name: str, dim: int, window: int = 5) -> MetricFilter:
+    """Ada göre filtre oluştur (bilinmeyen adlar hareketli ortalamaya düşer)"""
+    filter_class = FILTER_TYPES.get(name, MovingAverageFilter)
+    return filter_class(dim, window=window)
+
+
+def synthetic_stream(samples: int = 2000, dim: int = 6, rate: float = 2.0,
+                     noise: float = 1.5, seed: int = 0):
+    """Kayıt yoksa kullanılacak örnek akış: basamaklar + rampa + gürültü"""
+    rng = np.random.default_rng(seed)
+    timestamps = np.arange(samples) / rate
+    clean = np.zeros((samples, dim))
+    clean[samples // 4:] += 10.0                      # Ani postür değişimi
+    clean[samples // 2:] += np.linspace(0, 20, samples - samples // 2)[:, None]  # Yavaş bozulma
+    return timestamps, clean + rng.normal(0, noise, clean.shape), clean
+
+
+def benchmark_filters(timestamps: np.ndarray, stream: np.ndarray,
+                      reference: Optional[np.ndarray] = None,
+                      window: int = 5) -> Dict[str, Dict[str, float]]:
+    """Filtreleri kayıtlı bir akış üzerinde karşılaştır
+
+    Her filtre için güncelleme süresi, titreşim (ardışık çıktı farklarının
+    standart sapması), gecikme (çapraz korelasyonla örnek cinsinden) ve
+    referans varsa RMS hata raporlanır.
+    """
+    samples, dim = stream.shape
+    target = reference if reference is not None else stream
+    raw_jitter = float(np.std(np.diff(stream, axis=0)))
+    results = {}
+
+    for name in FILTER_TYPES:
+        metric_filter = create_filter(name, dim, window)
+        output = np.empty_like(stream, dtype=np.float64)
+
+        start = time.perf_counter_ns()
+        for i in range(samples):
+            output[i] = metric_filter.update(stream[i], timestamps[i])
+        elapsed_ns = time.perf_counter_ns() - start
+
+        # Gecikme: çıktı ve hedef değişimleri arasındaki en iyi kaydırma
+        out_changes = np.diff(output[:, 0])
+        ref_changes = np.diff(target[:, 0])
+        max_lag = min(50, samples - 2)
+        correlations = [np.dot(out_changes[lag:], ref_changes[:samples - 1 - lag]) for lag in range(max_lag)]
+
+        results[name] = {
+            "update_ns": elapsed_ns / samples,
+            "jitter": float(np.std(np.diff(output, axis=0))),
+            "jitter_reduction": raw_jitter / max(float(np.std(np.diff(output, axis=0))), 1e-12),
+            "lag_samples": int(np.argmax(correlations)),
+            "rms_error": float(np.sqrt(np.mean((output - target) ** 2)))
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        # Kayıtlı akış: (T, 1 + D) .npy, ilk sütun zaman damgası
+        recorded = np.load(sys.argv[1])
+        ts, values, ref = recorded[:, 0], recorded[:, 1:], None
+    else:
+        ts, values, ref = synthetic_stream()
+
+    for filter_name, stats in benchmark_filters(ts, values, ref).items():
+        print(f"{filter_name:15s} " + " ".join(f"{key}={value:.3f}" for key, value in stats.items()))
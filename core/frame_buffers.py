@@ -0,0 +1,189 @@
+"""
+PostureFix - Frame Tampon Modülü
+Yakalama, renk dönüşümü, ölçekleme ve çizim için önceden ayrılmış
+tamponlar; kararlı durumda frame başına tam boy bellek ayırmayı önler
+"""
+
+import time
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameRing:
+    """Önceden ayrılmış frame yuvalarından oluşan halka
+
+    Yakalama thread'i kamerayı doğrudan bir yuvaya okur. Tüketicinin
+    kullandığı (pinned) ve en son yazılan yuvalar üzerine yazılmaz; böylece
+    frame'ler kopyalanmadan referansla paylaşılabilir. Kilitler yuva başına
+    sayılır: aynı yuvayı tutan her sahip (son sonuç, uçuştaki istek) kendi
+    pin/unpin çiftini yapar, yuva son unpin'de serbest kalır.
+    """
+
+    def __init__(self, slots: int, height: int, width: int, channels: int = 3,
+                 frames: Optional[np.ndarray] = None):
+        self.shape = (slots, height, width, channels)
+        self.frames = frames if frames is not None else np.empty(self.shape, dtype=np.uint8)
+
+        self._lock = threading.Lock()
+        self._pinned: Counter = Counter()  # yuva -> kilit sayısı
+        self._slot_sequence = [-1] * slots
+        self._latest_index: Optional[int] = None
+        self._next_index = 0
+
+    @property
+    def slots(self) -> int:
+        return self.shape[0]
+
+    def view(self, index: int) -> np.ndarray:
+        """Yuvanın (H, W, C) görünümünü döndür (kopyasız)"""
+        return self.frames[index]
+
+    def acquire_write_slot(self) -> Optional[int]:
+        """Üzerine yazılabilecek bir sonraki yuvayı seç"""
+        with self._lock:
+            for _ in range(self.slots):
+                index = self._next_index
+                self._next_index = (self._next_index + 1) % self.slots
+                if index not in self._pinned and index != self._latest_index:
+                    return index
+            return None
+
+    def mark_written(self, index: int, sequence: int):
+        """Yuvaya hangi frame'in yazıldığını kaydet"""
+        with self._lock:
+            self._slot_sequence[index] = sequence
+            self._latest_index = index
+
+    def pin(self, index: int, sequence: int) -> bool:
+        """Yuvayı kilitle (kilit sayısını artır); bu arada üzerine yazıldıysa False döndür"""
+        with self._lock:
+            if self._slot_sequence[index] != sequence:
+                return False
+            self._pinned[index] += 1
+            return True
+
+    def unpin(self, index: int):
+        """Bir kilidi kaldır; son kilitse yuva yeniden yazılabilir"""
+        with self._lock:
+            count = self._pinned.get(index, 0)
+            if count > 1:
+                self._pinned[index] = count - 1
+            elif count == 1:
+                del self._pinned[index]
+
+    def pin_count(self, index: int) -> int:
+        """Yuvanın kilit sayısı"""
+        with self._lock:
+            return self._pinned.get(index, 0)
+
+    def unpin_all(self):
+        """Tüm yuva kilitlerini kaldır"""
+        with self._lock:
+            self._pinned.clear()
+
+
+class BufferPool:
+    """Anahtar başına önceden ayrılmış ara tamponlar
+
+    get() aynı anahtar ve şekil için her seferinde aynı tamponları (depth
+    adet, sırayla) döndürür; şekil değiştiğinde bir kez yeniden ayırır.
+    Dönen tampon bir sonraki turda üzerine yazılır, saklanacaksa
+    kopyalanmalıdır.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, List[np.ndarray]] = {}
+        self._next: Dict[str, int] = {}
+        self.allocations = 0
+
+    def get(self, key: str, shape: Tuple[int, ...], dtype=np.uint8, depth: int = 1) -> np.ndarray:
+        buffers = self._buffers.get(key)
+        if buffers is None:
+            buffers = self._buffers[key] = [None] * depth
+            self._next[key] = 0
+
+        index = self._next[key]
+        self._next[key] = (index + 1) % len(buffers)
+
+        buffer = buffers[index]
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = buffers[index] = np.empty(shape, dtype=dtype)
+            self.allocations += 1
+        return buffer
+
+    def clear(self):
+        """Tüm tamponları bırak"""
+        self._buffers.clear()
+        self._next.clear()
+
+
+def benchmark(frames: int = 300, shape: Tuple[int, int, int] = (480, 640, 3)) -> Dict[str, Dict[str, float]]:
+    """Eski ve tamponlu frame yolunun frame başına bellek ayırmasını ölç
+
+    Her iki yol da aynı işi yapar: yakalama, BGR->RGB, çizim kopyası ve
+    gösterim için renk dönüşümü. tracemalloc ile her frame'deki geçici
+    tepe bellek ve toplam ayırma boyutu ölçülür (numpy ve OpenCV dizileri
+    tracemalloc'a raporlanır).
+    """
+    rng = np.random.default_rng(0)
+    source = rng.integers(0, 256, shape, dtype=np.uint8)
+    height, width = shape[:2]
+
+    def legacy_path():
+        frame = source.copy()                                # camera.read()
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)         # çıkarım girdisi
+        annotated = frame.copy()                             # çizim
+        display = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB) # gösterim
+        return rgb, display
+
+    ring = FrameRing(4, height, width)
+    pool = BufferPool()
+    sequence = [0]
+
+    def pooled_path():
+        index = ring.acquire_write_slot()
+        frame = ring.view(index)
+        np.copyto(frame, source)                             # camera.read(buffer)
+        sequence[0] += 1
+        ring.mark_written(index, sequence[0])
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=pool.get("rgb", frame.shape))
+        annotated = pool.get("annotated", frame.shape, depth=2)
+        np.copyto(annotated, frame)
+        return rgb, annotated                                # gösterim BGR888, dönüşümsüz
+
+    results = {}
+    for name, path in (("legacy", legacy_path), ("pooled", pooled_path)):
+        # Isınma: tamponlar ve OpenCV iç durumu oluşsun
+        for _ in range(5):
+            path()
+
+        tracemalloc.start()
+        peak_total = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            path()
+            peak_total += tracemalloc.get_traced_memory()[1] - baseline
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+
+        results[name] = {
+            "transient_bytes_per_frame": peak_total / frames,
+            "frame_bytes": float(np.prod(shape)),
+            "full_frame_allocs_per_frame": peak_total / frames / float(np.prod(shape)),
+            "ms_per_frame": elapsed / frames * 1000
+        }
+
+    results["pooled"]["pool_allocations"] = pool.allocations
+    return results
+
+
+if __name__ == "__main__":
+    for path_name, stats in benchmark().items():
+        print(f"{path_name:8s} " + " ".join(f"{key}={value:,.2f}" for key, value in stats.items()))
@@ -0,0 +1,167 @@
+"""
+PostureFix - Kamera Yakalama Modülü
+Kamerayı ayrı bir thread'de sürekli okuyup en güncel frame'i saklar
+"""
+
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class CapturedFrame:
+    """Yakalanan tek bir frame ve zaman bilgisi"""
+    frame: np.ndarray
+    timestamp: float  # time.monotonic() cinsinden yakalama zamanı
+    sequence: int
+    slot_index: Optional[int] = None  # Paylaşımlı bellek halkasındaki yuva
+
+
+class LatestFrameSlot:
+    """Sadece en son frame'i tutan thread-safe yuva
+
+    Yakalama thread'i her yeni frame'de eskisinin üzerine yazar; okuyan
+    taraf hiçbir zaman beklemez. Okunmadan üzerine yazılan frame'ler
+    "dropped", daha önce okunmuş ya da çok eski frame'in tekrar okunması
+    "stale" olarak sayılır.
+    """
+
+    def __init__(self, stale_after: float = 0.5):
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._current: Optional[CapturedFrame] = None
+        self._consumed = True
+        self._sequence = 0
+
+        # Sayaçlar
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.stale_reads = 0
+
+    def put(self, frame: np.ndarray, timestamp: float, slot_index: Optional[int] = None) -> int:
+        """Yeni frame'i yuvaya yaz (eskisinin üzerine), sıra numarasını döndür"""
+        with self._lock:
+            if self._current is not None and not self._consumed:
+                self.frames_dropped += 1
+
+            self._sequence += 1
+            self._current = CapturedFrame(frame, timestamp, self._sequence, slot_index)
+            self._consumed = False
+            self.frames_captured += 1
+            return self._sequence
+
+    def get(self) -> Optional[CapturedFrame]:
+        """En güncel frame'i bekletmeden döndür"""
+        with self._lock:
+            if self._current is None:
+                return None
+
+            age = time.monotonic() - self._current.timestamp
+            if self._consumed or age > self.stale_after:
+                self.stale_reads += 1
+
+            self._consumed = True
+            return self._current
+
+    def clear(self):
+        """Yuvayı boşalt"""
+        with self._lock:
+            self._current = None
+            self._consumed = True
+
+    def get_stats(self) -> Dict[str, float]:
+        """Yuva sayaçlarını döndür"""
+        with self._lock:
+            age = (time.monotonic() - self._current.timestamp) if self._current else None
+            return {
+                "frames_captured": self.frames_captured,
+                "frames_dropped": self.frames_dropped,
+                "stale_reads": self.stale_reads,
+                "latest_sequence": self._sequence,
+                "latest_age": age
+            }
+
+
+class FrameCaptureThread(threading.Thread):
+    """Kamerayı sürekli boşaltıp LatestFrameSlot'a yazan thread
+
+    Sürücü tamponundaki frame'lerin birikmesini engeller; analiz tarafı
+    her zaman en taze frame'i görür ve kamera okumasında bloklanmaz.
+    frame_ring verilirse frame'ler doğrudan paylaşımlı bellek yuvalarına okunur.
+    """
+
+    def __init__(self, camera, slot: LatestFrameSlot, retry_delay: float = 0.01,
+                 frame_ring=None):
+        super().__init__(name="FrameCaptureThread", daemon=True)
+        self.logger = logging.getLogger(__name__)
+        self.camera = camera
+        self.slot = slot
+        self.retry_delay = retry_delay
+        self.frame_ring = frame_ring
+        self.read_failures = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """Yakalama döngüsü"""
+        self.logger.info("Kamera yakalama thread'i başlatıldı")
+
+        while not self._stop_event.is_set():
+            if self.frame_ring is not None:
+                self._capture_into_ring()
+                continue
+
+            try:
+                ret, frame = self.camera.read()
+            except Exception as e:
+                self.logger.error(f"Kamera okuma hatası: {str(e)}")
+                ret, frame = False, None
+
+            if not ret or frame is None:
+                self.read_failures += 1
+                self._stop_event.wait(self.retry_delay)
+                continue
+
+            self.slot.put(frame, time.monotonic())
+
+        self.logger.info("Kamera yakalama thread'i durduruldu")
+
+    def _capture_into_ring(self):
+        """Kamerayı doğrudan paylaşımlı bellek yuvasına oku"""
+        index = self.frame_ring.acquire_write_slot()
+        if index is None:
+            # Tüm yuvalar kullanımda
+            self._stop_event.wait(self.retry_delay)
+            return
+
+        buffer = self.frame_ring.view(index)
+        try:
+            ret, frame = self.camera.read(buffer)
+        except Exception as e:
+            self.logger.error(f"Kamera okuma hatası: {str(e)}")
+            ret, frame = False, None
+
+        if not ret or frame is None:
+            self.read_failures += 1
+            self._stop_event.wait(self.retry_delay)
+            return
+
+        if frame is not buffer:
+            # Sürücü farklı boyutta frame verdiyse yuvaya sığdır
+            if frame.shape == buffer.shape:
+                np.copyto(buffer, frame)
+            else:
+                cv2.resize(frame, (buffer.shape[1], buffer.shape[0]), dst=buffer)
+
+        sequence = self.slot.put(buffer, time.monotonic(), slot_index=index)
+        self.frame_ring.mark_written(index, sequence)
+
+    def stop(self, timeout: float = 2.0):
+        """Thread'i durdur ve bitmesini bekle"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
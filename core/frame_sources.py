@@ -0,0 +1,439 @@
+"""
+PostureFix - Frame Kaynakları Modülü
+Gerçek kamera, döngülü video dosyası, görüntü klasörü ve prosedürel
+sentetik denek için cv2.VideoCapture uyumlu ortak arayüz; fiziksel
+kamera olmayan makinelerde tekrarlanabilir ölçüm sağlar
+"""
+
+import os
+import math
+import time
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from core.landmarks import NUM_POSE_LANDMARKS
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+class FrameSource(ABC):
+    """Frame kaynaklarının ortak arayüzü
+
+    cv2.VideoCapture ile aynı alt kümeyi (isOpened, read, get, set,
+    release) sunar; böylece FrameCaptureThread ve PostureDetector kaynağın
+    türünü bilmez. read(image) verilen tampona yazar.
+    """
+
+    name = "base"
+
+    def __init__(self, fps: float = 30.0, realtime: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.fps = fps
+        self.realtime = realtime      # False: beklemeden olabildiğince hızlı üret
+        self.frame_index = 0
+        self._opened = False
+        self._start_time = 0.0
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened:
+            return False, None
+        self._pace()
+        ret, frame = self._read_frame(image)
+        if ret:
+            self.frame_index += 1
+        return ret, frame
+
+    @abstractmethod
+    def _read_frame(self, image: Optional[np.ndarray]) -> Tuple[bool, Optional[np.ndarray]]:
+        """Bir sonraki frame'i (varsa verilen tampona) üret"""
+
+    def _pace(self):
+        """Gerçek zamanlı modda frame'leri sabit hızda ver"""
+        if not self.realtime or self.fps <= 0:
+            return
+        if self.frame_index == 0:
+            self._start_time = time.monotonic()
+            return
+        delay = self._start_time + self.frame_index / self.fps - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    @abstractmethod
+    def frame_size(self) -> Tuple[int, int]:
+        """(genişlik, yükseklik)"""
+
+    def get(self, prop: int) -> float:
+        width, height = self.frame_size()
+        return {
+            cv2.CAP_PROP_FRAME_WIDTH: float(width),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(height),
+            cv2.CAP_PROP_FPS: float(self.fps),
+            cv2.CAP_PROP_POS_FRAMES: float(self.frame_index)
+        }.get(prop, 0.0)
+
+    def set(self, prop: int, value: float) -> bool:
+        # Boyut kaynağa aittir; sadece hız ayarlanabilir
+        if prop == cv2.CAP_PROP_FPS and value > 0:
+            self.fps = float(value)
+            return True
+        return False
+
+    def release(self):
+        self._opened = False
+
+
+def _fit_frame(frame: np.ndarray, image: Optional[np.ndarray]) -> np.ndarray:
+    """Frame'i verilen tampona yaz (boyut farklıysa ölçekleyerek)"""
+    if image is None:
+        return frame
+    if frame.shape == image.shape:
+        np.copyto(image, frame)
+    else:
+        cv2.resize(frame, (image.shape[1], image.shape[0]), dst=image)
+    return image
+
+
+class CameraSource(FrameSource):
+    """Gerçek kamera (cv2.VideoCapture sarmalayıcısı)"""
+
+    name = "camera"
+
+    def __init__(self, index: int = 0):
+        super().__init__(realtime=False)  # Hızı kamera belirler
+        self.index = index
+        self.capture = cv2.VideoCapture(index)
+        self._opened = self.capture.isOpened()
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        return self._read_frame(image)
+
+    def _read_frame(self, image):
+        return self.capture.read(image)
+
+    def frame_size(self) -> Tuple[int, int]:
+        return (int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def get(self, prop: int) -> float:
+        return self.capture.get(prop)
+
+    def set(self, prop: int, value: float) -> bool:
+        return self.capture.set(prop, value)
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    """Sonunda başa saran video dosyası"""
+
+    name = "video"
+
+    def __init__(self, path: str, loop: bool = True, realtime: bool = True):
+        self.capture = cv2.VideoCapture(path)
+        super().__init__(fps=self.capture.get(cv2.CAP_PROP_FPS) or 30.0, realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.loops = 0
+        self._opened = self.capture.isOpened()
+        if not self._opened:
+            self.logger.error(f"Video açılamadı: {path}")
+
+    def frame_size(self) -> Tuple[int, int]:
+        return (int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def _read_frame(self, image):
+        ret, frame = self.capture.read()
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.loops += 1
+            ret, frame = self.capture.read()
+        if not ret:
+            return False, None
+        return True, _fit_frame(frame, image)
+
+    def release(self):
+        self.capture.release()
+        super().release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Klasördeki görüntüleri ad sırasıyla sabit hızda veren kaynak
+
+    Tüm görüntüler ilk görüntünün boyutuna getirilir.
+    """
+
+    name = "images"
+
+    def __init__(self, path: str, fps: float = 30.0, loop: bool = True, realtime: bool = True):
+        super().__init__(fps=fps, realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+        ) if os.path.isdir(path) else []
+        self._size: Tuple[int, int] = (0, 0)
+
+        first = cv2.imread(self.files[0]) if self.files else None
+        if first is None:
+            self.logger.error(f"Görüntü klasörü boş veya okunamadı: {path}")
+        else:
+            self._size = (first.shape[1], first.shape[0])
+            self._opened = True
+
+    def frame_size(self) -> Tuple[int, int]:
+        return self._size
+
+    def _read_frame(self, image):
+        position = self.frame_index
+        if position >= len(self.files):
+            if not self.loop:
+                return False, None
+            position %= len(self.files)
+
+        frame = cv2.imread(self.files[position])
+        if frame is None:
+            return False, None
+        if image is None and (frame.shape[1], frame.shape[0]) != self._size:
+            frame = cv2.resize(frame, self._size)
+        return True, _fit_frame(frame, image)
+
+
+@dataclass(frozen=True)
+class SyntheticPosture:
+    """Sentetik deneğin duruş parametreleri"""
+    head_forward: float = 0.0   # Kafanın omuz genişliğine oranla öne kayması
+    neck_flex: float = 0.0      # Boyun öne eğimi (derece)
+    shoulder_tilt: float = 0.0  # Omuz hattı eğimi (derece, + sol omuz aşağı)
+    back_lean: float = 0.0      # Gövdenin dikeyden sapması (derece)
+
+
+# Varsayılan senaryo: dik, öne kafa, kambur, yana eğik
+DEFAULT_SYNTHETIC_POSTURES = (
+    SyntheticPosture(),
+    SyntheticPosture(head_forward=0.25, neck_flex=15),
+    SyntheticPosture(head_forward=0.35, neck_flex=25, back_lean=18),
+    SyntheticPosture(shoulder_tilt=10, back_lean=-8)
+)
+
+
+class SyntheticSubjectSource(FrameSource):
+    """Prosedürel olarak çizilen, duruşlar arasında gezinen masa başı denek
+
+    Görüntü sadece frame indeksine ve tohuma bağlıdır (duvar saatine değil);
+    aynı tohum ve hız her çalıştırmada aynı frame dizisini üretir. Çizilen
+    noktaların gerçek konumları ground_truth() ile alınabilir.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0, seed: int = 0,
+                 postures: Sequence[SyntheticPosture] = DEFAULT_SYNTHETIC_POSTURES,
+                 period: float = 10.0, noise: float = 4.0, realtime: bool = True):
+        super().__init__(fps=fps, realtime=realtime)
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.postures = tuple(postures)
+        self.period = period  # Bir duruştan diğerine geçiş süresi (saniye)
+        self._opened = True
+
+        # Sabit arka plan: dikey gradyan + tohumlu doku gürültüsü
+        rng = np.random.default_rng(seed)
+        gradient = np.linspace(170, 120, height, dtype=np.float32)[:, None, None]
+        base = np.broadcast_to(gradient * np.array([1.0, 0.95, 0.85], dtype=np.float32), (height, width, 3))
+        texture = rng.normal(0, noise, (height, width, 1)).astype(np.float32)
+        self._background = np.clip(base + texture, 0, 255).astype(np.uint8)
+        self._points = np.zeros((NUM_POSE_LANDMARKS, 4), dtype=np.float32)
+
+    def frame_size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    def posture_at(self, index: int) -> SyntheticPosture:
+        """Frame indeksine karşılık gelen (yumuşak geçişli) duruş"""
+        phase = index / self.fps / self.period
+        current = int(phase) % len(self.postures)
+        target = (current + 1) % len(self.postures)
+        # Sürenin yarısı duruşta bekle, yarısı geçiş yap (kosinüs yumuşatma)
+        blend = min(1.0, max(0.0, (phase % 1.0) * 2 - 1.0))
+        weight = 0.5 - 0.5 * math.cos(math.pi * blend)
+
+        a, b = self.postures[current], self.postures[target]
+        return SyntheticPosture(*(
+            getattr(a, field) * (1 - weight) + getattr(b, field) * weight
+            for field in ("head_forward", "neck_flex", "shoulder_tilt", "back_lean")
+        ))
+
+    def _layout(self, posture: SyntheticPosture) -> Dict[str, Tuple[float, float]]:
+        """Duruştan piksel cinsinden nokta konumları"""
+        w, h = self.width, self.height
+        shoulder_width = 0.28 * w
+
+        hip = (0.5 * w, 1.02 * h)
+        torso = 0.5 * h
+        lean = math.radians(posture.back_lean)
+        shoulder_center = (hip[0] + torso * math.sin(lean), hip[1] - torso * math.cos(lean))
+
+        tilt = math.radians(posture.shoulder_tilt)
+        half = shoulder_width / 2
+        left_shoulder = (shoulder_center[0] + half * math.cos(tilt), shoulder_center[1] + half * math.sin(tilt))
+        right_shoulder = (shoulder_center[0] - half * math.cos(tilt), shoulder_center[1] - half * math.sin(tilt))
+
+        neck = 0.16 * h
+        flex = lean + math.radians(posture.neck_flex)
+        head = (shoulder_center[0] + neck * math.sin(flex) + posture.head_forward * shoulder_width,
+                shoulder_center[1] - neck * math.cos(flex) - 0.06 * h)
+        ear_offset = 0.07 * w
+
+        return {
+            "nose": (head[0] + 0.02 * w, head[1] + 0.01 * h),
+            "left_ear": (head[0] + ear_offset, head[1]),
+            "right_ear": (head[0] - ear_offset, head[1]),
+            "head": head,
+            "left_shoulder": left_shoulder,
+            "right_shoulder": right_shoulder,
+            "left_elbow": (left_shoulder[0] + 0.05 * w, left_shoulder[1] + 0.22 * h),
+            "right_elbow": (right_shoulder[0] - 0.05 * w, right_shoulder[1] + 0.22 * h),
+            "left_hip": (hip[0] + 0.1 * w, hip[1]),
+            "right_hip": (hip[0] - 0.1 * w, hip[1])
+        }
+
+    def _read_frame(self, image):
+        frame = image if image is not None else np.empty_like(self._background)
+        np.copyto(frame, self._background)
+        points = self._layout(self.posture_at(self.frame_index))
+
+        def pt(name):
+            x, y = points[name]
+            return int(round(x)), int(round(y))
+
+        skin, shirt, hair = (150, 180, 225), (140, 90, 60), (40, 45, 60)
+
+        # Gövde ve kollar
+        cv2.fillConvexPoly(frame, np.array([pt("left_shoulder"), pt("left_hip"),
+                                            pt("right_hip"), pt("right_shoulder")]), shirt)
+        thickness = max(2, self.width // 25)
+        for side in ("left", "right"):
+            cv2.line(frame, pt(f"{side}_shoulder"), pt(f"{side}_elbow"), shirt, thickness)
+            cv2.circle(frame, pt(f"{side}_shoulder"), thickness // 2, shirt, -1)
+
+        # Boyun, kafa, kulaklar ve yüz
+        shoulder_mid = tuple((a + b) // 2 for a, b in zip(pt("left_shoulder"), pt("right_shoulder")))
+        cv2.line(frame, shoulder_mid, pt("head"), skin, max(2, self.width // 20))
+        radius = int(0.085 * self.width)
+        cv2.ellipse(frame, pt("head"), (radius, int(radius * 1.2)), 0, 0, 360, skin, -1)
+        cv2.ellipse(frame, pt("head"), (radius, int(radius * 1.2)), 0, 180, 360, hair, -1)
+        for ear in ("left_ear", "right_ear"):
+            cv2.circle(frame, pt(ear), max(2, radius // 5), skin, -1)
+        cv2.circle(frame, pt("nose"), max(1, radius // 8), (120, 140, 200), -1)
+
+        self._store_ground_truth(points)
+        return True, frame
+
+    def _store_ground_truth(self, points: Dict[str, Tuple[float, float]]):
+        """Çizilen noktaları MediaPipe indeksleriyle (33, 4) diziye yaz"""
+        indices = {"nose": 0, "left_ear": 7, "right_ear": 8, "left_shoulder": 11, "right_shoulder": 12,
+                   "left_elbow": 13, "right_elbow": 14, "left_hip": 23, "right_hip": 24}
+        self._points.fill(0.0)
+        for name, index in indices.items():
+            x, y = points[name]
+            self._points[index] = (x / self.width, y / self.height, 0.0, 1.0)
+
+    def ground_truth(self) -> np.ndarray:
+        """Son üretilen frame'in gerçek landmark'ları (33, 4); görünmeyenler 0"""
+        return self._points.copy()
+
+
+FRAME_SOURCE_TYPES = ("camera", "video", "images", "synthetic")
+
+
+def create_frame_source(config, kind: Optional[str] = None, path: Optional[str] = None,
+                        seed: Optional[int] = None, realtime: Optional[bool] = None) -> FrameSource:
+    """AppConfig'e göre (verilen parametreler öncelikli) frame kaynağı oluştur"""
+    kind = kind or config.FRAME_SOURCE
+    path = path or config.FRAME_SOURCE_PATH
+    seed = config.SYNTHETIC_SEED if seed is None else seed
+    realtime = config.FRAME_SOURCE_REALTIME if realtime is None else realtime
+
+    if kind == VideoFileSource.name:
+        return VideoFileSource(path, realtime=realtime)
+    if kind == ImageDirectorySource.name:
+        return ImageDirectorySource(path, fps=config.CAMERA_FPS, realtime=realtime)
+    if kind == SyntheticSubjectSource.name:
+        return SyntheticSubjectSource(config.CAMERA_WIDTH, config.CAMERA_HEIGHT, fps=config.CAMERA_FPS,
+                                      seed=seed, period=config.SYNTHETIC_POSTURE_PERIOD,
+                                      realtime=realtime)
+    return CameraSource(config.CAMERA_INDEX)
+
+
+def benchmark_pipeline(source: FrameSource, frames: int = 300, annotate: bool = False) -> Dict[str, object]:
+    """Verilen kaynakla tüm PostureDetector hattını çalıştır ve ölç
+
+    Her yeni frame bir kez işlenir; toplam hız, çağrı başına gecikme ve
+    aşama histogramları döndürülür.
+    """
+    from core.posture_detector import PostureDetector
+
+    detector = PostureDetector()
+    if not detector.start_camera(source):
+        raise RuntimeError("Frame kaynağı açılamadı")
+
+    processed = 0
+    latencies: List[float] = []
+    last_sequence = None
+    start = time.perf_counter()
+    try:
+        while processed < frames:
+            tick = time.perf_counter()
+            result = detector.process_frame(annotate=annotate)
+            if result is None or result.sequence == last_sequence:
+                time.sleep(0.001)
+                continue
+            latencies.append((time.perf_counter() - tick) * 1000)
+            last_sequence = result.sequence
+            processed += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        detector.cleanup()
+
+    return {
+        "frames": processed,
+        "fps": processed / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "stages": detector.get_timing_stats(),
+        "pipeline": detector.get_pipeline_stats()
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from config import AppConfig
+
+    parser = argparse.ArgumentParser(description="PostureDetector hattını kamerasız ölç")
+    parser.add_argument("--source", choices=FRAME_SOURCE_TYPES, default="synthetic")
+    parser.add_argument("--path", default="", help="Video dosyası veya görüntü klasörü")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--realtime", action="store_true", help="Kaynağı gerçek zamanlı hızda çalıştır")
+    args = parser.parse_args()
+
+    frame_source = create_frame_source(AppConfig(), args.source, args.path, args.seed, args.realtime)
+    report = benchmark_pipeline(frame_source, args.frames)
+    print(f"{report['frames']} frame, {report['fps']:.1f} frame/s, "
+          f"p50={report['p50_ms']:.2f} ms, p95={report['p95_ms']:.2f} ms")
+    for stage, stats in report["stages"].items():
+        print(f"  {stage:20s} p50={stats['p50_ms']:.2f} ms p95={stats['p95_ms']:.2f} ms n={stats['count']}")
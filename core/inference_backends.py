@@ -0,0 +1,363 @@
+"""
+PostureFix - Çıkarım Backend Modülü
+Pose landmark modelleri için ortak arayüz (yükleme, ısınma, tek frame ve
+toplu çıkarım) ile MediaPipe ve ONNX Runtime (CPU) uygulamaları
+"""
+
+import os
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from core.landmarks import NUM_POSE_LANDMARKS, landmark_list_to_array
+
+# ONNX Runtime grafik optimizasyon seviyeleri (config adı -> GraphOptimizationLevel adı)
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL"
+}
+
+
+class InferenceBackend(ABC):
+    """Pose çıkarım backend'lerinin ortak arayüzü
+
+    infer() RGB uint8 (H, W, 3) frame alır ve frame'e göre normalize edilmiş
+    (33, 4) float32 landmark dizisi (x, y, z, görünürlük) ya da kişi yoksa
+    None döndürür. Böylece metrik ve ROI hattı backend'den bağımsızdır.
+    full=False, çağıranın sadece postür noktalarına ihtiyacı olduğunu
+    bildirir; backend diğer satırları doldurmayabilir (görünürlük 0).
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.loaded = False
+        self.inference_count = 0
+        self.total_inference_time = 0.0
+
+    @abstractmethod
+    def load(self):
+        """Modeli belleğe yükle"""
+
+    @abstractmethod
+    def infer(self, rgb_frame: np.ndarray, full: bool = True) -> Optional[np.ndarray]:
+        """Tek bir frame üzerinde çıkarım yap"""
+
+    def infer_batch(self, rgb_frames: Sequence[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """Birden çok frame üzerinde çıkarım yap (varsayılan: sırayla)"""
+        return [self.infer(frame) for frame in rgb_frames]
+
+    def warmup(self, frame_shape: Tuple[int, int, int] = (480, 640, 3), iterations: int = 3) -> float:
+        """Boş frame'lerle ısınma turları at; ortalama süreyi (ms) döndür
+
+        İlk çağrılardaki bellek ayırma ve grafik hazırlığı maliyeti canlı
+        ölçümlere karışmasın diye sayaçlar sıfırlanır.
+        """
+        if not self.loaded:
+            self.load()
+
+        frame = np.zeros(frame_shape, dtype=np.uint8)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            self.infer(frame)
+        elapsed = time.perf_counter() - start
+
+        self.reset()
+        self.inference_count = 0
+        self.total_inference_time = 0.0
+        return elapsed / max(1, iterations) * 1000
+
+    def reset(self):
+        """Zamansal takip durumunu sıfırla (yeni sahne/kaynak)"""
+        pass
+
+    def close(self):
+        """Model kaynaklarını serbest bırak"""
+        self.loaded = False
+
+    def get_stats(self) -> Dict[str, float]:
+        """Çıkarım sayaçlarını döndür"""
+        return {
+            "backend": self.name,
+            "inference_count": self.inference_count,
+            "avg_inference_ms": (
+                self.total_inference_time / self.inference_count * 1000 if self.inference_count > 0 else 0.0
+            )
+        }
+
+
+class MediaPipeBackend(InferenceBackend):
+    """mp.solutions.pose tabanlı backend (varsayılan)"""
+
+    name = "mediapipe"
+
+    def __init__(self, **pose_options):
+        super().__init__()
+        self.pose_options = pose_options
+        self.pose = None
+
+    def load(self):
+        if self.loaded:
+            return
+        import mediapipe as mp
+        self.pose = mp.solutions.pose.Pose(**self.pose_options)
+        self.loaded = True
+
+    def infer(self, rgb_frame: np.ndarray, full: bool = True) -> Optional[np.ndarray]:
+        if not self.loaded:
+            self.load()
+
+        start = time.perf_counter()
+        results = self.pose.process(rgb_frame)
+        self.total_inference_time += time.perf_counter() - start
+        self.inference_count += 1
+
+        if not results.pose_landmarks:
+            return None
+        # Protobuf alan okuması Python düzeyinde: gerekmedikçe 33 noktanın hepsi okunmaz
+        return landmark_list_to_array(results.pose_landmarks, full=full)
+
+    def reset(self):
+        if self.pose is not None:
+            self.pose.reset()
+
+    def close(self):
+        if self.pose is not None:
+            self.pose.close()
+            self.pose = None
+        super().close()
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """ONNX Runtime CPU execution provider ile çalışan landmark modeli
+
+    BlazePose tarzı landmark modelleri beklenir: kare RGB girdi (NHWC veya
+    NCHW, [0, 1] aralığında), ilk çıktı landmark başına en az dört değer
+    (x, y, z, görünürlük logit'i; x/y girdi piksel cinsinden), varsa tek
+    elemanlı ikinci çıktı kişi varlık skoru. Frame kareye letterbox ile
+    sığdırılır ve koordinatlar frame'e geri taşınır.
+    """
+
+    name = "onnxruntime"
+
+    def __init__(self, model_path: str, intra_op_threads: int = 0, inter_op_threads: int = 0,
+                 graph_optimization: str = "all", min_presence: float = 0.5,
+                 values_per_landmark: int = 5):
+        super().__init__()
+        self.model_path = model_path
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.graph_optimization = graph_optimization
+        self.min_presence = min_presence
+        self.values_per_landmark = values_per_landmark  # BlazePose: x, y, z, görünürlük, varlık
+
+        self.session = None
+        self.input_name = None
+        self.input_size = 256
+        self.channels_first = False
+        self.dynamic_batch = False
+        self._input_buffer: Optional[np.ndarray] = None
+
+    def load(self):
+        if self.loaded:
+            return
+        import onnxruntime as ort
+
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"ONNX modeli bulunamadı: {self.model_path}")
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = (
+            ort.ExecutionMode.ORT_PARALLEL if self.inter_op_threads > 1 else ort.ExecutionMode.ORT_SEQUENTIAL
+        )
+        level_name = GRAPH_OPTIMIZATION_LEVELS.get(self.graph_optimization, "ORT_ENABLE_ALL")
+        options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level_name)
+
+        self.session = ort.InferenceSession(self.model_path, sess_options=options,
+                                            providers=["CPUExecutionProvider"])
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        shape = model_input.shape
+        self.channels_first = shape[1] == 3
+        self.input_size = int(shape[2] if self.channels_first else shape[1])
+        self.dynamic_batch = not isinstance(shape[0], int)
+
+        self.loaded = True
+        self.logger.info(
+            f"ONNX modeli yüklendi: {self.model_path} (girdi {self.input_size}px, "
+            f"intra={self.intra_op_threads}, inter={self.inter_op_threads}, opt={self.graph_optimization})"
+        )
+
+    def _letterbox(self, rgb_frame: np.ndarray, out: np.ndarray) -> Tuple[float, float, float]:
+        """Frame'i en-boy oranını koruyarak kare girdiye yerleştir
+
+        Ölçek ve (x, y) dolgu payını piksel cinsinden döndürür.
+        """
+        height, width = rgb_frame.shape[:2]
+        size = self.input_size
+        scale = size / max(width, height)
+        new_w, new_h = max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+        pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+        resized = cv2.resize(rgb_frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+        out.fill(0.0)
+        np.multiply(resized, 1.0 / 255.0, out=out[pad_y:pad_y + new_h, pad_x:pad_x + new_w], casting="unsafe")
+        return scale, pad_x, pad_y
+
+    def _decode(self, raw: np.ndarray, presence: Optional[float], frame_shape: Tuple[int, ...],
+                scale: float, pad_x: float, pad_y: float) -> Optional[np.ndarray]:
+        """Ham model çıktısını frame'e göre normalize (33, 4) diziye çevir"""
+        if presence is not None and presence < self.min_presence:
+            return None
+
+        if raw.size < NUM_POSE_LANDMARKS * self.values_per_landmark:
+            return None
+
+        height, width = frame_shape[:2]
+        points = np.empty((NUM_POSE_LANDMARKS, 4), dtype=np.float32)
+        values = raw.reshape(-1, self.values_per_landmark)[:NUM_POSE_LANDMARKS]
+        points[:, 0] = (values[:, 0] - pad_x) / (scale * width)
+        points[:, 1] = (values[:, 1] - pad_y) / (scale * height)
+        points[:, 2] = values[:, 2] / (scale * width)
+        points[:, 3] = 1.0 / (1.0 + np.exp(-values[:, 3]))  # Görünürlük logit -> olasılık
+        return points
+
+    def _prepare(self, count: int) -> np.ndarray:
+        """(count, S, S, 3) float32 girdi tamponunu (yeniden) kullan"""
+        size = self.input_size
+        if self._input_buffer is None or self._input_buffer.shape[0] != count:
+            self._input_buffer = np.empty((count, size, size, 3), dtype=np.float32)
+        return self._input_buffer
+
+    def _run(self, batch: np.ndarray):
+        feed = np.ascontiguousarray(batch.transpose(0, 3, 1, 2)) if self.channels_first else batch
+        start = time.perf_counter()
+        outputs = self.session.run(None, {self.input_name: feed})
+        self.total_inference_time += time.perf_counter() - start
+        self.inference_count += batch.shape[0]
+        return outputs
+
+    @staticmethod
+    def _presence(outputs, index: int) -> Optional[float]:
+        if len(outputs) < 2 or outputs[1].size != outputs[0].shape[0]:
+            return None
+        logit = float(outputs[1].reshape(-1)[index])
+        return 1.0 / (1.0 + np.exp(-logit))
+
+    def infer(self, rgb_frame: np.ndarray, full: bool = True) -> Optional[np.ndarray]:
+        # Çıktı tensörü zaten dizi: full=False ile kazanılacak bir şey yok
+        if not self.loaded:
+            self.load()
+
+        batch = self._prepare(1)
+        transform = self._letterbox(rgb_frame, batch[0])
+        outputs = self._run(batch)
+        return self._decode(outputs[0][0], self._presence(outputs, 0), rgb_frame.shape, *transform)
+
+    def infer_batch(self, rgb_frames: Sequence[np.ndarray]) -> List[Optional[np.ndarray]]:
+        if not self.loaded:
+            self.load()
+        if not self.dynamic_batch or len(rgb_frames) <= 1:
+            return super().infer_batch(rgb_frames)
+
+        # Model dinamik batch destekliyorsa frame'ler tek oturum çağrısında işlenir
+        batch = self._prepare(len(rgb_frames))
+        transforms = [self._letterbox(frame, batch[i]) for i, frame in enumerate(rgb_frames)]
+        outputs = self._run(batch)
+        return [
+            self._decode(outputs[0][i], self._presence(outputs, i), frame.shape, *transforms[i])
+            for i, frame in enumerate(rgb_frames)
+        ]
+
+    def close(self):
+        self.session = None
+        self._input_buffer = None
+        super().close()
+
+
+BACKEND_TYPES = {
+    MediaPipeBackend.name: MediaPipeBackend,
+    OnnxRuntimeBackend.name: OnnxRuntimeBackend
+}
+
+
+def create_backend(name: str, options: Dict) -> InferenceBackend:
+    """Ada göre backend oluştur (bilinmeyen adlar MediaPipe'a düşer)
+
+    options sözlüğü süreçler arasında taşınabilir; worker süreçleri aynı
+    backend'i kendi taraflarında kurar.
+    """
+    backend_class = BACKEND_TYPES.get(name, MediaPipeBackend)
+    return backend_class(**options)
+
+
+def backend_options_from_config(config, pose_options: Dict) -> Tuple[str, Dict]:
+    """AppConfig'ten seçili backend'in adını ve kurulum seçeneklerini oluştur"""
+    if config.INFERENCE_BACKEND == OnnxRuntimeBackend.name:
+        return OnnxRuntimeBackend.name, dict(
+            model_path=config.MODEL_PATH,
+            intra_op_threads=config.ONNX_INTRA_OP_THREADS,
+            inter_op_threads=config.ONNX_INTER_OP_THREADS,
+            graph_optimization=config.ONNX_GRAPH_OPTIMIZATION,
+            min_presence=config.MEDIAPIPE_DETECTION_CONFIDENCE
+        )
+    return MediaPipeBackend.name, dict(pose_options)
+
+
+def benchmark(backends: Dict[str, InferenceBackend], frames: int = 200,
+              frame_shape: Tuple[int, int, int] = (480, 640, 3), batch_size: int = 8) -> Dict[str, Dict[str, float]]:
+    """Backend'leri aynı sentetik frame'ler üzerinde karşılaştır"""
+    rng = np.random.default_rng(0)
+    samples = [rng.integers(0, 256, frame_shape, dtype=np.uint8) for _ in range(8)]
+    results = {}
+
+    for name, backend in backends.items():
+        warmup_ms = backend.warmup(frame_shape)
+
+        start = time.perf_counter()
+        for i in range(frames):
+            backend.infer(samples[i % len(samples)])
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(0, frames, batch_size):
+            backend.infer_batch(samples[:min(batch_size, frames - i)])
+        batched = time.perf_counter() - start
+
+        results[name] = {
+            "warmup_ms": warmup_ms,
+            "frame_ms": single / frames * 1000,
+            "fps": frames / single,
+            "batch_fps": frames / batched
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    from config import AppConfig
+
+    config = AppConfig()
+    candidates = {"mediapipe": MediaPipeBackend(model_complexity=1)}
+    model_path = sys.argv[1] if len(sys.argv) > 1 else config.MODEL_PATH
+    if os.path.exists(model_path):
+        candidates["onnxruntime"] = OnnxRuntimeBackend(
+            model_path,
+            intra_op_threads=config.ONNX_INTRA_OP_THREADS,
+            inter_op_threads=config.ONNX_INTER_OP_THREADS,
+            graph_optimization=config.ONNX_GRAPH_OPTIMIZATION
+        )
+
+    for backend_name, stats in benchmark(candidates).items():
+        print(f"{backend_name:12s} " + " ".join(f"{key}={value:.2f}" for key, value in stats.items()))
@@ -0,0 +1,268 @@
+"""
+PostureFix - Süreç Dışı Çıkarım Modülü
+Pose çıkarım backend'ini ayrı bir süreçte çalıştırır; frame'ler paylaşımlı
+bellek halkası üzerinden taşınır, sonuçlar hafif bir kuyrukla geri döner
+"""
+
+import time
+import queue
+import logging
+import multiprocessing as mp_proc
+from multiprocessing import shared_memory
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.frame_buffers import BufferPool, FrameRing
+from core.frame_capture import CapturedFrame
+from core.roi_tracker import Roi, crop_for_inference, map_landmarks_to_full
+from core.inference_backends import create_backend
+
+
+@dataclass
+class InferenceOutput:
+    """Worker sürecinden dönen tek bir çıkarım sonucu"""
+    sequence: int
+    slot_index: int
+    timestamp: float
+    landmarks: Optional[np.ndarray]  # (33, 4) float32: x, y, z, visibility
+    inference_time: float            # saniye
+
+
+class SharedFrameRing(FrameRing):
+    """Paylaşımlı bellekte yaşayan FrameRing
+
+    Worker'a sadece yuva indeksi gönderilir, böylece GUI süreci frame
+    kopyalamaz. Kilit durumu sadece oluşturan süreçte tutulur.
+    """
+
+    def __init__(self, slots: int, height: int, width: int, channels: int = 3,
+                 name: Optional[str] = None):
+        shape = (slots, height, width, channels)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=int(np.prod(shape)))
+        super().__init__(slots, height, width, channels,
+                         frames=np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self, unlink: bool = False):
+        """Paylaşımlı belleği kapat (sahibiyse sil)"""
+        self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Dışarıda hâlâ yuva görünümü tutan referanslar var
+            pass
+        if unlink and self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _inference_worker_main(shm_name: str, ring_shape: Tuple[int, int, int, int],
+                           request_queue, result_queue, backend_name: str, backend_options: Dict,
+                           roi_inference_size: int = 256):
+    """Worker süreci giriş noktası: Pose modeline sahip olan tek yer"""
+    import cv2
+
+    slots, height, width, channels = ring_shape
+    ring = SharedFrameRing(slots, height, width, channels, name=shm_name)
+    buffers = BufferPool()
+    backend = create_backend(backend_name, backend_options)
+    backend.load()
+
+    try:
+        while True:
+            request = request_queue.get()
+            if request is None:
+                break
+
+            sequence, slot_index, timestamp, roi = request
+            start = time.perf_counter()
+
+            frame = ring.view(slot_index)
+            input_frame = crop_for_inference(frame, roi, roi_inference_size, buffers)
+            rgb_input = cv2.cvtColor(input_frame, cv2.COLOR_BGR2RGB,
+                                     dst=buffers.get("rgb", input_frame.shape))
+            landmarks = backend.infer(rgb_input)
+            if landmarks is not None and roi is not None:
+                map_landmarks_to_full(landmarks, roi, frame.shape)
+
+            result_queue.put((sequence, slot_index, timestamp, landmarks,
+                              time.perf_counter() - start))
+    finally:
+        backend.close()
+        ring.close()
+
+
+class InferenceWorkerClient:
+    """GUI sürecindeki worker yöneticisi
+
+    submit() ve poll() hiçbir zaman bloklamaz. Worker çökerse
+    ensure_alive() onu yeniden başlatır.
+    """
+
+    def __init__(self, frame_shape: Tuple[int, int, int], backend_name: str, backend_options: Dict,
+                 slots: int = 6, max_in_flight: int = 1, restart_delay: float = 2.0,
+                 roi_inference_size: int = 256):
+        self.logger = logging.getLogger(__name__)
+        self.backend_name = backend_name
+        self.backend_options = backend_options
+        self.roi_inference_size = roi_inference_size
+        self.max_in_flight = max_in_flight
+        self.restart_delay = restart_delay
+
+        height, width, channels = frame_shape
+        self.ring = SharedFrameRing(slots, height, width, channels)
+
+        self._ctx = mp_proc.get_context("spawn")
+        self.process = None
+        self.request_queue = None
+        self.result_queue = None
+        self._in_flight: Dict[int, int] = {}  # sequence -> slot index
+        self._stopping = False
+        self._last_restart = 0.0
+
+        # Sayaçlar
+        self.submitted_count = 0
+        self.completed_count = 0
+        self.busy_skips = 0
+        self.restart_count = 0
+
+    def start(self):
+        """Worker sürecini başlat"""
+        self._stopping = False
+        self.request_queue = self._ctx.Queue(maxsize=self.max_in_flight + 1)
+        self.result_queue = self._ctx.Queue()
+        self.process = self._ctx.Process(
+            target=_inference_worker_main,
+            args=(self.ring.name, self.ring.shape, self.request_queue,
+                  self.result_queue, self.backend_name, self.backend_options,
+                  self.roi_inference_size),
+            name="PostureInferenceWorker",
+            daemon=True
+        )
+        self.process.start()
+        self.logger.info(f"Çıkarım worker'ı başlatıldı (pid={self.process.pid})")
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def ensure_alive(self) -> bool:
+        """Çökmüş worker'ı (bekleme süresine uyarak) yeniden başlat"""
+        if self._stopping or self.is_alive():
+            return self.is_alive()
+
+        now = time.monotonic()
+        if now - self._last_restart < self.restart_delay:
+            return False
+
+        exit_code = self.process.exitcode if self.process else None
+        self.logger.warning(f"Çıkarım worker'ı durmuş (exitcode={exit_code}), yeniden başlatılıyor")
+
+        self._last_restart = now
+        self.restart_count += 1
+        for slot_index in self._in_flight.values():
+            self.ring.unpin(slot_index)
+        self._in_flight.clear()
+        self._close_queues()
+        self.start()
+        return True
+
+    def submit(self, captured: CapturedFrame, roi: Optional[Roi] = None) -> bool:
+        """Frame'i (varsa sadece ROI'sini) worker'a gönder; meşgulse bekletmeden False döndür"""
+        if captured.slot_index is None or not self.is_alive():
+            return False
+
+        if len(self._in_flight) >= self.max_in_flight:
+            self.busy_skips += 1
+            return False
+
+        if not self.ring.pin(captured.slot_index, captured.sequence):
+            return False
+
+        try:
+            self.request_queue.put_nowait((captured.sequence, captured.slot_index, captured.timestamp, roi))
+        except queue.Full:
+            self.ring.unpin(captured.slot_index)
+            self.busy_skips += 1
+            return False
+
+        self._in_flight[captured.sequence] = captured.slot_index
+        self.submitted_count += 1
+        return True
+
+    def poll(self) -> List[InferenceOutput]:
+        """Tamamlanan sonuçları bekletmeden topla
+
+        Dönen sonuçların yuvaları kilitli kalır; çağıran taraf işi bitince
+        release() ile bırakmalıdır.
+        """
+        outputs = []
+        if self.result_queue is None:
+            return outputs
+
+        while True:
+            try:
+                sequence, slot_index, timestamp, landmarks, inference_time = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            self._in_flight.pop(sequence, None)
+            self.completed_count += 1
+            outputs.append(InferenceOutput(sequence, slot_index, timestamp, landmarks, inference_time))
+
+        return outputs
+
+    def release(self, slot_index: int):
+        """Sonucu işlenmiş yuvayı serbest bırak"""
+        self.ring.unpin(slot_index)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Worker sayaçlarını döndür"""
+        return {
+            "alive": self.is_alive(),
+            "submitted": self.submitted_count,
+            "completed": self.completed_count,
+            "in_flight": len(self._in_flight),
+            "busy_skips": self.busy_skips,
+            "restarts": self.restart_count
+        }
+
+    def _close_queues(self):
+        for q in (self.request_queue, self.result_queue):
+            if q is not None:
+                q.close()
+                q.cancel_join_thread()
+        self.request_queue = None
+        self.result_queue = None
+
+    def stop(self, timeout: float = 3.0):
+        """Worker'ı düzgünce kapat ve paylaşımlı belleği sil"""
+        self._stopping = True
+
+        if self.process is not None:
+            if self.process.is_alive():
+                try:
+                    self.request_queue.put(None, timeout=timeout)
+                except Exception:
+                    pass
+                self.process.join(timeout)
+
+            if self.process.is_alive():
+                self.logger.warning("Çıkarım worker'ı zamanında kapanmadı, sonlandırılıyor")
+                self.process.terminate()
+                self.process.join(timeout)
+
+            self.process = None
+
+        self._close_queues()
+        self._in_flight.clear()
+        self.ring.unpin_all()
+        self.ring.close(unlink=True)
+        self.logger.info("Çıkarım worker'ı kapatıldı")
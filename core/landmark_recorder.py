@@ -0,0 +1,221 @@
+"""
+PostureFix - Landmark Kayıt ve Tekrar Oynatma Modülü
+Ham 33x4 landmark'ları oturum başına sıkıştırılmış, bellek eşlemeli
+ikili dosyalara yazar; kayıtları metrik ve skor hattından toplu olarak
+gerçek zamandan çok daha hızlı geçirir
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from core.landmarks import NUM_POSE_LANDMARKS, POSTURE_LANDMARK_INDEX
+from core.posture_metrics import METRIC_NAMES, compute_posture_metrics, compute_posture_scores
+
+FILE_MAGIC = b"PFLM"
+FILE_VERSION = 1
+FILE_EXTENSION = ".lmk"
+
+# Dosya başlığı: sihirli sayı, sürüm, landmark sayısı, landmark başına değer
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("landmarks", "<u2"),
+    ("values", "<u2"),
+    ("reserved", "<u2")
+])
+
+# Kayıt: epoch zaman damgası + (33, 4) float16 (x, y, z, görünürlük) = 272 bayt
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("landmarks", "<f2", (NUM_POSE_LANDMARKS, 4))
+])
+
+
+class LandmarkRecorder:
+    """Oturum başına landmark dosyasına ekleme yapan kaydedici
+
+    Kayıtlar önceden ayrılmış bir parça tamponunda toplanır ve parça
+    dolduğunda tek bir write() ile diske eklenir. Kayıtlar sabit boyutlu
+    olduğundan dosya başlıktan sonra doğrudan np.memmap ile okunabilir;
+    yarım kalan son kayıt okuma sırasında yok sayılır.
+    """
+
+    def __init__(self, directory: str, chunk_frames: int = 256):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.chunk_frames = chunk_frames
+
+        self._chunk = np.zeros(chunk_frames, dtype=RECORD_DTYPE)
+        self._count = 0
+        self._file = None
+        self.session_id: Optional[str] = None
+        self.path: Optional[str] = None
+        self.records_written = 0
+
+    def append(self, session_id: str, timestamp: float, landmarks: np.ndarray):
+        """Bir frame'in (33, 4) landmark'larını ekle"""
+        if session_id != self.session_id:
+            self.open(session_id)
+
+        record = self._chunk[self._count]
+        record["timestamp"] = timestamp
+        record["landmarks"] = landmarks
+        self._count += 1
+
+        if self._count == self.chunk_frames:
+            self.flush()
+
+    def open(self, session_id: str):
+        """Oturum dosyasını aç (varsa sonuna eklenir)"""
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{session_id}{FILE_EXTENSION}")
+
+        is_new = not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER_DTYPE.itemsize
+        self._file = open(self.path, "ab")
+        if is_new:
+            self._file.truncate(0)
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header[0] = (FILE_MAGIC, FILE_VERSION, NUM_POSE_LANDMARKS, 4, 0)
+            self._file.write(header.tobytes())
+        else:
+            # Önceki çökmeden kalan yarım kaydı at
+            records = (os.path.getsize(self.path) - HEADER_DTYPE.itemsize) // RECORD_DTYPE.itemsize
+            self._file.truncate(HEADER_DTYPE.itemsize + records * RECORD_DTYPE.itemsize)
+
+        self.session_id = session_id
+        self.logger.info(f"Landmark kaydı başlatıldı: {self.path}")
+
+    def flush(self):
+        """Tampondaki kayıtları diske yaz"""
+        if self._file is None or self._count == 0:
+            return
+        self._file.write(self._chunk[:self._count].tobytes())
+        self._file.flush()
+        self.records_written += self._count
+        self._count = 0
+
+    def close(self):
+        """Kalan kayıtları yaz ve dosyayı kapat"""
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+            self.session_id = None
+
+
+class LandmarkReplayer:
+    """Landmark dosyasını bellek eşlemeyle okuyup toplu olarak skorlayan oynatıcı
+
+    Frame başına Python nesnesi oluşturulmaz: her parça (N, 33, 4) float16
+    görünümünden tek bir gather ile (N, 7, 3) float32'ye alınır ve toplu
+    metrik çekirdeğinden geçirilir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header[0]["magic"] != FILE_MAGIC:
+            raise ValueError(f"Geçersiz landmark dosyası: {path}")
+        if header[0]["version"] != FILE_VERSION:
+            raise ValueError(f"Desteklenmeyen landmark dosyası sürümü: {header[0]['version']}")
+
+        count = (os.path.getsize(path) - HEADER_DTYPE.itemsize) // RECORD_DTYPE.itemsize
+        self.records = (
+            np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_DTYPE.itemsize, shape=(count,))
+            if count > 0 else np.zeros(0, dtype=RECORD_DTYPE)
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def iter_chunks(self, chunk_frames: int = 65536) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(zaman damgaları, (n, 33, 4) float16) parçalarını sırayla ver (kopyasız)"""
+        for start in range(0, len(self.records), chunk_frames):
+            chunk = self.records[start:start + chunk_frames]
+            yield chunk["timestamp"], chunk["landmarks"]
+
+    def replay(self, chunk_frames: int = 65536) -> Dict[str, np.ndarray]:
+        """Tüm kaydı metrik ve skor hattından geçir
+
+        Dönen sözlük: timestamps, her metrik için (N,) dizi ve scores. Canlı
+        hattan farklı olarak metrikler zamansal yumuşatma uygulanmadan
+        hesaplanır.
+        """
+        total = len(self.records)
+        output = {name: np.empty(total, dtype=np.float32) for name in METRIC_NAMES}
+        output["timestamps"] = np.empty(total, dtype=np.float64)
+        output["scores"] = np.empty(total, dtype=np.float64)
+
+        position = 0
+        for timestamps, landmarks in self.iter_chunks(chunk_frames):
+            end = position + len(timestamps)
+            points = landmarks[:, POSTURE_LANDMARK_INDEX, :3].astype(np.float32)
+            metrics = compute_posture_metrics(points)
+
+            output["timestamps"][position:end] = timestamps
+            for name in METRIC_NAMES:
+                output[name][position:end] = metrics[name]
+            output["scores"][position:end] = compute_posture_scores(metrics)
+            position = end
+
+        return output
+
+
+def benchmark(hours: float = 10.0, rate: float = 2.0, directory: Optional[str] = None) -> Dict[str, float]:
+    """Sentetik kayıt yazıp tekrar oynat; boyut ve hız ölç
+
+    rate: saniyedeki kayıt sayısı (varsayılan POSTURE_CHECK_INTERVAL = 0.5 s).
+    """
+    import tempfile
+
+    frames = int(hours * 3600 * rate)
+    rng = np.random.default_rng(0)
+    base = rng.random((NUM_POSE_LANDMARKS, 4)).astype(np.float32)
+    jitter = rng.normal(0, 0.01, (1024, NUM_POSE_LANDMARKS, 4)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = LandmarkRecorder(directory or tmp)
+        start = time.perf_counter()
+        for i in range(frames):
+            recorder.append("benchmark", 1.7e9 + i / rate, base + jitter[i % 1024])
+        recorder.close()
+        record_time = time.perf_counter() - start
+
+        size = os.path.getsize(recorder.path)
+        replayer = LandmarkReplayer(recorder.path)
+        start = time.perf_counter()
+        result = replayer.replay()
+        replay_time = time.perf_counter() - start
+        del replayer, result
+
+    return {
+        "frames": frames,
+        "mb_per_hour": size / hours / 1e6,
+        "record_us_per_frame": record_time / frames * 1e6,
+        "replay_frames_per_s": frames / replay_time,
+        "realtime_factor": frames / rate / replay_time
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        # Kayıtlı oturumu tekrar skorla
+        replay_start = time.perf_counter()
+        replayed = LandmarkReplayer(sys.argv[1]).replay()
+        elapsed = time.perf_counter() - replay_start
+        frame_count = len(replayed["scores"])
+        print(f"{frame_count} frame {elapsed * 1000:.1f} ms içinde skorlandı "
+              f"({frame_count / max(elapsed, 1e-9):,.0f} frame/s), "
+              f"ortalama skor {replayed['scores'].mean() if frame_count else 0:.3f}")
+    else:
+        print(" ".join(f"{key}={value:,.2f}" for key, value in benchmark().items()))
@@ -0,0 +1,106 @@
+"""
+PostureFix - Landmark Veri Yapıları
+Postür analizinde kullanılan vücut noktalarının dizi tabanlı gösterimi
+"""
+
+from typing import Optional
+
+import numpy as np
+
+NUM_POSE_LANDMARKS = 33
+
+# PostureLandmarks satır sırası ve karşılık gelen MediaPipe Pose indeksleri
+POSTURE_LANDMARK_NAMES = (
+    "nose", "left_shoulder", "right_shoulder",
+    "left_ear", "right_ear", "left_hip", "right_hip"
+)
+POSTURE_LANDMARK_INDEX = np.array([0, 11, 12, 7, 8, 23, 24], dtype=np.intp)
+POSTURE_LANDMARK_INDICES = tuple(POSTURE_LANDMARK_INDEX.tolist())
+
+# Sütunlar
+X, Y, Z, VISIBILITY = range(4)
+
+
+def landmark_list_to_array(landmark_list, out: Optional[np.ndarray] = None,
+                           full: bool = True) -> np.ndarray:
+    """MediaPipe NormalizedLandmarkList'i (33, 4) float32 diziye çevir
+
+    Ara tuple/list nesneleri oluşturmadan tek geçişte doldurur. full=False
+    ise sadece postür metriklerinin kullandığı 7 nokta okunur (132 yerine
+    28 alan); diğer satırlar sıfır ve görünürlükleri 0 kalır.
+    """
+    landmarks = landmark_list.landmark
+    if not full:
+        points = out if out is not None else np.empty((NUM_POSE_LANDMARKS, 4), dtype=np.float32)
+        points.fill(0.0)
+        points[POSTURE_LANDMARK_INDEX] = np.fromiter(
+            (value for index in POSTURE_LANDMARK_INDICES
+             for lm in (landmarks[index],) for value in (lm.x, lm.y, lm.z, lm.visibility)),
+            dtype=np.float32,
+            count=len(POSTURE_LANDMARK_INDICES) * 4
+        ).reshape(len(POSTURE_LANDMARK_INDICES), 4)
+        return points
+
+    flat = np.fromiter(
+        (value for lm in landmarks for value in (lm.x, lm.y, lm.z, lm.visibility)),
+        dtype=np.float32,
+        count=len(landmarks) * 4
+    ).reshape(len(landmarks), 4)
+
+    if out is None:
+        return flat
+    out[...] = flat
+    return out
+
+
+class PostureLandmarks:
+    """Postür analizi için gerekli vücut noktaları
+
+    Yedi nokta tek bir bitişik (7, 4) float32 dizide tutulur: x, y, z ve
+    görünürlük. Öznitelikler bu dizinin satırlarına kopyasız görünümdür.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    @classmethod
+    def from_pose_array(cls, pose_array: np.ndarray) -> "PostureLandmarks":
+        """(33, 4) tam pose dizisinden tek bir gather ile oluştur"""
+        return cls(np.ascontiguousarray(pose_array[POSTURE_LANDMARK_INDEX], dtype=np.float32))
+
+    @property
+    def nose(self) -> np.ndarray:
+        return self.data[0, :3]
+
+    @property
+    def left_shoulder(self) -> np.ndarray:
+        return self.data[1, :3]
+
+    @property
+    def right_shoulder(self) -> np.ndarray:
+        return self.data[2, :3]
+
+    @property
+    def left_ear(self) -> np.ndarray:
+        return self.data[3, :3]
+
+    @property
+    def right_ear(self) -> np.ndarray:
+        return self.data[4, :3]
+
+    @property
+    def left_hip(self) -> np.ndarray:
+        return self.data[5, :3]
+
+    @property
+    def right_hip(self) -> np.ndarray:
+        return self.data[6, :3]
+
+    @property
+    def visibility(self) -> np.ndarray:
+        return self.data[:, VISIBILITY]
+
+    def __repr__(self) -> str:
+        return f"PostureLandmarks({self.data.tolist()})"
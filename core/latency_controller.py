@@ -0,0 +1,143 @@
+"""
+PostureFix - Gecikme Bütçesi Denetleyicisi
+Çıkarım gecikmesinin kayan yüzdeliğini izler; model karmaşıklığını ve
+çıkarım çözünürlüğünü bütçeyi koruyacak şekilde histerezisle ayarlar
+"""
+
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """Bir kalite basamağı: model karmaşıklığı ve çıkarım çözünürlüğü"""
+    model_complexity: int
+    resolution: Tuple[int, int]  # (genişlik, yükseklik)
+
+    def __str__(self) -> str:
+        return f"complexity={self.model_complexity} {self.resolution[0]}x{self.resolution[1]}"
+
+
+# Ucuzdan pahalıya sıralı basamaklar
+DEFAULT_QUALITY_LEVELS = (
+    QualityLevel(0, (320, 240)),
+    QualityLevel(0, (480, 360)),
+    QualityLevel(1, (480, 360)),
+    QualityLevel(1, (640, 480)),
+    QualityLevel(2, (640, 480))
+)
+
+
+class LatencyController:
+    """Kayan p95 gecikmesine göre kalite basamağı seçen denetleyici
+
+    Yüzdelik bütçeyi aşarsa bir basamak aşağı inilir; bütçenin
+    upgrade_ratio katının altında kalırsa bir basamak yukarı çıkılır.
+    Her değişiklikten sonra pencere yeniden dolana kadar karar verilmez ve
+    yukarı çıkış için ayrıca upgrade_cooldown beklenir. Az önce bütçeyi
+    aşan bir basamağa bu bekleme iki katına çıkarak döner; böylece iki
+    basamak arasında gidip gelinmez.
+    """
+
+    def __init__(self, budget_ms: float = 80.0, percentile: float = 95.0, window: int = 30,
+                 upgrade_ratio: float = 0.6, upgrade_cooldown: float = 30.0,
+                 levels: Sequence[QualityLevel] = DEFAULT_QUALITY_LEVELS,
+                 initial_level: Optional[QualityLevel] = None):
+        self.logger = logging.getLogger(__name__)
+        self.budget_ms = budget_ms
+        self.percentile = percentile
+        self.window = window
+        self.upgrade_ratio = upgrade_ratio
+        self.upgrade_cooldown = upgrade_cooldown  # saniye
+        self.levels = tuple(levels)
+
+        self.level_index = self.levels.index(initial_level) if initial_level in self.levels else 0
+        self.max_level_index = len(self.levels) - 1
+        self._samples = deque(maxlen=window)
+        self._last_change_time = time.monotonic()
+        self._upgrade_backoff: Dict[int, float] = {}  # basamak -> ek bekleme (saniye)
+
+        # Sayaçlar
+        self.downgrades = 0
+        self.upgrades = 0
+        self.changes: List[Dict[str, object]] = []  # Son değişikliklerin kaydı
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.level_index]
+
+    def current_percentile(self) -> float:
+        """Penceredeki gecikmelerin yüzdeliği (ms)"""
+        if not self._samples:
+            return 0.0
+        return float(np.percentile(self._samples, self.percentile))
+
+    def record(self, latency_ms: float, now: Optional[float] = None) -> Optional[QualityLevel]:
+        """Bir çıkarım gecikmesini kaydet; basamak değiştiyse yeni basamağı döndür"""
+        self._samples.append(latency_ms)
+        if len(self._samples) < self.window:
+            return None
+
+        now = time.monotonic() if now is None else now
+        value = self.current_percentile()
+
+        if value > self.budget_ms and self.level_index > 0:
+            # Bütçe aşıldı: bu basamağa dönüş beklemesini ikiye katla
+            backoff = self._upgrade_backoff.get(self.level_index, self.upgrade_cooldown)
+            self._upgrade_backoff[self.level_index] = min(backoff * 2, 3600.0)
+            self.downgrades += 1
+            return self._change(self.level_index - 1, value, now)
+
+        if value < self.budget_ms * self.upgrade_ratio and self.level_index < self.max_level_index:
+            target = self.level_index + 1
+            cooldown = self._upgrade_backoff.get(target, self.upgrade_cooldown)
+            if now - self._last_change_time >= cooldown:
+                self.upgrades += 1
+                return self._change(target, value, now)
+
+        return None
+
+    def cap_level(self) -> Optional[QualityLevel]:
+        """Mevcut basamak uygulanamadı (ör. model yüklenemedi): bir alta in ve bir daha çıkma"""
+        if self.level_index == 0:
+            return None
+        self.max_level_index = self.level_index - 1
+        return self._change(self.level_index - 1, self.current_percentile(), time.monotonic())
+
+    def _change(self, index: int, value: float, now: float) -> QualityLevel:
+        previous = self.level
+        self.level_index = index
+        self._samples.clear()
+        self._last_change_time = now
+
+        self.changes.append({
+            "time": time.time(),
+            "from": str(previous),
+            "to": str(self.level),
+            "p_latency_ms": value
+        })
+        del self.changes[:-20]
+
+        self.logger.info(
+            f"Kalite basamağı değişti: {previous} -> {self.level} "
+            f"(p{self.percentile:.0f}={value:.1f} ms, bütçe={self.budget_ms:.0f} ms)"
+        )
+        return self.level
+
+    def get_stats(self) -> Dict[str, object]:
+        """Denetleyici durumunu döndür"""
+        return {
+            "level": str(self.level),
+            "model_complexity": self.level.model_complexity,
+            "resolution": self.level.resolution,
+            "p_latency_ms": self.current_percentile(),
+            "budget_ms": self.budget_ms,
+            "downgrades": self.downgrades,
+            "upgrades": self.upgrades,
+            "changes": list(self.changes)
+        }
@@ -0,0 +1,94 @@
+"""
+PostureFix - Hareket Kapısı Modülü
+Küçültülmüş gri tonlamalı frame karşılaştırmasıyla sabit sahnelerde
+pose çıkarımını atlar
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Çıkarımdan önce çalışan ucuz hareket kontrolü
+
+    Son analiz edilen frame ile yeni frame'in küçük gri tonlamalı
+    kopyaları karşılaştırılır. Ortalama piksel farkı eşiğin altındaysa
+    önceki landmark ve metrikler yeniden kullanılır; ancak son çıkarımın
+    üzerinden max_reuse_age saniye geçtiyse çıkarım zorlanır.
+    """
+
+    def __init__(self, threshold: float = 4.0, max_reuse_age: float = 5.0,
+                 size: Tuple[int, int] = (64, 48)):
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold          # 0-255 ölçeğinde ortalama mutlak fark
+        self.max_reuse_age = max_reuse_age  # saniye
+        self.size = size                    # (genişlik, yükseklik)
+
+        # Önceden ayrılmış tamponlar
+        width, height = size
+        self._small = np.empty((height, width, 3), dtype=np.uint8)
+        self._current = np.empty((height, width), dtype=np.uint8)
+        self._reference = np.empty((height, width), dtype=np.uint8)
+        self._diff = np.empty((height, width), dtype=np.uint8)
+        self._has_reference = False
+        self._reference_time = 0.0
+
+        # Sayaçlar
+        self.checks = 0
+        self.passes = 0        # Çıkarıma izin verilen frame'ler
+        self.skips = 0         # Önceki sonucun yeniden kullanıldığı frame'ler
+        self.forced_refreshes = 0
+        self.last_change = 0.0
+
+    def should_infer(self, frame: np.ndarray, timestamp: float) -> bool:
+        """Frame için çıkarım gerekip gerekmediğine karar ver
+
+        True döndüğünde frame yeni referans olarak kabul edilir.
+        """
+        self.checks += 1
+
+        cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._current)
+
+        if not self._has_reference:
+            return self._accept(timestamp)
+
+        cv2.absdiff(self._current, self._reference, dst=self._diff)
+        self.last_change = float(cv2.mean(self._diff)[0])
+
+        if self.last_change >= self.threshold:
+            return self._accept(timestamp)
+
+        if timestamp - self._reference_time >= self.max_reuse_age:
+            self.forced_refreshes += 1
+            return self._accept(timestamp)
+
+        self.skips += 1
+        return False
+
+    def _accept(self, timestamp: float) -> bool:
+        """Mevcut frame'i referans yap"""
+        self._current, self._reference = self._reference, self._current
+        self._has_reference = True
+        self._reference_time = timestamp
+        self.passes += 1
+        return True
+
+    def reset(self):
+        """Referansı unut (bir sonraki frame mutlaka analiz edilir)"""
+        self._has_reference = False
+
+    def get_stats(self) -> Dict[str, float]:
+        """Geçiş/atlama oranlarını döndür"""
+        return {
+            "checks": self.checks,
+            "passes": self.passes,
+            "skips": self.skips,
+            "forced_refreshes": self.forced_refreshes,
+            "hit_ratio": self.passes / self.checks if self.checks else 0.0,
+            "skip_ratio": self.skips / self.checks if self.checks else 0.0,
+            "last_change": self.last_change
+        }
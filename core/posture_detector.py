@@ -7,22 +7,44 @@ import cv2
 import numpy as np
 import mediapipe as mp
 import logging
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Optional, Sequence, Tuple, List
 from dataclasses import dataclass
 import math
+import time
 
 from config import AppConfig, POSTURE_THRESHOLDS
+from core.frame_buffers import BufferPool, FrameRing
+from core.frame_capture import CapturedFrame, FrameCaptureThread, LatestFrameSlot
+from core.frame_sources import CameraSource, FrameSource, create_frame_source
+from core.camera_probe import CameraProbe
+from core.inference_worker import InferenceOutput, InferenceWorkerClient
+from core.motion_gate import MotionGate
+from core.roi_tracker import RoiTracker, map_landmarks_to_full
+from core.landmarks import PostureLandmarks, landmark_list_to_array
+from core.inference_backends import (InferenceBackend, MediaPipeBackend,
+                                     backend_options_from_config, create_backend)
+from core.latency_controller import LatencyController, QualityLevel
+from utils.profiling import PipelineProfiler
+from core.posture_metrics import METRIC_NAMES, compute_frame_metrics
+from core.filters import create_filter
 
 @dataclass
-class PostureLandmarks:
-    """Postür analizi için gerekli vücut noktaları"""
-    nose: Tuple[float, float, float]
-    left_shoulder: Tuple[float, float, float]
-    right_shoulder: Tuple[float, float, float]
-    left_ear: Tuple[float, float, float]
-    right_ear: Tuple[float, float, float]
-    left_hip: Tuple[float, float, float]
-    right_hip: Tuple[float, float, float]
+class FrameResult:
+    """Tek bir frame için tek seferlik çıkarımın tüm çıktıları
+
+    Skorlama, CameraWidget ve veri kaydı aynı sonucu paylaşır; böylece
+    her yakalanan frame için kamera okuması ve pose çıkarımı bir kez yapılır.
+    """
+    frame: np.ndarray                        # Ham BGR frame
+    timestamp: float                         # Yakalama zamanı (time.monotonic)
+    sequence: int                            # Yakalama sıra numarası
+    pose_landmarks: Optional[object] = None  # Çizim için MediaPipe landmark listesi (gerektiğinde)
+    landmarks: Optional[PostureLandmarks] = None
+    metrics: Optional[Dict[str, float]] = None  # Yumuşatılmış postür metrikleri
+    annotated_frame: Optional[np.ndarray] = None
+    landmark_array: Optional[np.ndarray] = None  # (33, 4) tam frame landmark dizisi (çizim/kayıt yoksa sadece postür satırları)
+    slot_index: Optional[int] = None  # Worker modunda paylaşımlı bellek yuvası
+    full_landmarks: bool = True  # False ise landmark_array'de sadece 7 postür satırı dolu (çizilemez)
 
 class PostureDetector:
     """MediaPipe kullanarak postür tespiti yapan sınıf"""
@@ -37,7 +59,7 @@ class PostureDetector:
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
         # Pose model
-        self.pose = self.mp_pose.Pose(
+        self.pose_options = dict(
             static_image_mode=False,
             model_complexity=1,
             smooth_landmarks=True,
@@ -47,41 +69,159 @@ class PostureDetector:
             min_tracking_confidence=self.config.MEDIAPIPE_TRACKING_CONFIDENCE
         )
         
+        # Çıkarım backend'i (MediaPipe veya ONNX Runtime); worker modunda model ayrı süreçte yaşar
+        self.backend_name, self.backend_options = backend_options_from_config(self.config, self.pose_options)
+        self.inference_worker: Optional[InferenceWorkerClient] = None
+        self.backend: Optional[InferenceBackend] = None
+        if not self.config.USE_INFERENCE_WORKER:
+            self.backend = create_backend(self.backend_name, self.backend_options)
+            self.backend.load()
+        
+        # Gecikme bütçesine göre model karmaşıklığı ve çıkarım çözünürlüğü
+        self.inference_resolution: Optional[Tuple[int, int]] = None  # None: kamera çözünürlüğü
+        self.latency_controller: Optional[LatencyController] = None
+        if self.config.LATENCY_CONTROLLER_ENABLED and self.backend is not None:
+            self.latency_controller = LatencyController(
+                budget_ms=self.config.LATENCY_BUDGET_MS,
+                percentile=self.config.LATENCY_PERCENTILE,
+                window=self.config.LATENCY_WINDOW,
+                upgrade_ratio=self.config.LATENCY_UPGRADE_RATIO,
+                upgrade_cooldown=self.config.LATENCY_UPGRADE_COOLDOWN,
+                initial_level=QualityLevel(
+                    self.pose_options["model_complexity"],
+                    (self.config.CAMERA_WIDTH, self.config.CAMERA_HEIGHT)
+                )
+            )
+        
         # Kamera
         self.camera = None
         self.is_camera_active = False
+        self.camera_probe: Optional[CameraProbe] = None
+        if self.config.CAMERA_PROBE_ENABLED:
+            self.camera_probe = CameraProbe(self.config.CAMERA_PROFILE_CACHE,
+                                            buffer_size=self.config.CAMERA_BUFFER_SIZE)
+        
+        # Arka planda kamera yakalama (en güncel frame yuvası)
+        self.frame_slot = LatestFrameSlot(stale_after=self.config.CAPTURE_STALE_FRAME_AGE)
+        self.capture_thread: Optional[FrameCaptureThread] = None
+        self.last_frame_timestamp: Optional[float] = None
         
-        # Postür geçmişi (smoothing için)
-        self.posture_history = []
+        # Frame yolu tamponları: yakalama halkası ve RGB/ölçek/çizim ara tamponları
+        self.frame_ring: Optional[FrameRing] = None
+        self.buffers = BufferPool()
+        
+        # Zamansal filtre (smoothing için)
+        self.smoothing_enabled = True
         self.history_size = 5
+        self.smoothing_filter = self.config.SMOOTHING_FILTER
+        self.metric_filter = create_filter(self.smoothing_filter, len(METRIC_NAMES), self.history_size)
+        self._metric_vector = np.zeros(len(METRIC_NAMES), dtype=np.float64)
+        
+        # Sabit sahnelerde çıkarımı atlayan hareket kapısı
+        self.motion_gate: Optional[MotionGate] = None
+        if self.config.MOTION_GATE_ENABLED:
+            self.motion_gate = MotionGate(
+                threshold=self.config.MOTION_GATE_THRESHOLD,
+                max_reuse_age=self.config.MOTION_GATE_MAX_REUSE_AGE
+            )
+        
+        # Landmark güdümlü ROI kırpma
+        self.roi_tracker: Optional[RoiTracker] = None
+        if self.config.ROI_TRACKING_ENABLED:
+            self.roi_tracker = RoiTracker(
+                padding=self.config.ROI_PADDING,
+                min_visibility=self.config.ROI_MIN_VISIBILITY,
+                inference_size=self.config.ROI_INFERENCE_SIZE
+            )
+        
+        # Aşama zamanlama histogramları (uygulama skor/kayıt/UI aşamalarını da buraya yazar)
+        self.profiler = PipelineProfiler(enabled=self.config.PROFILING_ENABLED)
+        
+        # Paylaşılan çıkarım sonucu ve sayaçlar
+        self.last_result: Optional[FrameResult] = None
+        self.frames_processed = 0
+        self.inference_count = 0
+        self.result_reuse_count = 0
         
         self.logger.info("PostureDetector başlatıldı")
     
-    def start_camera(self) -> bool:
-        """Kamerayı başlat"""
+    def start_camera(self, source: Optional[FrameSource] = None) -> bool:
+        """Kamerayı (veya verilen/config'teki frame kaynağını) başlat"""
         try:
-            self.camera = cv2.VideoCapture(self.config.CAMERA_INDEX)
+            self.camera = source if source is not None else create_frame_source(self.config)
             
             if not self.camera.isOpened():
                 self.logger.error("Kamera açılamadı")
                 return False
             
-            # Kamera ayarları
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.CAMERA_WIDTH)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.CAMERA_HEIGHT)
-            self.camera.set(cv2.CAP_PROP_FPS, self.config.CAMERA_FPS)
+            # Kamera ayarları: gerçek kamerada önbellekteki ya da yoklanan mod
+            if not self._configure_camera_mode():
+                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.CAMERA_WIDTH)
+                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.CAMERA_HEIGHT)
+                self.camera.set(cv2.CAP_PROP_FPS, self.config.CAMERA_FPS)
+            
+            # Önceki oturumun sonucunu ve yuvasını bırak
+            self._set_last_result(None)
+            
+            # Frame'ler önceden ayrılmış yuvalara okunur (worker modunda paylaşımlı bellek)
+            if self.config.USE_INFERENCE_WORKER:
+                self.frame_ring = self.start_inference_worker()
+            else:
+                self.frame_ring = FrameRing(self.config.CAPTURE_BUFFER_SLOTS, *self._camera_frame_shape())
+            
+            # Yakalama thread'ini başlat
+            self.frame_slot.clear()
+            self.capture_thread = FrameCaptureThread(self.camera, self.frame_slot, frame_ring=self.frame_ring)
+            self.capture_thread.start()
             
             self.is_camera_active = True
-            self.logger.info("Kamera başarıyla başlatıldı")
+            self.logger.info(f"Kamera başarıyla başlatıldı (kaynak: {self.camera.name})")
             return True
             
         except Exception as e:
             self.logger.error(f"Kamera başlatma hatası: {str(e)}")
             return False
     
+    def _configure_camera_mode(self) -> bool:
+        """Gerçek kamerada hedefi karşılayan en düşük maliyetli modu uygula"""
+        if self.camera_probe is None or not isinstance(self.camera, CameraSource):
+            return False
+        
+        mode = self.camera_probe.configure(
+            self.camera.capture, f"camera_{self.camera.index}",
+            self.config.CAMERA_WIDTH, self.config.CAMERA_HEIGHT, self.config.CAMERA_FPS
+        )
+        return mode is not None
+    
+    def _camera_frame_shape(self) -> Tuple[int, int, int]:
+        """Kameranın gerçekte verdiği frame boyutu (ayarlanamadıysa config değeri)"""
+        width = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)) or self.config.CAMERA_WIDTH
+        height = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)) or self.config.CAMERA_HEIGHT
+        return height, width, 3
+    
+    def start_inference_worker(self):
+        """Süreç dışı çıkarım worker'ını başlat (zaten çalışıyorsa dokunma)"""
+        if self.inference_worker is None:
+            self.inference_worker = InferenceWorkerClient(
+                frame_shape=self._camera_frame_shape(),
+                backend_name=self.backend_name,
+                backend_options=self.backend_options,
+                slots=self.config.INFERENCE_RING_SLOTS,
+                restart_delay=self.config.INFERENCE_WORKER_RESTART_DELAY,
+                roi_inference_size=self.config.ROI_INFERENCE_SIZE
+            )
+            self.inference_worker.start()
+        
+        return self.inference_worker.ring
+    
     def stop_camera(self):
         """Kamerayı durdur"""
         try:
+            # Önce yakalama thread'ini durdur, sonra kamerayı bırak
+            if self.capture_thread:
+                self.capture_thread.stop()
+                self.capture_thread = None
+            
             if self.camera and self.camera.isOpened():
                 self.camera.release()
                 self.is_camera_active = False
@@ -89,106 +229,77 @@ class PostureDetector:
         except Exception as e:
             self.logger.error(f"Kamera durdurma hatası: {str(e)}")
     
-    def get_frame(self) -> Optional[np.ndarray]:
-        """Kameradan bir frame al"""
+    def _grab_frame(self) -> Optional[CapturedFrame]:
+        """Yakalama yuvasındaki en güncel frame'i zaman bilgisiyle al"""
         if not self.is_camera_active or not self.camera:
             return None
         
-        ret, frame = self.camera.read()
-        if not ret:
+        captured = self.frame_slot.get()
+        if captured is None:
             self.logger.warning("Frame alınamadı")
             return None
         
-        return frame
+        self.last_frame_timestamp = captured.timestamp
+        return captured
+    
+    def get_frame(self) -> Optional[np.ndarray]:
+        """Yakalama yuvasındaki en güncel frame'i bekletmeden al
+        
+        Dönen dizi yakalama halkasının bir görünümüdür; saklanacaksa kopyalanmalıdır.
+        """
+        captured = self._grab_frame()
+        return captured.frame if captured else None
+    
+    def get_capture_stats(self) -> Dict[str, float]:
+        """Kamera yakalama sayaçlarını döndür (dropped/stale)"""
+        stats = self.frame_slot.get_stats()
+        stats["read_failures"] = self.capture_thread.read_failures if self.capture_thread else 0
+        return stats
     
     def extract_landmarks(self, results) -> Optional[PostureLandmarks]:
         """MediaPipe sonuçlarından gerekli landmark'ları çıkar"""
         if not results.pose_landmarks:
             return None
         
-        landmarks = results.pose_landmarks.landmark
-        
         try:
-            # Gerekli noktaları çıkar
-            posture_landmarks = PostureLandmarks(
-                nose=(
-                    landmarks[self.mp_pose.PoseLandmark.NOSE].x,
-                    landmarks[self.mp_pose.PoseLandmark.NOSE].y,
-                    landmarks[self.mp_pose.PoseLandmark.NOSE].z
-                ),
-                left_shoulder=(
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER].x,
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER].y,
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER].z
-                ),
-                right_shoulder=(
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER].x,
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER].y,
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER].z
-                ),
-                left_ear=(
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_EAR].x,
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_EAR].y,
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_EAR].z
-                ),
-                right_ear=(
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_EAR].x,
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_EAR].y,
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_EAR].z
-                ),
-                left_hip=(
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_HIP].x,
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_HIP].y,
-                    landmarks[self.mp_pose.PoseLandmark.LEFT_HIP].z
-                ),
-                right_hip=(
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP].x,
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP].y,
-                    landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP].z
-                )
-            )
-            
-            return posture_landmarks
-            
+            return PostureLandmarks.from_pose_array(landmark_list_to_array(results.pose_landmarks))
         except Exception as e:
             self.logger.error(f"Landmark çıkarma hatası: {str(e)}")
             return None
     
-    def calculate_angle(self, point1: Tuple[float, float], 
-                       point2: Tuple[float, float], 
-                       point3: Tuple[float, float]) -> float:
+    def landmarks_from_array(self, landmark_array: np.ndarray) -> PostureLandmarks:
+        """(33, 4) landmark dizisinden gerekli noktaları çıkar"""
+        return PostureLandmarks.from_pose_array(landmark_array)
+    
+    def calculate_angle(self, point1: Sequence[float], 
+                       point2: Sequence[float], 
+                       point3: Sequence[float]) -> float:
         """Üç nokta arasındaki açıyı hesapla"""
         # Vektörleri hesapla
-        vector1 = np.array([point1[0] - point2[0], point1[1] - point2[1]])
-        vector2 = np.array([point3[0] - point2[0], point3[1] - point2[1]])
+        vector1 = np.subtract(point1[:2], point2[:2], dtype=np.float64)
+        vector2 = np.subtract(point3[:2], point2[:2], dtype=np.float64)
         
         # Açıyı hesapla
         cosine_angle = np.dot(vector1, vector2) / (np.linalg.norm(vector1) * np.linalg.norm(vector2))
         angle = np.arccos(np.clip(cosine_angle, -1.0, 1.0))
         
-        return np.degrees(angle)
+        return float(np.degrees(angle))
     
-    def calculate_distance(self, point1: Tuple[float, float], 
-                          point2: Tuple[float, float]) -> float:
+    def calculate_distance(self, point1: Sequence[float], 
+                          point2: Sequence[float]) -> float:
         """İki nokta arasındaki mesafeyi hesapla"""
         return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
     
     def analyze_head_position(self, landmarks: PostureLandmarks) -> Dict[str, float]:
         """Kafa pozisyonunu analiz et"""
-        # Kulaklar ve burun orta noktası
-        ear_center = (
-            (landmarks.left_ear[0] + landmarks.right_ear[0]) / 2,
-            (landmarks.left_ear[1] + landmarks.right_ear[1]) / 2
-        )
+        data = landmarks.data
         
-        # Omuzlar orta noktası
-        shoulder_center = (
-            (landmarks.left_shoulder[0] + landmarks.right_shoulder[0]) / 2,
-            (landmarks.left_shoulder[1] + landmarks.right_shoulder[1]) / 2
-        )
+        # Kulaklar ve omuzlar orta noktası (x, y)
+        ear_center = (data[3, :2] + data[4, :2]) * 0.5
+        shoulder_center = (data[1, :2] + data[2, :2]) * 0.5
         
         # Kafa öne eğim açısı
-        head_forward_angle = abs(landmarks.nose[0] - ear_center[0]) * 100  # Normalized
+        head_forward_angle = float(abs(data[0, 0] - ear_center[0])) * 100  # Normalized
         
         # Boyun açısı
         neck_angle = self.calculate_angle(
@@ -204,32 +315,26 @@ class PostureDetector:
     
     def analyze_shoulder_position(self, landmarks: PostureLandmarks) -> Dict[str, float]:
         """Omuz pozisyonunu analiz et"""
+        data = landmarks.data
+        
         # Omuz eğimi
-        shoulder_slope = abs(landmarks.left_shoulder[1] - landmarks.right_shoulder[1]) * 100
+        shoulder_slope = float(abs(data[1, 1] - data[2, 1])) * 100
         
         # Omuz genişliği
-        shoulder_width = self.calculate_distance(
-            (landmarks.left_shoulder[0], landmarks.left_shoulder[1]),
-            (landmarks.right_shoulder[0], landmarks.right_shoulder[1])
-        )
+        shoulder_width = self.calculate_distance(data[1, :2], data[2, :2])
         
         return {
             "shoulder_slope": shoulder_slope,
-            "shoulder_width": shoulder_width
+            "shoulder_width": float(shoulder_width)
         }
     
     def analyze_back_posture(self, landmarks: PostureLandmarks) -> Dict[str, float]:
         """Sırt postürünü analiz et"""
-        # Omuz ve kalça orta noktaları
-        shoulder_center = (
-            (landmarks.left_shoulder[0] + landmarks.right_shoulder[0]) / 2,
-            (landmarks.left_shoulder[1] + landmarks.right_shoulder[1]) / 2
-        )
+        data = landmarks.data
         
-        hip_center = (
-            (landmarks.left_hip[0] + landmarks.right_hip[0]) / 2,
-            (landmarks.left_hip[1] + landmarks.right_hip[1]) / 2
-        )
+        # Omuz ve kalça orta noktaları (x, y)
+        shoulder_center = (data[1, :2] + data[2, :2]) * 0.5
+        hip_center = (data[5, :2] + data[6, :2]) * 0.5
         
         # Sırt düzlüğü (omuz-kalça hattının dikeye yakınlığı)
         back_angle = self.calculate_angle(
@@ -245,108 +350,396 @@ class PostureDetector:
             "back_angle": back_angle
         }
     
-    def smooth_posture_data(self, current_data: Dict[str, float]) -> Dict[str, float]:
+    def configure_smoothing(self, enabled: bool, history_size: int,
+                            filter_name: Optional[str] = None):
+        """Yumuşatma ayarlarını uygula (filtre durumu sıfırlanır)"""
+        self.smoothing_enabled = enabled
+        self.history_size = history_size
+        if filter_name:
+            self.smoothing_filter = filter_name
+        self.metric_filter = create_filter(self.smoothing_filter, len(METRIC_NAMES), self.history_size)
+        self.logger.info(
+            f"Yumuşatma ayarlandı: {'açık' if enabled else 'kapalı'}, "
+            f"filtre={self.metric_filter.name}, pencere={history_size}"
+        )
+    
+    def smooth_posture_data(self, current_data: Dict[str, float],
+                            timestamp: Optional[float] = None) -> Dict[str, float]:
         """Postür verilerini yumuşat (noise reduction)"""
-        self.posture_history.append(current_data)
+        if not self.smoothing_enabled:
+            return dict(current_data)
         
-        # Geçmiş boyutunu sınırla
-        if len(self.posture_history) > self.history_size:
-            self.posture_history.pop(0)
+        if timestamp is None:
+            timestamp = time.monotonic()
         
-        # Ortalama hesapla
-        if len(self.posture_history) == 1:
-            return current_data
+        # Metrik vektörünü filtreden geçir
+        vector = self._metric_vector
+        for i, key in enumerate(METRIC_NAMES):
+            vector[i] = current_data.get(key, 0.0)
+        smoothed = self.metric_filter.update(vector, timestamp)
         
-        smoothed_data = {}
-        for key in current_data.keys():
-            values = [data[key] for data in self.posture_history if key in data]
-            smoothed_data[key] = sum(values) / len(values)
+        smoothed_data = dict(current_data)
+        for i, key in enumerate(METRIC_NAMES):
+            smoothed_data[key] = float(smoothed[i])
         
         return smoothed_data
     
-    def analyze_posture(self) -> Optional[Dict[str, float]]:
-        """Ana postür analizi fonksiyonu"""
+    def _compute_metrics(self, landmarks: PostureLandmarks,
+                         timestamp: Optional[float] = None) -> Dict[str, float]:
+        """Landmark'lardan yumuşatılmış postür metriklerini hesapla"""
+        # Kafa, omuz ve sırt analizleri (toplu çekirdek, N=1)
+        stage_start = time.perf_counter_ns()
+        posture_data = compute_frame_metrics(landmarks.data)
+        stage_start = self.profiler.record("metrics", stage_start)
+        
+        # Verileri yumuşat
+        smoothed_data = self.smooth_posture_data(posture_data, timestamp)
+        self.profiler.record("smoothing", stage_start)
+        
+        # Timestamp ekle
+        smoothed_data['timestamp'] = cv2.getTickCount() / cv2.getTickFrequency()
+        smoothed_data['frame_available'] = True
+        
+        return smoothed_data
+    
+    def process_frame(self, annotate: bool = False) -> Optional[FrameResult]:
+        """En güncel frame'i bir kez işle ve sonucu tüm tüketicilerle paylaş
+        
+        Aynı frame için tekrar çağrılırsa çıkarım yapılmaz, önceki sonuç
+        döndürülür (gerekirse sadece çizim eklenir). Önceki sonuç sadece
+        postür noktalarıyla üretildiyse çizim için frame full=True ile
+        yeniden işlenir.
+        """
         if not self.is_camera_active:
             return None
         
-        # Frame al
-        frame = self.get_frame()
-        if frame is None:
+        if self.inference_worker is not None:
+            return self._process_frame_with_worker(annotate)
+        
+        stage_start = time.perf_counter_ns()
+        captured = self._grab_frame()
+        stage_start = self.profiler.record("capture", stage_start)
+        if captured is None:
             return None
         
+        # Çizim isteniyorsa sadece postür noktaları okunmuş sonuç yeniden kullanılmaz
+        partial = annotate and self.last_result is not None and not self.last_result.full_landmarks
+        
+        # Bu frame zaten işlendiyse sonucu yeniden kullan
+        if (self.last_result is not None and self.last_result.sequence == captured.sequence and
+                not partial):
+            self.result_reuse_count += 1
+            if annotate:
+                self.annotate_result(self.last_result)
+            return self.last_result
+        
+        # Sahne değişmediyse önceki landmark ve metrikleri kullan
+        if not self._motion_requires_inference(captured) and not partial:
+            result = self._reuse_last_result(captured)
+            if annotate:
+                self.annotate_result(result)
+            return result
+        
+        # Frame sonuç yaşadıkça yakalama halkasında kilitli kalır (kopyasız paylaşım)
+        if not self._retain_frame(captured):
+            return self.last_result
+        
+        self.frames_processed += 1
+        result = FrameResult(
+            frame=captured.frame,
+            timestamp=captured.timestamp,
+            sequence=captured.sequence,
+            slot_index=captured.slot_index
+        )
+        
         try:
-            # BGR'yi RGB'ye çevir
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # MediaPipe ile pose tespiti
-            results = self.pose.process(rgb_frame)
-            
-            # Landmark'ları çıkar
-            landmarks = self.extract_landmarks(results)
-            if landmarks is None:
-                return None
+            # Takip varsa sadece ilgi bölgesini kullan
+            input_frame, roi = captured.frame, None
+            if self.roi_tracker:
+                input_frame, roi = self.roi_tracker.prepare(captured.frame)
             
-            # Postür analizleri
-            head_data = self.analyze_head_position(landmarks)
-            shoulder_data = self.analyze_shoulder_position(landmarks)
-            back_data = self.analyze_back_posture(landmarks)
+            # Tam frame'i bütçenin izin verdiği çözünürlüğe indir (koordinatlar normalize)
+            if roi is None:
+                input_frame = self._scale_to_inference_resolution(input_frame)
             
-            # Tüm verileri birleştir
-            posture_data = {**head_data, **shoulder_data, **back_data}
+            # BGR'yi RGB'ye çevir (önceden ayrılmış tampona)
+            stage_start = time.perf_counter_ns()
+            rgb_frame = cv2.cvtColor(input_frame, cv2.COLOR_BGR2RGB,
+                                     dst=self.buffers.get("rgb", input_frame.shape))
+            stage_start = self.profiler.record("color_conversion", stage_start)
             
-            # Verileri yumuşat
-            smoothed_data = self.smooth_posture_data(posture_data)
+            # Backend ile pose tespiti (frame başına tek çıkarım, (33, 4) dizi); tüm
+            # noktalar sadece çizim ya da ham landmark kaydı için okunur
+            result.full_landmarks = annotate or self.config.LANDMARK_RECORDING_ENABLED
+            landmark_array = self.backend.infer(rgb_frame, full=result.full_landmarks)
+            inference_start, stage_start = stage_start, self.profiler.record("inference", stage_start)
+            self.inference_count += 1
+            self._record_inference_latency((stage_start - inference_start) / 1e9)
             
-            # Timestamp ekle
-            smoothed_data['timestamp'] = cv2.getTickCount() / cv2.getTickFrequency()
-            smoothed_data['frame_available'] = True
+            # ROI koordinatlarını tam frame'e taşı, gerekli 7 noktayı tek gather ile çıkar
+            if landmark_array is not None:
+                if roi is not None:
+                    map_landmarks_to_full(landmark_array, roi, captured.frame.shape)
+                result.landmark_array = landmark_array
+                result.landmarks = PostureLandmarks.from_pose_array(landmark_array)
+            if self.roi_tracker:
+                self.roi_tracker.update(result.landmark_array, captured.frame.shape)
+            self.profiler.record("landmark_extraction", stage_start)
             
-            return smoothed_data
+            if result.landmarks is not None:
+                result.metrics = self._compute_metrics(result.landmarks, result.timestamp)
             
         except Exception as e:
             self.logger.error(f"Postür analizi hatası: {str(e)}")
-            return None
+        
+        self._set_last_result(result)
+        
+        if annotate:
+            self.annotate_result(result)
+        
+        return result
     
-    def get_annotated_frame(self) -> Optional[np.ndarray]:
-        """Postür çizgileri eklenmiş frame döndür"""
-        if not self.is_camera_active:
-            return None
+    def _scale_to_inference_resolution(self, frame: np.ndarray) -> np.ndarray:
+        """Frame'i seçili çıkarım çözünürlüğüne küçült (büyütme yapılmaz)"""
+        if self.inference_resolution is None:
+            return frame
+        width, height = self.inference_resolution
+        if frame.shape[1] <= width and frame.shape[0] <= height:
+            return frame
+        return cv2.resize(frame, (width, height), dst=self.buffers.get("scaled", (height, width, 3)),
+                          interpolation=cv2.INTER_AREA)
+    
+    def _record_inference_latency(self, seconds: float):
+        """Gecikmeyi denetleyiciye bildir, basamak değiştiyse uygula"""
+        if self.latency_controller is None:
+            return
+        level = self.latency_controller.record(seconds * 1000)
+        while level is not None and not self.apply_quality_level(level):
+            level = self.latency_controller.cap_level()
+    
+    def apply_quality_level(self, level: QualityLevel) -> bool:
+        """Model karmaşıklığını ve çıkarım çözünürlüğünü uygula"""
+        camera_resolution = (self.config.CAMERA_WIDTH, self.config.CAMERA_HEIGHT)
+        self.inference_resolution = None if level.resolution == camera_resolution else level.resolution
         
-        frame = self.get_frame()
-        if frame is None:
-            return None
+        # Karmaşıklık sadece MediaPipe backend'inde anlamlıdır
+        if (self.backend_name != MediaPipeBackend.name or
+                level.model_complexity == self.pose_options["model_complexity"]):
+            return True
         
         try:
-            # BGR'yi RGB'ye çevir
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # MediaPipe ile pose tespiti
-            results = self.pose.process(rgb_frame)
+            options = dict(self.backend_options, model_complexity=level.model_complexity)
+            backend = create_backend(self.backend_name, options)
+            backend.load()
+        except Exception as e:
+            self.logger.error(f"model_complexity={level.model_complexity} yüklenemedi: {str(e)}")
+            return False
+        
+        self.backend.close()
+        self.backend = backend
+        self.backend_options = options
+        self.pose_options["model_complexity"] = level.model_complexity
+        return True
+    
+    def _process_frame_with_worker(self, annotate: bool) -> Optional[FrameResult]:
+        """Worker modunda sonuçları topla ve yeni frame gönder (bloklamadan)"""
+        worker = self.inference_worker
+        worker.ensure_alive()
+        
+        # Tamamlanan çıkarımları işle
+        for output in worker.poll():
+            self.profiler.record_duration("inference", int(output.inference_time * 1e9))
+            self._apply_worker_output(output)
+        
+        # En güncel frame'i worker boştaysa gönder (sahne değiştiyse)
+        stage_start = time.perf_counter_ns()
+        captured = self._grab_frame()
+        self.profiler.record("capture", stage_start)
+        if captured is not None and captured.sequence != self.last_result_sequence():
+            if self._motion_requires_inference(captured):
+                roi = self.roi_tracker.next_roi(captured.frame.shape) if self.roi_tracker else None
+                if not worker.submit(captured, roi) and self.motion_gate:
+                    # Gönderilemeyen frame referans sayılmasın
+                    self.motion_gate.reset()
+            else:
+                self._reuse_last_result(captured)
+        
+        if self.last_result is not None and annotate:
+            self.annotate_result(self.last_result)
+        
+        return self.last_result
+    
+    def last_result_sequence(self) -> Optional[int]:
+        """Son sonucun frame sıra numarası"""
+        return self.last_result.sequence if self.last_result else None
+    
+    def _motion_requires_inference(self, captured: CapturedFrame) -> bool:
+        """Hareket kapısına göre bu frame için çıkarım gerekli mi"""
+        if self.motion_gate is None:
+            return True
+        
+        # Takip edilen kişi yoksa her frame analiz edilir
+        if self.last_result is None or self.last_result.landmarks is None:
+            self.motion_gate.reset()
+            return True
+        
+        return self.motion_gate.should_infer(captured.frame, captured.timestamp)
+    
+    def _retain_frame(self, captured: CapturedFrame) -> bool:
+        """Frame'in yakalama yuvasını kilitle; bu arada üzerine yazıldıysa False"""
+        if captured.slot_index is None or self.frame_ring is None:
+            return True
+        return self.frame_ring.pin(captured.slot_index, captured.sequence)
+    
+    def _set_last_result(self, result: Optional[FrameResult]):
+        """Son sonucu değiştir ve öncekinin yakalama yuvası kilidini bırak
+        
+        Yuvası olan her sonuç kendi kilidini tutar (aynı yuvayı paylaşsalar
+        bile); bu yüzden önceki sonucun kilidi her zaman bırakılır.
+        """
+        previous = self.last_result
+        self.last_result = result
+        if (previous is not None and previous is not result and previous.slot_index is not None and
+                self.frame_ring is not None):
+            self.frame_ring.unpin(previous.slot_index)
+    
+    def _reuse_last_result(self, captured: CapturedFrame) -> FrameResult:
+        """Önceki çıkarımın landmark ve metriklerini yeni frame ile eşleştir"""
+        previous = self.last_result
+        metrics = dict(previous.metrics) if previous.metrics else None
+        if metrics is not None:
+            metrics['timestamp'] = cv2.getTickCount() / cv2.getTickFrequency()
+        
+        result = FrameResult(
+            frame=captured.frame,
+            timestamp=captured.timestamp,
+            sequence=captured.sequence,
+            pose_landmarks=previous.pose_landmarks,
+            landmarks=previous.landmarks,
+            metrics=metrics,
+            landmark_array=previous.landmark_array,
+            full_landmarks=previous.full_landmarks
+        )
+        if captured.slot_index is not None and self._retain_frame(captured):
+            result.slot_index = captured.slot_index
+        self._set_last_result(result)
+        return result
+    
+    def _apply_worker_output(self, output: InferenceOutput):
+        """Worker çıktısından FrameResult oluştur"""
+        self.frames_processed += 1
+        self.inference_count += 1
+        
+        result = FrameResult(
+            frame=self.inference_worker.ring.view(output.slot_index),
+            timestamp=output.timestamp,
+            sequence=output.sequence,
+            slot_index=output.slot_index,
+            landmark_array=output.landmarks
+        )
+        
+        if self.roi_tracker:
+            self.roi_tracker.update(output.landmarks, result.frame.shape)
+        
+        try:
+            if output.landmarks is not None:
+                result.landmarks = self.landmarks_from_array(output.landmarks)
+                result.metrics = self._compute_metrics(result.landmarks, result.timestamp)
+        except Exception as e:
+            self.logger.error(f"Postür analizi hatası: {str(e)}")
+        
+        # Önceki sonucun yuvasını serbest bırak; yenisi gösterim için kilitli kalır
+        self._set_last_result(result)
+    
+    def annotate_result(self, result: FrameResult) -> np.ndarray:
+        """Sonuca pose çizgilerini ekle (çıkarım yapmadan, bir kez)"""
+        if result.annotated_frame is not None:
+            return result.annotated_frame
+        
+        try:
+            # Çizim, son iki sonuç arasında dönen önceden ayrılmış tampona yapılır
+            annotated_frame = self.buffers.get("annotated", result.frame.shape, depth=2)
+            np.copyto(annotated_frame, result.frame)
             
-            # RGB'yi tekrar BGR'ye çevir (OpenCV için)
-            annotated_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+            # Çizim listesini landmark dizisinden oluştur (kısmi dizi yanlış iskelet çizer)
+            if (result.pose_landmarks is None and result.landmark_array is not None and
+                    result.full_landmarks):
+                from mediapipe.framework.formats import landmark_pb2
+                result.pose_landmarks = landmark_pb2.NormalizedLandmarkList(landmark=[
+                    landmark_pb2.NormalizedLandmark(x=x, y=y, z=z, visibility=v)
+                    for x, y, z, v in result.landmark_array.tolist()
+                ])
             
             # Pose çizgilerini ekle
-            if results.pose_landmarks:
+            if result.pose_landmarks:
                 self.mp_drawing.draw_landmarks(
                     annotated_frame,
-                    results.pose_landmarks,
+                    result.pose_landmarks,
                     self.mp_pose.POSE_CONNECTIONS,
                     landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
                 )
             
-            return annotated_frame
+            result.annotated_frame = annotated_frame
             
         except Exception as e:
             self.logger.error(f"Frame annotation hatası: {str(e)}")
-            return frame
+            result.annotated_frame = result.frame
+        
+        return result.annotated_frame
+    
+    def analyze_posture(self) -> Optional[Dict[str, float]]:
+        """Ana postür analizi fonksiyonu"""
+        result = self.process_frame()
+        return result.metrics if result else None
+    
+    def get_annotated_frame(self) -> Optional[np.ndarray]:
+        """Postür çizgileri eklenmiş frame döndür"""
+        result = self.process_frame(annotate=True)
+        return result.annotated_frame if result else None
+    
+    def get_pipeline_stats(self) -> Dict[str, float]:
+        """Çıkarım sayaçlarını döndür
+        
+        inferences_per_frame her zaman 1.0 olmalıdır: her yakalanan ve
+        işlenen frame için tam olarak bir pose çıkarımı yapılır.
+        """
+        stats = {
+            "frames_processed": self.frames_processed,
+            "inference_count": self.inference_count,
+            "result_reuse_count": self.result_reuse_count,
+            "inferences_per_frame": (
+                self.inference_count / self.frames_processed if self.frames_processed > 0 else 0.0
+            )
+        }
+        if self.motion_gate:
+            stats.update({f"motion_gate_{key}": value for key, value in self.motion_gate.get_stats().items()})
+        if self.roi_tracker:
+            stats.update({f"roi_{key}": value for key, value in self.roi_tracker.get_stats().items()})
+        if self.backend:
+            stats.update({f"backend_{key}": value for key, value in self.backend.get_stats().items()})
+        if self.latency_controller:
+            stats.update({f"latency_{key}": value for key, value in self.latency_controller.get_stats().items()})
+        return stats
+    
+    def get_timing_stats(self) -> Dict[str, Dict[str, float]]:
+        """Aşama başına p50/p95/p99 süreleri (ms)"""
+        return self.profiler.snapshot()
     
     def cleanup(self):
         """Kaynakları temizle"""
         try:
             self.stop_camera()
-            if self.pose:
-                self.pose.close()
+            if self.backend:
+                self.backend.close()
+                self.backend = None
+            # Yakalama halkasına işaret eden referansları bırak
+            self.last_result = None
+            self.frame_slot.clear()
+            self.frame_ring = None
+            self.buffers.clear()
+            if self.inference_worker:
+                self.inference_worker.stop()
+                self.inference_worker = None
             self.logger.info("PostureDetector kaynakları temizlendi")
         except Exception as e:
             self.logger.error(f"Cleanup hatası: {str(e)}")
@@ -0,0 +1,168 @@
+"""
+PostureFix - Toplu Postür Metrik Çekirdeği
+Kafa, omuz ve sırt analizlerini (N, 7, 3) landmark dizisi üzerinde
+saf NumPy yayınlamasıyla hesaplar
+"""
+
+import time
+from typing import Dict
+
+import numpy as np
+
+# PostureLandmarks satır sırası (core.landmarks ile aynı)
+NOSE, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_EAR, RIGHT_EAR, LEFT_HIP, RIGHT_HIP = range(7)
+
+METRIC_NAMES = (
+    "head_forward_angle",
+    "neck_angle",
+    "shoulder_slope",
+    "shoulder_width",
+    "back_straightness",
+    "back_angle"
+)
+
+# Skorlama kuralları: (metrik, eşik, ceza); skor 1.0'dan başlar, 0'ın altına inmez
+SCORE_RULES = (
+    ("head_forward_angle", 15, 0.3),  # Kafa öne eğimi
+    ("shoulder_slope", 10, 0.2),      # Omuz eğimi
+    ("neck_angle", 20, 0.3),          # Boyun açısı
+    ("back_straightness", 15, 0.2)    # Sırt düzlüğü
+)
+
+
+def _vertical_angle(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """Vektör ile aşağı yönlü dikey (0, +y) arasındaki açı (derece)
+
+    calculate_angle(p1, p2, (p2.x, p2.y + 0.1)) ile aynıdır: dikey referans
+    vektörüyle iç çarpım sadece y bileşenine indirgenir.
+    """
+    cosine = dy / np.hypot(dx, dy)
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def compute_posture_metrics(landmarks: np.ndarray) -> Dict[str, np.ndarray]:
+    """(N, 7, 3+) landmark dizisinden altı postür metriğini (N,) diziler olarak hesapla
+
+    Satır sırası: burun, sol omuz, sağ omuz, sol kulak, sağ kulak, sol kalça,
+    sağ kalça. Sadece x ve y sütunları kullanılır. Hesap, girdi float32 ise
+    float32'de, aksi halde float64'te yapılır.
+    """
+    points = np.asarray(landmarks)
+    if points.ndim != 3 or points.shape[1] != 7:
+        raise ValueError(f"(N, 7, 3) landmark dizisi bekleniyor, gelen: {points.shape}")
+
+    dtype = np.result_type(points.dtype, np.float32)
+    x = points[:, :, 0].astype(dtype, copy=False)
+    y = points[:, :, 1].astype(dtype, copy=False)
+
+    # Orta noktalar
+    ear_x = (x[:, LEFT_EAR] + x[:, RIGHT_EAR]) * 0.5
+    ear_y = (y[:, LEFT_EAR] + y[:, RIGHT_EAR]) * 0.5
+    shoulder_x = (x[:, LEFT_SHOULDER] + x[:, RIGHT_SHOULDER]) * 0.5
+    shoulder_y = (y[:, LEFT_SHOULDER] + y[:, RIGHT_SHOULDER]) * 0.5
+    hip_x = (x[:, LEFT_HIP] + x[:, RIGHT_HIP]) * 0.5
+    hip_y = (y[:, LEFT_HIP] + y[:, RIGHT_HIP]) * 0.5
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Kafa
+        head_forward_angle = np.abs(x[:, NOSE] - ear_x) * 100
+        neck_angle = np.abs(_vertical_angle(ear_x - shoulder_x, ear_y - shoulder_y) - 90)
+
+        # Omuzlar
+        shoulder_dx = x[:, LEFT_SHOULDER] - x[:, RIGHT_SHOULDER]
+        shoulder_dy = y[:, LEFT_SHOULDER] - y[:, RIGHT_SHOULDER]
+        shoulder_slope = np.abs(shoulder_dy) * 100
+        shoulder_width = np.hypot(shoulder_dx, shoulder_dy)
+
+        # Sırt
+        back_angle = _vertical_angle(shoulder_x - hip_x, shoulder_y - hip_y)
+        back_straightness = np.abs(back_angle - 90)
+
+    return {
+        "head_forward_angle": head_forward_angle,
+        "neck_angle": neck_angle,
+        "shoulder_slope": shoulder_slope,
+        "shoulder_width": shoulder_width,
+        "back_straightness": back_straightness,
+        "back_angle": back_angle
+    }
+
+
+def compute_frame_metrics(landmarks: np.ndarray) -> Dict[str, float]:
+    """Tek frame (7, 3+) için metrikleri Python float olarak hesapla (N=1)"""
+    batch = compute_posture_metrics(np.asarray(landmarks, dtype=np.float64)[np.newaxis])
+    return {name: float(values[0]) for name, values in batch.items()}
+
+
+def score_posture_data(posture_data: Dict[str, float]) -> float:
+    """Tek frame'in postür skorunu hesapla (0-1 arası)"""
+    score = 1.0
+    for name, threshold, penalty in SCORE_RULES:
+        if posture_data.get(name, 0) > threshold:
+            score -= penalty
+    return max(0.0, score)
+
+
+def compute_posture_scores(metrics: Dict[str, np.ndarray]) -> np.ndarray:
+    """Toplu metriklerden (N,) postür skorlarını hesapla"""
+    scores = np.ones_like(next(iter(metrics.values())), dtype=np.float64)
+    for name, threshold, penalty in SCORE_RULES:
+        scores -= np.where(metrics[name] > threshold, penalty, 0.0)
+    return np.maximum(scores, 0.0)
+
+
+def test_equivalence(samples: int = 10000, tolerance: float = 1e-6, seed: int = 0) -> float:
+    """Çekirdeği PostureDetector'ın skaler analiz metotlarıyla karşılaştır
+
+    En büyük mutlak farkı döndürür; tolerans aşılırsa AssertionError verir.
+    """
+    from core.landmarks import PostureLandmarks
+    from core.posture_detector import PostureDetector
+
+    # Skaler metotlar sadece yardımcı fonksiyonları kullanır; model kurmaya gerek yok
+    class ScalarReference:
+        calculate_angle = PostureDetector.calculate_angle
+        calculate_distance = PostureDetector.calculate_distance
+        analyze_head_position = PostureDetector.analyze_head_position
+        analyze_shoulder_position = PostureDetector.analyze_shoulder_position
+        analyze_back_posture = PostureDetector.analyze_back_posture
+
+    detector = ScalarReference()
+
+    rng = np.random.default_rng(seed)
+    points = rng.random((samples, 7, 4))
+    batch = compute_posture_metrics(points)
+
+    max_diff = 0.0
+    for i in range(samples):
+        landmarks = PostureLandmarks(points[i])
+        scalar = {
+            **detector.analyze_head_position(landmarks),
+            **detector.analyze_shoulder_position(landmarks),
+            **detector.analyze_back_posture(landmarks)
+        }
+        for name in METRIC_NAMES:
+            diff = abs(scalar[name] - batch[name][i])
+            max_diff = max(max_diff, diff)
+            assert diff <= tolerance, f"{name} uyuşmuyor (örnek {i}): {scalar[name]} != {batch[name][i]}"
+
+    return max_diff
+
+
+def benchmark(frames: int = 1_000_000, dtype=np.float32, repeats: int = 3) -> float:
+    """Toplu çekirdeğin saniyede işlediği frame sayısını ölç"""
+    rng = np.random.default_rng(0)
+    points = rng.random((frames, 7, 3)).astype(dtype)
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        compute_posture_metrics(points)
+        best = min(best, time.perf_counter() - start)
+
+    return frames / best
+
+
+if __name__ == "__main__":
+    print(f"Skaler eşdeğerlik: en büyük fark {test_equivalence():.2e}")
+    print(f"Toplu çekirdek: {benchmark():,.0f} frame/s")
@@ -0,0 +1,195 @@
+"""
+PostureFix - İlgi Bölgesi (ROI) Takip Modülü
+Önceki frame'in landmark'larından dolgulu bir kutu türetir, çıkarımı
+sadece bu bölge üzerinde yapar ve sonuçları tam frame'e geri taşır
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.frame_buffers import BufferPool
+from core.landmarks import POSTURE_LANDMARK_INDEX, VISIBILITY
+
+# Takip için mutlaka görünmesi gereken noktalar: burun ve omuzlar
+REQUIRED_LANDMARK_INDICES = (0, 11, 12)
+
+Roi = Tuple[int, int, int, int]  # x0, y0, x1, y1 (piksel, x1/y1 hariç)
+
+
+def map_landmarks_to_full(points: np.ndarray, roi: Roi, frame_shape: Tuple[int, ...]) -> np.ndarray:
+    """ROI'ye göre normalize edilmiş noktaları tam frame koordinatlarına çevir (yerinde)
+
+    points: (N, 3+) dizi; x, y, z sütunları güncellenir, görünürlük olduğu gibi kalır.
+    """
+    height, width = frame_shape[:2]
+    x0, y0, x1, y1 = roi
+    scale_x = (x1 - x0) / width
+    scale_y = (y1 - y0) / height
+
+    points[:, 0] = points[:, 0] * scale_x + x0 / width
+    points[:, 1] = points[:, 1] * scale_y + y0 / height
+    points[:, 2] = points[:, 2] * scale_x  # z, x ile aynı ölçekte
+    return points
+
+
+def map_landmark_list_to_full(landmark_list, roi: Roi, frame_shape: Tuple[int, ...]):
+    """MediaPipe NormalizedLandmarkList'i tam frame koordinatlarına çevir (yerinde)"""
+    height, width = frame_shape[:2]
+    x0, y0, x1, y1 = roi
+    scale_x = (x1 - x0) / width
+    scale_y = (y1 - y0) / height
+    offset_x = x0 / width
+    offset_y = y0 / height
+
+    for landmark in landmark_list.landmark:
+        landmark.x = landmark.x * scale_x + offset_x
+        landmark.y = landmark.y * scale_y + offset_y
+        landmark.z = landmark.z * scale_x
+    return landmark_list
+
+
+def inference_input_size(width: int, height: int, inference_size: int) -> Tuple[int, int]:
+    """Kırpılan bölgenin çıkarıma girecek boyutu (uzun kenar en fazla inference_size)"""
+    scale = inference_size / max(width, height)
+    if scale >= 1.0:
+        return width, height
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def crop_for_inference(frame: np.ndarray, roi: Optional[Roi], inference_size: int,
+                       buffers: Optional[BufferPool] = None) -> np.ndarray:
+    """ROI'yi kırp (kopyasız dilim) ve gerekiyorsa küçült (varsa havuz tamponuna)"""
+    if roi is None:
+        return frame
+
+    x0, y0, x1, y1 = roi
+    crop = frame[y0:y1, x0:x1]
+    size = inference_input_size(x1 - x0, y1 - y0, inference_size)
+    if size != (x1 - x0, y1 - y0):
+        dst = buffers.get("roi", (size[1], size[0]) + frame.shape[2:]) if buffers is not None else None
+        crop = cv2.resize(crop, size, dst=dst, interpolation=cv2.INTER_AREA)
+    return crop
+
+
+class RoiTracker:
+    """Landmark güdümlü ROI takipçisi
+
+    Kutu, kişi içinde kaldığı sürece sabit tutulur (histerezis); böylece
+    MediaPipe'ın kendi zamansal takibi her frame'de yeniden başlamaz.
+    Takip kaybolduğunda bir sonraki frame tam çözünürlükte analiz edilir.
+    """
+
+    def __init__(self, padding: float = 0.5, min_visibility: float = 0.5,
+                 inference_size: int = 256, min_roi_size: int = 96):
+        self.logger = logging.getLogger(__name__)
+        self.padding = padding                # Kutu boyutuna oranla dolgu
+        self.min_visibility = min_visibility
+        self.inference_size = inference_size  # Kırpılan bölgenin uzun kenarı
+        self.min_roi_size = min_roi_size      # piksel
+
+        self.roi: Optional[Roi] = None
+        self.buffers = BufferPool()  # Küçültülmüş ROI tamponu
+
+        # Sayaçlar
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.tracking_lost = 0
+        self.roi_updates = 0
+        self.last_pixels = 0
+        self.total_pixels = 0
+
+    def next_roi(self, frame_shape: Tuple[int, ...]) -> Optional[Roi]:
+        """Bir sonraki çıkarım için kullanılacak ROI (None: tam frame)"""
+        if self.roi is None:
+            self.full_frames += 1
+            self._count_pixels(frame_shape[0] * frame_shape[1])
+            return None
+
+        x0, y0, x1, y1 = self.roi
+        width, height = inference_input_size(x1 - x0, y1 - y0, self.inference_size)
+        self.roi_frames += 1
+        self._count_pixels(width * height)
+        return self.roi
+
+    def prepare(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[Roi]]:
+        """Çıkarım girdisini hazırla: ROI varsa kırp ve küçült, yoksa tam frame"""
+        roi = self.next_roi(frame.shape)
+        return crop_for_inference(frame, roi, self.inference_size, self.buffers), roi
+
+    def update(self, points: Optional[np.ndarray], frame_shape: Tuple[int, ...]):
+        """Tam frame koordinatlarındaki landmark'larla ROI'yi güncelle
+
+        points: (33, 4) dizi (x, y, z, visibility) ya da takip yoksa None.
+        """
+        if points is None or not self._is_tracked(points):
+            if self.roi is not None:
+                self.tracking_lost += 1
+                self.logger.debug("ROI takibi kayboldu, tam frame'e dönülüyor")
+            self.roi = None
+            return
+
+        height, width = frame_shape[:2]
+        indices = POSTURE_LANDMARK_INDEX[points[POSTURE_LANDMARK_INDEX, VISIBILITY] >= self.min_visibility]
+        xs = np.clip(points[indices, 0], 0.0, 1.0) * width
+        ys = np.clip(points[indices, 1], 0.0, 1.0) * height
+        tight = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+
+        # Mevcut kutu kişiyi rahatça içeriyorsa değiştirme
+        if self.roi is not None and self._contains(self.roi, tight):
+            return
+
+        self.roi = self._padded_box(tight, width, height)
+        self.roi_updates += 1
+
+    def reset(self):
+        """Takibi sıfırla"""
+        self.roi = None
+
+    def _is_tracked(self, points: np.ndarray) -> bool:
+        return bool(np.all(points[list(REQUIRED_LANDMARK_INDICES), VISIBILITY] >= self.min_visibility))
+
+    def _contains(self, roi: Roi, tight: Tuple[float, float, float, float]) -> bool:
+        """Sıkı kutu, ROI'nin iç bölgesinde mi ve ROI hâlâ uygun boyutta mı"""
+        x0, y0, x1, y1 = roi
+        roi_size = max(x1 - x0, y1 - y0)
+        margin = roi_size * self.padding / (2 * (1 + self.padding))
+        tx0, ty0, tx1, ty1 = tight
+
+        inside = (tx0 >= x0 + margin / 2 and ty0 >= y0 + margin / 2 and
+                  tx1 <= x1 - margin / 2 and ty1 <= y1 - margin / 2)
+
+        # Kişi çok küçüldüyse (uzaklaştıysa) kutuyu daralt
+        tight_size = max(tx1 - tx0, ty1 - ty0) * (1 + self.padding)
+        return inside and tight_size >= roi_size * 0.6
+
+    def _padded_box(self, tight: Tuple[float, float, float, float], width: int, height: int) -> Roi:
+        """Sıkı kutudan dolgulu kare bir ROI üret"""
+        tx0, ty0, tx1, ty1 = tight
+        size = max(tx1 - tx0, ty1 - ty0, self.min_roi_size) * (1 + self.padding)
+        size = min(size, width, height)
+        center_x = (tx0 + tx1) / 2
+        center_y = (ty0 + ty1) / 2
+
+        x0 = int(np.clip(center_x - size / 2, 0, width - size))
+        y0 = int(np.clip(center_y - size / 2, 0, height - size))
+        return (x0, y0, int(x0 + size), int(y0 + size))
+
+    def _count_pixels(self, pixels: int):
+        self.last_pixels = pixels
+        self.total_pixels += pixels
+
+    def get_stats(self) -> Dict[str, float]:
+        """ROI kullanım ve frame başına işlenen piksel istatistikleri"""
+        frames = self.roi_frames + self.full_frames
+        return {
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "tracking_lost": self.tracking_lost,
+            "roi_updates": self.roi_updates,
+            "pixels_last": self.last_pixels,
+            "pixels_per_frame": self.total_pixels / frames if frames else 0.0,
+            "roi": self.roi
+        }
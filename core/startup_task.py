@@ -0,0 +1,111 @@
+"""
+PostureFix - Arka Plan Başlatma Modülü
+Pose modelinin kurulması, boş frame ile ısınma çıkarımı ve kamera açılışı
+arka plan thread'inde yapılır; ana pencere beklemeden çizilir ve ilerleme
+sinyallerle bildirilir
+"""
+
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class DetectorStartupTask(QObject):
+    """PostureDetector'ı GUI thread'ini bloklamadan hazırlayan görev
+
+    Model kurulumu ve ısınma bir kez, uygulama açılışında yapılır;
+    kamera açılışı her izleme başlatıldığında aynı thread'de çalışır.
+    Adım süreleri ve açılıştan ilk analiz edilen frame'e kadar geçen
+    süre (time-to-first-analyzed-frame) ölçülür.
+    """
+
+    progress = pyqtSignal(str, int)   # mesaj, yüzde
+    detector_ready = pyqtSignal(object)
+    camera_ready = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+
+    def __init__(self, detector_factory: Callable[[], object], started_at: Optional[float] = None,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.detector_factory = detector_factory
+        self.detector = None
+        self.started_at = started_at if started_at is not None else time.monotonic()  # uygulama açılışı
+        self.timings: Dict[str, float] = {}  # adım -> saniye
+        self.first_frame_latency: Optional[float] = None
+        self._camera_requested_at: Optional[float] = None
+        self._future: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="posture-startup")
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(self):
+        """Model kurulumu ve ısınmayı arka planda başlat"""
+        self._future = self._executor.submit(self._prepare_detector)
+
+    def open_camera(self):
+        """Kamerayı arka planda aç (model hazır değilse ondan sonra sıraya girer)"""
+        self._camera_requested_at = time.monotonic()
+        self.first_frame_latency = None
+        self._future = self._executor.submit(self._open_camera)
+
+    def _timed(self, step: str, func: Callable[[], object]):
+        start = time.perf_counter()
+        result = func()
+        self.timings[step] = time.perf_counter() - start
+        return result
+
+    def _prepare_detector(self):
+        try:
+            self.progress.emit("Postür modeli yükleniyor...", 10)
+            self.detector = self._timed("model", self.detector_factory)
+
+            backend = getattr(self.detector, "backend", None)
+            if backend is not None:
+                self.progress.emit("Model ısındırılıyor...", 60)
+                frame_shape = (self.detector.config.CAMERA_HEIGHT, self.detector.config.CAMERA_WIDTH, 3)
+                warmup_ms = self._timed("warmup", lambda: backend.warmup(frame_shape, iterations=1))
+                self.logger.info(f"Model ısınması: {warmup_ms:.1f} ms/çıkarım")
+
+            self.progress.emit("Model hazır", 100)
+            self.logger.info(
+                "Dedektör hazır: " + ", ".join(f"{step}={seconds * 1000:.0f} ms"
+                                               for step, seconds in self.timings.items())
+            )
+            self.detector_ready.emit(self.detector)
+        except Exception as e:
+            self.logger.error(f"Dedektör başlatma hatası: {str(e)}")
+            self.failed.emit(str(e))
+
+    def _open_camera(self):
+        if self.detector is None:
+            self.camera_ready.emit(False)
+            return
+        self.progress.emit("Kamera açılıyor...", 50)
+        opened = self._timed("camera_open", self.detector.start_camera)
+        self.progress.emit("Kamera açıldı" if opened else "Kamera açılamadı", 100)
+        self.camera_ready.emit(bool(opened))
+
+    def mark_first_frame(self) -> Optional[float]:
+        """İlk analiz edilen frame'i kaydet; ilk çağrıda süreyi (s) döndür"""
+        if self.first_frame_latency is not None or self._camera_requested_at is None:
+            return None
+
+        now = time.monotonic()
+        self.first_frame_latency = now - self._camera_requested_at
+        self.timings["first_frame"] = self.first_frame_latency
+        self.logger.info(
+            f"İlk analiz edilen frame: izleme isteğinden {self.first_frame_latency * 1000:.0f} ms, "
+            f"uygulama açılışından {(now - self.started_at) * 1000:.0f} ms sonra "
+            f"(kamera açılışı {self.timings.get('camera_open', 0.0) * 1000:.0f} ms)"
+        )
+        return self.first_frame_latency
+
+    def shutdown(self):
+        """Süren adımın bitmesini bekle ve thread'i kapat"""
+        self._executor.shutdown(wait=True)
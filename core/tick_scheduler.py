@@ -0,0 +1,204 @@
+"""
+PostureFix - Tik Zamanlayıcı Modülü
+Periyodik analiz tiklerini süren analizle eşgüdümler: analiz sürerken
+gelen tikler seçilen politikaya göre atlanır, birleştirilir veya sınırlı
+bir kuyrukta tutulur; hedef ve gerçekleşen hız ile kaçırılan son tarihler
+sayaçlarla raporlanır
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Optional
+
+# Analiz sürerken gelen tiklerin ele alınışı
+#   skip:        tik atılır; sonraki analiz bir sonraki boş tikte başlar
+#   coalesce:    bekleyen tikler tek bir tikte birleşir; analiz biter bitmez yeniden başlar
+#   drop_oldest: tikler sınırlı kuyrukta bekler; kuyruk doluysa en eski tik atılır
+TICK_POLICIES = ("skip", "coalesce", "drop_oldest")
+
+
+class TickScheduler:
+    """Tek bir analiz yuvası için tik kararlarını veren durum makinesi
+
+    Zamanlayıcıdan bağımsızdır: çağıran her tikte on_tick(), her analiz
+    bittiğinde on_complete() çağırır. İkisi de analiz şimdi başlatılacaksa
+    o analize karşılık gelen tikin zamanını, başlatılmayacaksa None
+    döndürür. Aynı anda en fazla bir analiz sürer; böylece aşırı yükte
+    olaylar birikmez, yalnızca hız düşer.
+    """
+
+    def __init__(self, interval: float, policy: str = "coalesce", max_pending: int = 2,
+                 rate_window: int = 20):
+        if policy not in TICK_POLICIES:
+            raise ValueError(f"Bilinmeyen tik politikası: {policy}")
+
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval
+        self.policy = policy
+        self.max_pending = max(1, max_pending)
+
+        self._pending = deque()
+        self._in_flight: Optional[float] = None
+        self._started_at = 0.0
+        self._completions = deque(maxlen=max(2, rate_window))
+        self._first_tick: Optional[float] = None
+        self._last_tick: Optional[float] = None
+
+        self.ticks = 0
+        self.started = 0
+        self.completed = 0
+        self.skipped_ticks = 0
+        self.coalesced_ticks = 0
+        self.dropped_ticks = 0
+        self.missed_deadlines = 0
+        self.busy_time = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.max_duration = 0.0
+
+    @property
+    def in_flight(self) -> bool:
+        return self._in_flight is not None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def target_rate(self) -> float:
+        return 1.0 / self.interval if self.interval > 0 else 0.0
+
+    def on_tick(self, now: float) -> Optional[float]:
+        """Zamanlayıcı tiki; analiz şimdi başlayacaksa tik zamanını döndür"""
+        self.ticks += 1
+        if self._first_tick is None:
+            self._first_tick = now
+        self._last_tick = now
+
+        if self._in_flight is None:
+            return self._start(now, now)
+
+        if self.policy == "skip":
+            self.skipped_ticks += 1
+        elif self.policy == "coalesce":
+            if self._pending:
+                # Eski bekleyen tik yenisiyle birleşir; gecikme en yeni tikten ölçülür
+                self._pending[0] = now
+                self.coalesced_ticks += 1
+            else:
+                self._pending.append(now)
+        else:
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.dropped_ticks += 1
+            self._pending.append(now)
+        return None
+
+    def on_complete(self, now: float) -> Optional[float]:
+        """Analiz bitti; bekleyen bir tik varsa hemen başlatılacak tikin zamanını döndür"""
+        if self._in_flight is None:
+            return None
+
+        duration = now - self._started_at
+        self.busy_time += duration
+        self.max_duration = max(self.max_duration, duration)
+        self.completed += 1
+        self._completions.append(now)
+
+        # Sonuç, kendi tikinden sonraki tik zamanına kadar hazır olmalıydı
+        if now > self._in_flight + self.interval:
+            self.missed_deadlines += 1
+        self._in_flight = None
+
+        if self._pending:
+            return self._start(self._pending.popleft(), now)
+        return None
+
+    def set_interval(self, interval: float):
+        """Tik aralığını değiştir; hız penceresi yeni hedefe göre yeniden dolar"""
+        if interval != self.interval:
+            self.interval = interval
+            self._completions.clear()
+
+    def clear_pending(self):
+        """Bekleyen tikleri at (ör. izleme durdurulurken)"""
+        self._pending.clear()
+
+    def _start(self, tick_time: float, now: float) -> float:
+        lag = now - tick_time
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        self.started += 1
+        self._in_flight = tick_time
+        self._started_at = now
+        return tick_time
+
+    def achieved_rate(self) -> float:
+        """Son tamamlanan analizlerden ölçülen hız (analiz/s)"""
+        if len(self._completions) < 2:
+            return 0.0
+        span = self._completions[-1] - self._completions[0]
+        return (len(self._completions) - 1) / span if span > 0 else 0.0
+
+    def utilization(self) -> float:
+        """Analiz yuvasının dolu olduğu zaman oranı"""
+        if self._first_tick is None or self._last_tick is None:
+            return 0.0
+        elapsed = self._last_tick - self._first_tick + self.interval
+        return min(1.0, self.busy_time / elapsed) if elapsed > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        """Zamanlayıcı sayaçlarını döndür"""
+        return {
+            "policy": self.policy,
+            "target_rate": self.target_rate,
+            "achieved_rate": self.achieved_rate(),
+            "ticks": self.ticks,
+            "started": self.started,
+            "completed": self.completed,
+            "skipped_ticks": self.skipped_ticks,
+            "coalesced_ticks": self.coalesced_ticks,
+            "dropped_ticks": self.dropped_ticks,
+            "missed_deadlines": self.missed_deadlines,
+            "pending": self.pending,
+            "mean_lag_ms": self.total_lag / self.started * 1000 if self.started else 0.0,
+            "max_lag_ms": self.max_lag * 1000,
+            "max_duration_ms": self.max_duration * 1000,
+            "utilization": self.utilization()
+        }
+
+
+def simulate(policy: str, duration: float, interval: float = 0.5, seconds: float = 60.0,
+             max_pending: int = 2) -> Dict[str, float]:
+    """Sabit analiz süresiyle sanal zamanda tik döngüsünü çalıştır"""
+    scheduler = TickScheduler(interval, policy, max_pending)
+    tick_index = 0
+    next_tick = 0.0
+    finish_at: Optional[float] = None
+
+    while True:
+        # Bir sonraki olay: tik mi, analiz bitişi mi (eşitlikte önce bitiş)
+        if finish_at is not None and finish_at <= next_tick:
+            now, finish_at = finish_at, None
+            if scheduler.on_complete(now) is not None:
+                finish_at = now + duration
+        else:
+            if next_tick >= seconds:
+                break
+            if scheduler.on_tick(next_tick) is not None:
+                finish_at = next_tick + duration
+            tick_index += 1
+            next_tick = tick_index * interval
+
+    return scheduler.get_stats()
+
+
+if __name__ == "__main__":
+    for analysis_time in (0.2, 0.7, 1.3):
+        for name in TICK_POLICIES:
+            stats = simulate(name, analysis_time)
+            print(f"analiz={analysis_time * 1000:5.0f}ms {name:12s} "
+                  f"hız={stats['achieved_rate']:.2f}/{stats['target_rate']:.2f} "
+                  f"atlanan={stats['skipped_ticks']:3d} birleşen={stats['coalesced_ticks']:3d} "
+                  f"düşen={stats['dropped_ticks']:3d} kaçan={stats['missed_deadlines']:3d} "
+                  f"gecikme={stats['mean_lag_ms']:6.1f}ms doluluk={stats['utilization']:.2f}")
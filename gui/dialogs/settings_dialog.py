@@ -260,6 +260,13 @@ class SettingsDialog(QDialog):
         self.history_size_spin.setRange(3, 10)
         evaluation_layout.addRow("Yumuşatma penceresi:", self.history_size_spin)
         
+        self.smoothing_filter_combo = QComboBox()
+        self.smoothing_filter_combo.addItem("Hareketli ortalama", "moving_average")
+        self.smoothing_filter_combo.addItem("Üstel ortalama", "ema")
+        self.smoothing_filter_combo.addItem("One-Euro", "one_euro")
+        self.smoothing_filter_combo.addItem("Kalman", "kalman")
+        evaluation_layout.addRow("Yumuşatma filtresi:", self.smoothing_filter_combo)
+        
         layout.addWidget(evaluation_group)
         
         # Kalibrasyon
@@ -446,6 +453,7 @@ class SettingsDialog(QDialog):
             "poor_posture_threshold": 70,
             "smoothing_enabled": True,
             "history_size": 5,
+            "smoothing_filter": "moving_average",
             
             # Uyarılar
             "visual_alerts": True,
@@ -510,6 +518,9 @@ class SettingsDialog(QDialog):
             self.poor_posture_threshold_slider.setValue(self.settings["poor_posture_threshold"])
             self.smoothing_enabled_cb.setChecked(self.settings["smoothing_enabled"])
             self.history_size_spin.setValue(self.settings["history_size"])
+            filter_index = self.smoothing_filter_combo.findData(self.settings["smoothing_filter"])
+            if filter_index >= 0:
+                self.smoothing_filter_combo.setCurrentIndex(filter_index)
             
             # Uyarılar
             self.visual_alerts_cb.setChecked(self.settings["visual_alerts"])
@@ -566,6 +577,7 @@ class SettingsDialog(QDialog):
             settings["poor_posture_threshold"] = self.poor_posture_threshold_slider.value()
             settings["smoothing_enabled"] = self.smoothing_enabled_cb.isChecked()
             settings["history_size"] = self.history_size_spin.value()
+            settings["smoothing_filter"] = self.smoothing_filter_combo.currentData()
             
             # Uyarılar
             settings["visual_alerts"] = self.visual_alerts_cb.isChecked()
@@ -333,6 +333,13 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.logger.error(f"Postür gösterim güncelleme hatası: {str(e)}")
     
+    def update_camera_frame(self, frame_result):
+        """Dedektörün işlediği frame'i kamera widget'ında göster"""
+        try:
+            self.camera_widget.show_frame_result(frame_result)
+        except Exception as e:
+            self.logger.error(f"Kamera görüntüsü güncelleme hatası: {str(e)}")
+    
     def show_alert(self, alert_message: str):
         """Uyarı göster"""
         try:
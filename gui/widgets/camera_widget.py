@@ -25,6 +25,7 @@ class CameraWidget(QWidget):
         self.is_monitoring = False
         self.current_frame = None
         self.show_pose_lines = True
+        self._rgb_buffer = None  # Eski Qt sürümlerinde gösterim dönüşüm tamponu
         
         # UI kurulumu
         self.setup_ui()
@@ -191,13 +192,20 @@ class CameraWidget(QWidget):
     def display_frame(self, frame):
         """Frame'i widget'ta göster"""
         try:
-            # OpenCV BGR'den RGB'ye çevir
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
+            # BGR frame'i dönüştürmeden QImage'e sar (Qt 5.14+ Format_BGR888);
+            # QPixmap.fromImage veriyi kopyaladığı için frame referansı saklanmaz
+            if hasattr(QImage, "Format_BGR888"):
+                image_data, image_format = np.ascontiguousarray(frame), QImage.Format_BGR888
+            else:
+                if self._rgb_buffer is None or self._rgb_buffer.shape != frame.shape:
+                    self._rgb_buffer = np.empty_like(frame)
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+                image_data, image_format = self._rgb_buffer, QImage.Format_RGB888
+
             # QImage'e çevir
-            height, width, channel = rgb_frame.shape
-            bytes_per_line = 3 * width
-            q_image = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
+            height, width, channel = image_data.shape
+            bytes_per_line = image_data.strides[0]
+            q_image = QImage(image_data.data, width, height, bytes_per_line, image_format)
             
             # QPixmap'e çevir ve boyutlandır
             pixmap = QPixmap.fromImage(q_image)
@@ -259,6 +267,18 @@ class CameraWidget(QWidget):
                 }
             """)
     
+    def show_frame_result(self, frame_result):
+        """Dedektörden gelen FrameResult'ı göster (yeni çıkarım yapmadan)"""
+        # Gerçek görüntü geldiğinde demo görüntüsünü durdur
+        if self.demo_timer.isActive():
+            self.demo_timer.stop()
+        
+        frame = frame_result.frame
+        if self.show_pose_lines and frame_result.annotated_frame is not None:
+            frame = frame_result.annotated_frame
+        
+        self.update_frame_with_pose(frame, frame_result.pose_landmarks)
+    
     def update_frame_with_pose(self, frame, pose_landmarks=None):
         """Frame'i postür landmark'ları ile güncelle"""
         if pose_landmarks and self.show_pose_lines:
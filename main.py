@@ -5,6 +5,7 @@ Postür düzeltme uygulamasının ana giriş noktası
 
 import sys
 import os
+import time
 import logging
 from datetime import datetime
 from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction
@@ -14,19 +15,27 @@ from PyQt5.QtGui import QIcon
 # Proje modüllerini import et
 from config import AppConfig
 from gui.main_window import MainWindow
+from core.analysis_loop import AnalysisLoop
 from core.posture_detector import PostureDetector
 from core.data_manager import DataManager
+from core.landmark_recorder import LandmarkRecorder
+from core.startup_task import DetectorStartupTask
+from core.adaptive_sampler import AdaptiveSampler
+from core.posture_metrics import score_posture_data
 from utils.logger import setup_logger
+from utils.profiling import CpuUsageMeter
 
 class PostureFixApp(QObject):
     """Ana uygulama sınıfı"""
     
     # Sinyaller
     posture_changed = pyqtSignal(dict)
+    frame_processed = pyqtSignal(object)
     alert_triggered = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
+        self.started_at = time.monotonic()
         
         # Yapılandırma
         self.config = AppConfig()
@@ -45,14 +54,40 @@ class PostureFixApp(QObject):
         # Sinyalleri bağla
         self.connect_signals()
         
+        # Model kurulumu ve ısınma pencere çizildikten sonra arka planda
+        self.startup_task.start()
+        
     def setup_components(self):
         """Ana bileşenleri başlat"""
         try:
             # Veri yöneticisi
             self.data_manager = DataManager()
             
-            # Postür dedektörü
-            self.posture_detector = PostureDetector()
+            # Postür dedektörü: model arka planda kurulur (hazır olana kadar None)
+            self.posture_detector = None
+            self.startup_task = DetectorStartupTask(PostureDetector, self.started_at, parent=self)
+            self.monitoring_requested = False
+            self.last_scored_sequence = None
+            
+            # Skor oynaklığına göre uyarlamalı analiz aralığı
+            self.sampler = None
+            if self.config.ADAPTIVE_SAMPLING_ENABLED:
+                self.sampler = AdaptiveSampler(
+                    base_interval=self.config.SAMPLING_BASE_INTERVAL,
+                    burst_interval=self.config.SAMPLING_BURST_INTERVAL,
+                    score_rate_threshold=self.config.SAMPLING_SCORE_RATE_THRESHOLD,
+                    metric_rate_threshold=self.config.SAMPLING_METRIC_RATE_THRESHOLD,
+                    decay=self.config.SAMPLING_DECAY
+                )
+            self.cpu_meter = CpuUsageMeter()
+            
+            # Ham landmark kaydı (eşikler değişince geçmişi yeniden skorlamak için)
+            self.landmark_recorder = None
+            if self.config.LANDMARK_RECORDING_ENABLED:
+                self.landmark_recorder = LandmarkRecorder(
+                    self.config.LANDMARK_RECORDING_DIR,
+                    chunk_frames=self.config.LANDMARK_RECORDING_CHUNK
+                )
             
             self.logger.info("Tüm bileşenler başarıyla başlatıldı")
             
@@ -113,10 +148,17 @@ class PostureFixApp(QObject):
     
     def setup_timers(self):
         """Zamanlayıcıları ayarla"""
-        # Postür kontrol zamanlayıcısı
-        self.posture_timer = QTimer()
-        self.posture_timer.timeout.connect(self.check_posture)
-        self.posture_timer.start(int(self.config.POSTURE_CHECK_INTERVAL * 1000))
+        # Postür analiz döngüsü: analiz arka planda sürerken gelen tikler
+        # politikaya göre atlanır/birleştirilir, olaylar birikmez
+        self.posture_loop = AnalysisLoop(
+            self.analyze_frame,
+            self.config.POSTURE_CHECK_INTERVAL,
+            policy=self.config.POSTURE_TICK_POLICY,
+            max_pending=self.config.POSTURE_TICK_MAX_PENDING,
+            parent=self
+        )
+        self.posture_loop.completed.connect(self.check_posture)
+        # Döngü kamera arka planda açıldığında başlar (on_camera_ready)
         
         # Veri kaydetme zamanlayıcısı
         self.data_save_timer = QTimer()
@@ -130,6 +172,9 @@ class PostureFixApp(QObject):
         # Postür değişikliği sinyali
         self.posture_changed.connect(self.main_window.update_posture_display)
         
+        # İşlenmiş frame sinyali (kamera önizlemesi)
+        self.frame_processed.connect(self.main_window.update_camera_frame)
+        
         # Uyarı sinyali
         self.alert_triggered.connect(self.main_window.show_alert)
         
@@ -137,27 +182,109 @@ class PostureFixApp(QObject):
         self.main_window.settings_changed.connect(self.update_settings)
         self.main_window.start_monitoring.connect(self.start_monitoring)
         self.main_window.stop_monitoring.connect(self.stop_monitoring)
+        
+        # Arka plan başlatma sinyalleri (ana thread'de işlenir)
+        self.startup_task.progress.connect(
+            lambda message, percent: self.main_window.show_status_message(message, 3000)
+        )
+        self.startup_task.detector_ready.connect(self.on_detector_ready)
+        self.startup_task.camera_ready.connect(self.on_camera_ready)
+        self.startup_task.failed.connect(self.on_startup_failed)
+    
+    def on_detector_ready(self, detector):
+        """Model kuruldu ve ısındı"""
+        self.posture_detector = detector
+    
+    def on_startup_failed(self, error: str):
+        """Model kurulamadı: izleme başlatılamaz"""
+        self.main_window.show_status_message(f"Postür modeli yüklenemedi: {error}", 10000)
+        self.main_window.update_monitoring_status(False)
+    
+    def on_camera_ready(self, opened: bool):
+        """Kamera arka planda açıldı (ya da açılamadı)"""
+        if not opened:
+            self.logger.error("Kamera açılamadı, izleme başlatılmadı")
+            self.monitoring_requested = False
+            self.main_window.update_monitoring_status(False)
+            return
+        
+        # Kamera açılırken izleme durdurulduysa hemen kapat
+        if not self.monitoring_requested:
+            self.posture_detector.stop_camera()
+            return
+        
+        if self.sampler:
+            self.sampler.reset()
+            self.posture_loop.set_interval(self.sampler.interval)
+        self.cpu_meter.start()
+        self.posture_loop.start()
+        self.logger.info("Postür izleme başlatıldı")
+    
+    def analyze_frame(self):
+        """Frame analizi (analiz döngüsünün arka plan thread'inde çalışır)"""
+        if self.posture_detector is None:
+            return None
+        
+        # Tek çıkarım: skor, önizleme ve kayıt aynı sonucu kullanır
+        return self.posture_detector.process_frame(
+            annotate=self.main_window.camera_widget.show_pose_lines
+        )
     
-    def check_posture(self):
-        """Postür kontrolü yap"""
+    def check_posture(self, result, analysis_ns: int = 0):
+        """Analiz sonucunu işle (ana thread)"""
+        if self.posture_detector is None:
+            return
+        
+        profiler = self.posture_detector.profiler
+        tick_start = time.perf_counter_ns() - analysis_ns
         try:
-            # Postür analizi
-            posture_data = self.posture_detector.analyze_posture()
+            if result is None:
+                return
+            
+            # Önizlemeyi güncelle
+            stage_start = time.perf_counter_ns()
+            self.frame_processed.emit(result)
+            profiler.record("ui_emit", stage_start)
             
-            if posture_data:
+            # Aynı sonucu (worker henüz yeni sonuç üretmediyse) tekrar işleme
+            if result.metrics and result.sequence != self.last_scored_sequence:
+                self.last_scored_sequence = result.sequence
+                self.startup_task.mark_first_frame()
+                
                 # Postür verilerini işle
-                self.process_posture_data(posture_data)
+                self.process_posture_data(result.metrics)
+                
+                # Ham landmark'ları oturum dosyasına ekle
+                if self.landmark_recorder and self.data_manager.current_session:
+                    self.landmark_recorder.append(
+                        self.data_manager.current_session.session_id,
+                        time.time(),
+                        result.landmark_array
+                    )
                 
         except Exception as e:
             self.logger.error(f"Postür kontrolü hatası: {str(e)}")
+        finally:
+            profiler.record("tick", tick_start)
     
     def process_posture_data(self, posture_data):
         """Postür verilerini işle"""
+        profiler = self.posture_detector.profiler
+        
         # Postür skorunu hesapla
+        stage_start = time.perf_counter_ns()
         posture_score = self.calculate_posture_score(posture_data)
+        stage_start = profiler.record("scoring", stage_start)
+        
+        # Bir sonraki analiz aralığı; bu örnek o süre boyunca geçerli sayılır
+        interval = self.config.POSTURE_CHECK_INTERVAL
+        if self.sampler:
+            interval = self.sampler.update(posture_score, posture_data)
+            self.posture_loop.set_interval(interval)
         
-        # Veriyi kaydet
-        self.data_manager.save_posture_data(posture_data, posture_score)
+        # Veriyi kaydet (zaman ağırlıklı istatistikler için süreyle)
+        self.data_manager.save_posture_data(posture_data, posture_score, interval)
+        stage_start = profiler.record("persistence", stage_start)
         
         # UI'yi güncelle
         display_data = {
@@ -166,6 +293,7 @@ class PostureFixApp(QObject):
             'timestamp': datetime.now()
         }
         self.posture_changed.emit(display_data)
+        profiler.record("ui_posture", stage_start)
         
         # Kötü postür kontrolü
         if posture_score < self.config.POOR_POSTURE_THRESHOLD:
@@ -173,27 +301,9 @@ class PostureFixApp(QObject):
     
     def calculate_posture_score(self, posture_data):
         """Postür skorunu hesapla (0-1 arası)"""
-        # Basit skorlama algoritması
-        # Gerçek implementasyonda daha karmaşık olacak
-        score = 1.0
-        
-        # Kafa öne eğimi kontrolü
-        if posture_data.get('head_forward_angle', 0) > 15:
-            score -= 0.3
-        
-        # Omuz eğimi kontrolü  
-        if posture_data.get('shoulder_slope', 0) > 10:
-            score -= 0.2
-        
-        # Boyun açısı kontrolü
-        if posture_data.get('neck_angle', 0) > 20:
-            score -= 0.3
-        
-        # Sırt düzlüğü kontrolü
-        if posture_data.get('back_straightness', 0) > 15:
-            score -= 0.2
-        
-        return max(0.0, score)
+        # Basit skorlama algoritması (kurallar core.posture_metrics.SCORE_RULES'ta;
+        # toplu analiz ve tekrar oynatma aynı kuralları kullanır)
+        return score_posture_data(posture_data)
     
     def trigger_posture_alert(self, score):
         """Postür uyarısını tetikle"""
@@ -205,32 +315,63 @@ class PostureFixApp(QObject):
     def save_periodic_data(self):
         """Periyodik veri kaydetme"""
         try:
+            # Arka plan yazıcısı varsa kayıtlar zaten kuyrukta; bu çağrı G/Ç yapmaz
             self.data_manager.save_session_data()
-            self.logger.debug("Periyodik veri kaydedildi")
+            self.logger.debug(f"Periyodik veri kaydedildi: {self.data_manager.get_db_stats()}")
         except Exception as e:
             self.logger.error(f"Veri kaydetme hatası: {str(e)}")
     
     def start_monitoring(self):
         """İzlemeyi başlat"""
         try:
-            self.posture_detector.start_camera()
-            self.posture_timer.start()
-            self.logger.info("Postür izleme başlatıldı")
+            # Kamera açılışı saniyeler sürebilir; GUI thread'inde yapılmaz
+            self.monitoring_requested = True
+            self.startup_task.open_camera()
         except Exception as e:
             self.logger.error(f"İzleme başlatma hatası: {str(e)}")
     
     def stop_monitoring(self):
         """İzlemeyi durdur"""
         try:
-            self.posture_detector.stop_camera()
-            self.posture_timer.stop()
+            # Süren analiz bitmeden kamera kapatılmaz
+            self.monitoring_requested = False
+            self.posture_loop.stop()
+            if self.posture_detector is not None:
+                self.posture_detector.stop_camera()
+            self.logger.info(f"Analiz döngüsü: {self.posture_loop.get_stats()}")
+            self.cpu_meter.stop()
+            self.log_sampling_stats()
+            if self.landmark_recorder:
+                self.landmark_recorder.flush()
             self.logger.info("Postür izleme durduruldu")
         except Exception as e:
             self.logger.error(f"İzleme durdurma hatası: {str(e)}")
     
+    def log_sampling_stats(self):
+        """Örnekleme hızı ve izlenen saat başına CPU süresini logla"""
+        cpu_seconds, wall_seconds = self.cpu_meter.totals()
+        if wall_seconds <= 0:
+            return
+        sampling = self.sampler.get_stats() if self.sampler else {}
+        self.logger.info(
+            f"İzleme: {wall_seconds / 60:.1f} dk, CPU {cpu_seconds:.1f} s "
+            f"({self.cpu_meter.cpu_seconds_per_hour():.0f} CPU-s/saat), "
+            f"ortalama örnekleme {sampling.get('mean_rate_hz', 1 / self.config.POSTURE_CHECK_INTERVAL):.2f} Hz, "
+            f"sıçrama={sampling.get('bursts', 0)}"
+        )
+    
     def update_settings(self, settings):
         """Ayarları güncelle"""
         # Ayarları uygula
+        if self.posture_detector is None:
+            self.logger.warning("Dedektör henüz hazır değil, yumuşatma ayarları uygulanmadı")
+        elif "smoothing_enabled" in settings or "history_size" in settings:
+            self.posture_detector.configure_smoothing(
+                settings.get("smoothing_enabled", self.posture_detector.smoothing_enabled),
+                settings.get("history_size", self.posture_detector.history_size),
+                settings.get("smoothing_filter")
+            )
+        
         self.logger.info("Ayarlar güncellendi")
     
     def show_main_window(self):
@@ -250,9 +391,25 @@ class PostureFixApp(QObject):
     def quit_application(self):
         """Uygulamayı kapat"""
         try:
+            # Analiz ve başlatma thread'lerini durdur
+            self.monitoring_requested = False
+            self.posture_loop.shutdown()
+            self.startup_task.shutdown()
+            self.logger.info(f"Analiz döngüsü: {self.posture_loop.get_stats()}")
+            self.cpu_meter.stop()
+            self.log_sampling_stats()
+            
             # Kaynakları temizle
-            self.posture_detector.cleanup()
+            if self.landmark_recorder:
+                self.landmark_recorder.close()
+            if self.posture_detector is not None:
+                # Aşama sürelerini logs/ altına yaz
+                self.posture_detector.profiler.dump(self.config.LOGS_DIR)
+                self.posture_detector.cleanup()
+            # Kuyruktaki kayıtlar yazılana kadar beklenir (flush-and-wait)
             self.data_manager.save_session_data()
+            self.logger.info(f"Veritabanı: {self.data_manager.get_db_stats()}")
+            self.data_manager.close()
             
             self.logger.info("PostureFix uygulaması kapatılıyor...")
             QApplication.quit()
@@ -0,0 +1,197 @@
+"""
+PostureFix - Aşama Zamanlama Modülü
+Postür döngüsünün aşamalarını perf_counter_ns ile ölçer ve sabit kovalı
+histogramlarda toplar; üretimde açık bırakılacak kadar ucuzdur
+"""
+
+import os
+import json
+import time
+import logging
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Kova sınırları (ns): 1 µs ile 10 s arası, on katta 20 logaritmik adım
+_BUCKETS_PER_DECADE = 20
+BUCKET_BOUNDS_NS: List[int] = [
+    int(round(1_000 * 10 ** (i / _BUCKETS_PER_DECADE))) for i in range(7 * _BUCKETS_PER_DECADE + 1)
+]
+
+# Postür döngüsünün aşamaları (rapor sırası)
+PIPELINE_STAGES = (
+    "capture",
+    "color_conversion",
+    "inference",
+    "landmark_extraction",
+    "metrics",
+    "smoothing",
+    "scoring",
+    "persistence",
+    "ui_emit",       # Önizleme frame'i
+    "ui_posture",    # Skor/metrik gösterimi
+    "tick"
+)
+
+
+class StageHistogram:
+    """Tek bir aşamanın süre histogramı
+
+    Kayıt, kova sınırlarında ikili arama ve birkaç tamsayı toplamasıdır;
+    bellek kullanımı örnek sayısından bağımsızdır.
+    """
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns: int):
+        self.counts[bisect_right(BUCKET_BOUNDS_NS, duration_ns)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, q: float) -> float:
+        """Yüzdelik değeri (ns), kova içinde doğrusal ara değerlemeyle"""
+        if self.count == 0:
+            return 0.0
+
+        target = self.count * q / 100.0
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= target:
+                lower = BUCKET_BOUNDS_NS[index - 1] if index > 0 else 0
+                upper = BUCKET_BOUNDS_NS[index] if index < len(BUCKET_BOUNDS_NS) else self.max_ns
+                fraction = (target - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, float(self.max_ns))
+            cumulative += bucket_count
+        return float(self.max_ns)
+
+    def summary(self) -> Dict[str, float]:
+        """Milisaniye cinsinden özet"""
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p95_ms": self.percentile(95) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": self.max_ns / 1e6
+        }
+
+
+class CpuUsageMeter:
+    """İzleme süresince süreç CPU zamanını ölçer (tüm thread'ler dahil)
+
+    start()/stop() çiftleri arasındaki duvar saati ve CPU süreleri
+    toplanır; izlenen saat başına CPU saniyesi raporlanır.
+    """
+
+    def __init__(self):
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._started: Optional[tuple] = None
+
+    def start(self):
+        if self._started is None:
+            self._started = (time.process_time(), time.monotonic())
+
+    def stop(self):
+        if self._started is not None:
+            cpu, wall = self._started
+            self.cpu_seconds += time.process_time() - cpu
+            self.wall_seconds += time.monotonic() - wall
+            self._started = None
+
+    def totals(self):
+        """(CPU saniyesi, duvar saati saniyesi), süren dönem dahil"""
+        cpu, wall = self.cpu_seconds, self.wall_seconds
+        if self._started is not None:
+            cpu += time.process_time() - self._started[0]
+            wall += time.monotonic() - self._started[1]
+        return cpu, wall
+
+    def cpu_seconds_per_hour(self) -> float:
+        cpu, wall = self.totals()
+        return cpu / wall * 3600 if wall > 0 else 0.0
+
+
+class PipelineProfiler:
+    """Aşama adına göre histogram tutan zamanlayıcı
+
+    Kullanım:
+        start = time.perf_counter_ns()
+        ...
+        start = profiler.record("inference", start)  # sonraki aşamanın başlangıcı
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.started_at = datetime.now()
+        self._histograms: Dict[str, StageHistogram] = {}
+
+    def record(self, stage: str, start_ns: int) -> int:
+        """start_ns'den bu yana geçen süreyi kaydet; şimdiki zamanı döndür"""
+        now = time.perf_counter_ns()
+        if self.enabled:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = StageHistogram()
+            histogram.add(now - start_ns)
+        return now
+
+    def record_duration(self, stage: str, duration_ns: int):
+        """Başka yerde ölçülmüş bir süreyi kaydet (ör. worker sürecindeki çıkarım)"""
+        if self.enabled:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = StageHistogram()
+            histogram.add(duration_ns)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Tüm aşamaların p50/p95/p99 özetini döndür"""
+        ordered = [stage for stage in PIPELINE_STAGES if stage in self._histograms]
+        ordered += sorted(stage for stage in self._histograms if stage not in PIPELINE_STAGES)
+        return {stage: self._histograms[stage].summary() for stage in ordered}
+
+    def reset(self):
+        """Histogramları temizle"""
+        self._histograms.clear()
+        self.started_at = datetime.now()
+
+    def dump(self, directory: str) -> Optional[str]:
+        """Özeti ve ham kova sayılarını JSON olarak yaz, dosya yolunu döndür"""
+        if not self._histograms:
+            return None
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"pipeline_timing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            summary = self.snapshot()
+            payload = {
+                "started_at": self.started_at.isoformat(),
+                "ended_at": datetime.now().isoformat(),
+                "bucket_bounds_ns": BUCKET_BOUNDS_NS,
+                "stages": {
+                    stage: dict(summary[stage], buckets=self._histograms[stage].counts)
+                    for stage in summary
+                }
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+
+            for stage, stats in summary.items():
+                self.logger.info(
+                    f"Aşama {stage:20s} n={stats['count']:6d} p50={stats['p50_ms']:.2f}ms "
+                    f"p95={stats['p95_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms"
+                )
+            return path
+
+        except Exception as e:
+            self.logger.error(f"Zamanlama dökümü yazılamadı: {str(e)}")
+            return None